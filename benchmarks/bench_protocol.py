@@ -0,0 +1,59 @@
+"""
+BT 协议编解码 CPU 开销基准
+对比旧实现（int 列表 + ord()，chr() 拼接 + split/int 解析）与 core.protocol 的复用缓冲编码和字节级解析，
+统计每个 16 字节读块（编码一条读命令 + 解析一条响应）的耗时
+
+用法:
+    python benchmarks/bench_protocol.py [--number 20000] [--rounds 5]
+"""
+
+import argparse
+import pathlib
+import sys
+import timeit
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.core.protocol import PacketEncoder, decode_block  # noqa: E402
+
+COMMAND = "BT-I2C2RD500010"
+RESPONSE = list((":" + " ".join(f"{i * 17 & 0xFF:02X}" for i in range(16))).encode("ascii"))
+RESPONSE += [0] * (64 - len(RESPONSE))
+
+
+def legacy_block(cmd: str, report):
+    data = [0x00] * 65
+    for i, char in enumerate(cmd):
+        if i + 1 < len(data):
+            data[i + 1] = ord(char)
+    resp = "".join([chr(x) for x in report if 32 <= x <= 126])
+    parts = resp.strip()[1:].split()
+    return data, [int(part, 16) for part in parts[:16]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="每轮的读块次数")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    encoder = PacketEncoder()
+    assert legacy_block(COMMAND, RESPONSE)[1] == decode_block(RESPONSE, 16)
+
+    def legacy():
+        legacy_block(COMMAND, RESPONSE)
+
+    def current():
+        encoder.encode(COMMAND)
+        decode_block(RESPONSE, 16)
+
+    old = min(timeit.repeat(legacy, number=args.number, repeat=args.rounds)) / args.number
+    new = min(timeit.repeat(current, number=args.number, repeat=args.rounds)) / args.number
+    print(f"旧实现 (list/ord/chr/split): {old * 1e6:.2f} µs / 块")
+    print(f"复用缓冲 + 字节级解析:      {new * 1e6:.2f} µs / 块  ({old / new:.1f}x)")
+    print(f"完整 512 字节读取 (32 块):  {old * 32 * 1e3:.3f} ms -> {new * 32 * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
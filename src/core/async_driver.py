@@ -0,0 +1,190 @@
+"""
+SPD 驱动的 asyncio 封装
+每个驱动实例在独立的单线程执行器中执行 HID I/O，可在同一个事件循环中并发驱动多个设备
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from .driver import SPDDriver
+from .parser.ddr4 import ModuleIdentity
+
+
+class SPDOperationError(Exception):
+    """设备操作失败（驱动返回 None / False）"""
+
+
+class AsyncSPDDriver:
+    """
+    SPDDriver 的 asyncio 封装
+
+    - HID I/O 在专用的单线程执行器中执行，同一设备上的操作按提交顺序串行
+    - 每个操作可指定 timeout（秒），超时抛出 asyncio.TimeoutError
+    - 取消或超时时设置驱动的 stop_flag，并等待执行器中的操作在块边界停下后再返回，
+      保证设备不会被两个操作同时使用；写入被取消时已写入的块不会回滚
+    - progress_callback / log_callback 通过 call_soon_threadsafe 回到事件循环线程执行
+
+    用法:
+        async with AsyncSPDDriver() as dev:
+            await dev.connect()
+            data = await dev.read_spd(timeout=5)
+    """
+
+    STOP_POLL_INTERVAL = 0.05  # 取消后重复设置 stop_flag 的间隔 (秒)
+
+    def __init__(
+        self,
+        driver: Optional[SPDDriver] = None,
+        default_timeout: Optional[float] = None,
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
+        """
+        Args:
+            driver: 被封装的同步驱动；为 None 时新建
+            default_timeout: 未指定 timeout 的操作使用的默认时限（秒），None 表示不限
+            executor: 自定义执行器（须为单线程）；为 None 时新建并在 close() 时关闭
+        """
+        self.driver = driver or SPDDriver()
+        self.default_timeout = default_timeout
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="spd-hid")
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self) -> "AsyncSPDDriver":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def _run(self, func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        在执行器中运行同步驱动方法
+
+        Args:
+            func: 驱动方法
+            timeout: 时限（秒），None 时使用 default_timeout
+
+        Returns:
+            驱动方法的返回值
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        if timeout is None:
+            timeout = self.default_timeout
+
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), timeout)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                await self._stop(future)
+                raise
+
+    async def _stop(self, future: "asyncio.Future") -> None:
+        """
+        停止执行器中的操作并等待其结束
+
+        执行器线程无法被中断，只能等待它在块边界检查 stop_flag；
+        操作开始时会清除 stop_flag，因此在其结束前反复设置。
+        """
+        while not future.done():
+            self.driver.stop()
+            await asyncio.wait({future}, timeout=self.STOP_POLL_INTERVAL)
+        future.exception()  # 取出异常，避免 "exception was never retrieved"
+
+    def _threadsafe(self, callback: Optional[Callable[..., None]]) -> Optional[Callable[..., None]]:
+        """将回调转发到事件循环线程执行"""
+        if callback is None:
+            return None
+        loop = asyncio.get_running_loop()
+        return lambda *args: loop.call_soon_threadsafe(callback, *args)
+
+    async def connect(
+        self,
+        log_callback: Optional[Callable[[str], None]] = None,
+        timeout: Optional[float] = None
+    ) -> None:
+        """连接设备，失败时抛出 SPDOperationError"""
+        if not await self._run(self.driver.connect, self._threadsafe(log_callback), timeout=timeout):
+            raise SPDOperationError("连接失败")
+
+    async def disconnect(self) -> None:
+        """断开设备连接"""
+        await self._run(self.driver.disconnect)
+
+    async def read_spd(
+        self,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        log_callback: Optional[Callable[[str], None]] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> List[int]:
+        """
+        读取 SPD 数据（参数同 SPDDriver.read_spd）
+
+        Returns:
+            512 字节数据列表；读取失败时抛出 SPDOperationError
+        """
+        data = await self._run(
+            self.driver.read_spd,
+            self._threadsafe(progress_callback),
+            self._threadsafe(log_callback),
+            timeout=timeout,
+            **kwargs
+        )
+        if data is None:
+            raise SPDOperationError("读取失败")
+        return data
+
+    async def write_spd(
+        self,
+        data: List[int],
+        progress_callback: Optional[Callable[[float], None]] = None,
+        log_callback: Optional[Callable[[str], None]] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> None:
+        """写入 SPD 数据（参数同 SPDDriver.write_spd），失败时抛出 SPDOperationError"""
+        ok = await self._run(
+            self.driver.write_spd,
+            data,
+            self._threadsafe(progress_callback),
+            self._threadsafe(log_callback),
+            timeout=timeout,
+            **kwargs
+        )
+        if not ok:
+            raise SPDOperationError("写入失败")
+
+    async def verify_spd(
+        self,
+        data: List[int],
+        log_callback: Optional[Callable[[str], None]] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> bool:
+        """回读对比（参数同 SPDDriver.verify_spd）"""
+        return await self._run(
+            self.driver.verify_spd, data, self._threadsafe(log_callback), timeout=timeout, **kwargs
+        )
+
+    async def probe_identity(
+        self,
+        log_callback: Optional[Callable[[str], None]] = None,
+        timeout: Optional[float] = None
+    ) -> ModuleIdentity:
+        """快速读取模组身份信息，失败时抛出 SPDOperationError"""
+        identity = await self._run(self.driver.probe_identity, self._threadsafe(log_callback), timeout=timeout)
+        if identity is None:
+            raise SPDOperationError("读取身份信息失败")
+        return identity
+
+    async def close(self) -> None:
+        """断开连接并关闭自有执行器"""
+        if self.driver.is_connected():
+            await self.disconnect()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
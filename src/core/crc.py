@@ -0,0 +1,244 @@
+"""
+DDR4 SPD CRC 校验
+JEDEC CRC-16 (多项式 0x1021，初值 0，不反射)：
+- Block 0: Byte 0-125，CRC 存于 Byte 126 (LSB) / 127 (MSB)
+- Block 1: Byte 128-253，CRC 存于 Byte 254 (LSB) / 255 (MSB)
+
+XMP 2.0 区域 (Byte 384-511) 不含 CRC，无需校验。
+"""
+
+import binascii
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..utils.constants import SPD_SIZE
+
+
+CRC_POLY = 0x1021
+
+# (名称, 起始偏移, 结束偏移(不含), CRC 低字节偏移)
+CRC_BLOCKS: List[Tuple[str, int, int, int]] = [
+    ("base", 0, 126, 126),
+    ("module", 128, 254, 254),
+]
+
+
+@dataclass
+class CRCStatus:
+    """单个 CRC 块的校验结果"""
+    name: str
+    start: int
+    end: int
+    crc_offset: int
+    stored: int
+    computed: int
+
+    @property
+    def valid(self) -> bool:
+        return self.stored == self.computed
+
+
+def _build_table() -> List[int]:
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ CRC_POLY) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return table
+
+
+CRC_TABLE: List[int] = _build_table()
+
+
+def crc16(data: Sequence[int], crc: int = 0) -> int:
+    """
+    计算 CRC-16
+
+    bytes/bytearray/memoryview 交给 binascii.crc_hqx（同一算法的 C 实现），
+    其它整数序列（如 SPDDataModel 的 list）按查找表逐字节计算。
+
+    Args:
+        data: 字节序列
+        crc: 初值（用于分段累加）
+
+    Returns:
+        16 位 CRC
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return binascii.crc_hqx(data, crc)
+    table = CRC_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[((crc >> 8) ^ byte) & 0xFF]
+    return crc
+
+
+def _build_basis() -> List[Optional[Tuple[int, Tuple[int, ...]]]]:
+    """
+    预计算逐位置的 CRC 贡献基
+
+    初值为 0 的 CRC 在 GF(2) 上是线性的：某位置的字节由 old 变为 new 时，
+    块 CRC 的变化量只取决于 (old ^ new) 与该位置到块尾的距离。
+    每个被覆盖的偏移对应 (块序号, 8 个单比特贡献)。
+    """
+    basis: List[Optional[Tuple[int, Tuple[int, ...]]]] = [None] * SPD_SIZE
+    for index, (_, start, end, _) in enumerate(CRC_BLOCKS):
+        # 块尾字节的贡献即单字节 CRC，向前每移动一个字节相当于在其后追加一个 0 字节
+        bits = [CRC_TABLE[1 << bit] for bit in range(8)]
+        for offset in range(end - 1, start - 1, -1):
+            basis[offset] = (index, tuple(bits))
+            bits = [((crc << 8) & 0xFFFF) ^ CRC_TABLE[(crc >> 8) & 0xFF] for crc in bits]
+    return basis
+
+
+_CRC_BASIS = _build_basis()
+
+
+def crc_delta(offset: int, old: int, new: int) -> Optional[Tuple[int, int]]:
+    """
+    计算单字节变化对 CRC 的影响
+
+    Args:
+        offset: 字节偏移
+        old: 原值
+        new: 新值
+
+    Returns:
+        (块序号, 需异或到该块 CRC 上的值)；偏移不在任何 CRC 块内时返回 None
+    """
+    entry = _CRC_BASIS[offset] if 0 <= offset < SPD_SIZE else None
+    if entry is None:
+        return None
+    index, bits = entry
+    diff = old ^ new
+    delta = 0
+    bit = 0
+    while diff:
+        if diff & 1:
+            delta ^= bits[bit]
+        diff >>= 1
+        bit += 1
+    return index, delta
+
+
+def compute_block_crcs(data: Sequence[int]) -> List[int]:
+    """计算全部 CRC 块的 CRC 值（顺序同 CRC_BLOCKS）"""
+    return [crc16(data[start:end]) for _, start, end, _ in CRC_BLOCKS]
+
+
+def build_status(data: Sequence[int], computed: Sequence[int]) -> List[CRCStatus]:
+    """
+    由已计算的 CRC 值与数据中存储的 CRC 组装校验结果
+
+    Args:
+        data: SPD 数据
+        computed: 各块 CRC（见 compute_block_crcs）
+    """
+    result = []
+    for (name, start, end, crc_offset), value in zip(CRC_BLOCKS, computed):
+        result.append(CRCStatus(
+            name=name,
+            start=start,
+            end=end,
+            crc_offset=crc_offset,
+            stored=data[crc_offset] | (data[crc_offset + 1] << 8),
+            computed=value,
+        ))
+    return result
+
+
+def check_crc(data: Sequence[int]) -> List[CRCStatus]:
+    """
+    校验全部 CRC 块
+
+    Args:
+        data: SPD 数据 (至少 256 字节)
+
+    Returns:
+        各块的校验结果；数据不足 256 字节时返回空列表
+    """
+    if len(data) < 256:
+        return []
+    return build_status(data, compute_block_crcs(data))
+
+
+def is_crc_valid(data: Sequence[int]) -> bool:
+    """全部 CRC 块是否有效"""
+    statuses = check_crc(data)
+    return bool(statuses) and all(s.valid for s in statuses)
+
+
+def crc_patch(data: Sequence[int]) -> Dict[int, int]:
+    """
+    生成修正 CRC 所需的字节补丁（格式同 core.encoder）
+
+    Args:
+        data: SPD 数据
+
+    Returns:
+        偏移 -> 新值；CRC 已正确时为空
+    """
+    patch: Dict[int, int] = {}
+    for status in check_crc(data):
+        if not status.valid:
+            patch[status.crc_offset] = status.computed & 0xFF
+            patch[status.crc_offset + 1] = (status.computed >> 8) & 0xFF
+    return patch
+
+
+def fix_crc(data: Sequence[int]) -> List[int]:
+    """
+    返回 CRC 已修正的数据副本
+
+    Args:
+        data: SPD 数据
+
+    Returns:
+        修正后的数据 (list)
+    """
+    fixed = list(data)
+    for offset, value in crc_patch(fixed).items():
+        fixed[offset] = value
+    return fixed
+
+
+def validate_files(paths: Iterable[str]) -> Iterator[Tuple[str, bool]]:
+    """
+    批量校验 SPD 文件
+
+    每个文件只读取一次并直接在 bytes 上计算 CRC（C 实现），适合成千上万个 dump。
+    大小不是 512 字节的文件视为无效。
+
+    Args:
+        paths: 文件路径
+
+    Yields:
+        (路径, CRC 是否有效)
+    """
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                data = f.read(SPD_SIZE + 1)
+        except OSError:
+            yield path, False
+            continue
+        yield path, len(data) == SPD_SIZE and is_crc_valid(data)
+
+
+def validate_directory(directory: str, pattern_ext: str = ".bin") -> Dict[str, bool]:
+    """
+    校验目录下全部 SPD 文件
+
+    Args:
+        directory: 目录路径
+        pattern_ext: 文件扩展名
+
+    Returns:
+        文件路径 -> CRC 是否有效
+    """
+    paths = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(pattern_ext)
+    )
+    return dict(validate_files(paths))
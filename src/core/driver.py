@@ -5,65 +5,183 @@ SPD 硬件驱动层
 
 import hid
 import time
-from typing import Optional, Callable, List
+from collections import deque
+from typing import Optional, Callable, List, Deque, Dict, FrozenSet, Iterator, Set, Tuple
 from datetime import datetime
 
-from ..utils.constants import DEFAULT_VID, DEFAULT_PID, SPD_SIZE, SPD_PAGE_SIZE
+from .crc import crc_patch
+from .parser.ddr4 import DDR4Parser, ModuleIdentity
+from .protocol import PacketEncoder, decode_block, decode_text
+from .stats import CMD_ACK_POLL, CMD_READ, CMD_WRITE, DriverStats, classify_command
+from .trace import TraceBuffer, TraceRecord, TRACE_LOG, TRACE_TX, TRACE_RX, TRACE_DROP
+from ..utils.constants import (
+    DEFAULT_VID, DEFAULT_PID, SPD_SIZE, SPD_PAGE_SIZE, DDR4_TYPE, SPD_BYTES, XMP_MAGIC,
+    SPD_DEFAULT_ADDR, SPD_SLOT_ADDRS,
+)
+
+
+def dirty_blocks(data: List[int], baseline: List[int], block_size: int = 8) -> List[int]:
+    """
+    找出与基准不同的数据块
+
+    Args:
+        data: 待写入数据
+        baseline: 设备上的当前内容
+        block_size: 块大小
+
+    Returns:
+        有差异的块起始偏移（升序）
+    """
+    return [
+        offset for offset in range(0, min(len(data), len(baseline)), block_size)
+        if data[offset:offset + block_size] != baseline[offset:offset + block_size]
+    ]
+
+
+def spd_bytes_used(byte0: int) -> int:
+    """
+    解码 DDR4 Byte 0 bits 3:0 (SPD Bytes Used)
+
+    Returns:
+        已使用的字节数；未定义的编码按 512 处理
+    """
+    return {1: 128, 2: 256, 3: 384, 4: 512}.get(byte0 & 0x0F, SPD_SIZE)
 
 
 class SPDDriver:
     """SPD 读写器硬件驱动"""
 
-    def __init__(self, vid: int = DEFAULT_VID, pid: int = DEFAULT_PID, debug: bool = False):
+    # 自适应轮询：以短超时片轮询响应，收到即返回；等待上限按实测延迟校准
+    POLL_SLICE_MS = 5               # 单次 device.read 的超时片 (ms)
+    RESPONSE_TIMEOUT_MIN = 0.05     # 校准后等待上限的下限 (秒)
+    RESPONSE_TIMEOUT_MAX = 1.0      # 未校准时的等待上限 (秒)，与固定延时模式的读超时一致
+    RESPONSE_TIMEOUT_FACTOR = 4     # 等待上限 = 近期最大响应延迟 × 系数
+    ACK_POLL_TIMEOUT = 0.05         # 写入后 ACK 轮询的时限 (秒)，覆盖 EE1004 内部写周期
+    WRITE_RETRIES = 3               # 单个块的最大写入次数
+    ADAPTIVE_SETTLE = 0.01          # 自适应模式下激活/切页后的稳定等待上限 (秒)
+
+    # 读取块长协商：连接时由大到小探测固件接受的 BT-I2C2RD 长度，失败回退 8 字节
+    BLOCK_SIZE_DEFAULT = 8
+    BLOCK_SIZE_CANDIDATES = (32, 16)
+    # 设备标识 (序列号/路径) -> 协商得到的块长，进程内共享，重连同一设备无需重新探测
+    _block_size_cache: Dict[str, int] = {}
+
+    # 身份区域：模组制造商 ID (Byte 320) 到 DRAM 制造商 ID (Byte 351)；
+    # 也是 read_spd(stop_after=...) 的常用上限
+    IDENTITY_START = SPD_BYTES.MANUFACTURER_ID_FIRST
+    IDENTITY_END = SPD_BYTES.DRAM_MANUFACTURER_ID_SECOND + 1
+
+    # 流水线读取：同时在途的 BT-I2C2RD 请求数上限，响应按发送顺序 (FIFO) 对应到偏移
+    PIPELINE_DEPTH = 4
+    PIPELINE_RETRIES = 3            # 单个块在流水线中的最大尝试次数，超过后改为逐块顺序读取
+    PIPELINE_MAX_ANOMALIES = 3      # 单页内异常次数达到该值后退化为一问一答
+    PIPELINE_SYNC_INTERVAL = 16     # 未确认的块数上限，达到后等待流水线排空再继续发送
+
+    DEBUG_LOG_SIZE = 4096           # 调试跟踪环形缓冲的记录数上限
+
+    def __init__(
+        self,
+        vid: int = DEFAULT_VID,
+        pid: int = DEFAULT_PID,
+        debug: bool = False,
+        adaptive_polling: bool = True,
+        pipeline_depth: int = PIPELINE_DEPTH,
+        path: Optional[bytes] = None,
+        hid_backend=None
+    ):
         self.vid = vid
         self.pid = pid
+        # 指定设备路径 (hid.enumerate 的 "path") 时打开该设备，否则打开第一个匹配的设备
+        self.path = path
+        # 提供 enumerate() / device() 的 HID 后端，默认 hid 模块；测试与基准可换成 core.emulator
+        self.hid_backend = hid_backend or hid
         self.device: Optional[hid.device] = None
         self.stop_flag = False
         self.debug = debug
-        self._debug_log: List[str] = []
+        # 结构化调试跟踪（定长环形缓冲），文本在显示/导出时才格式化
+        self.trace = TraceBuffer(self.DEBUG_LOG_SIZE)
+        # 按命令类别的延迟直方图、超时/重试计数与吞吐量
+        self.stats = DriverStats()
+        # adaptive_polling=False 时沿用固定延时 + 阻塞读取
+        self.adaptive_polling = adaptive_polling
+        self._latency_samples: Deque[float] = deque(maxlen=64)
+        self._last_latency: Optional[float] = None
+        self._encoder = PacketEncoder()
+        self._stale_response = False
+        # 仅在自适应轮询模式下生效；1 表示不使用流水线
+        self.pipeline_depth = max(1, pipeline_depth)
+        # 当前使用的读取块长；_device_key 为 None 时协商结果不写入缓存
+        self.block_size = self.BLOCK_SIZE_DEFAULT
+        self._block_size_negotiated = False
+        self._device_key: Optional[str] = None
+        # 最近一次 read_spd 未读取的偏移（skip_unused / stop_after）
+        self.unread_offsets: FrozenSet[int] = frozenset()
+        # 最近一次 read_spd 读取失败、以全零填充的 8 字节块起始偏移
+        self.failed_blocks: FrozenSet[int] = frozenset()
+        self._failed_blocks: Set[int] = set()
+        # 最近一次切换到的页；激活后未知 (None)
+        self._current_page: Optional[int] = None
+        # 最近一次成功写入后设备上应有的内容（含 fix_crc 刷新的 CRC），写入失败时为 None
+        self.written_data: Optional[List[int]] = None
+
+    def _log_debug(self, message: str, *args):
+        """
+        记录调试日志
+
+        Args:
+            message: 消息；提供 args 时为 % 格式串，在显示/导出时才格式化
+        """
+        self._trace(TraceRecord(time.perf_counter(), TRACE_LOG, message, args))
 
-    def _log_debug(self, message: str):
-        """记录调试日志"""
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        log_entry = f"[{timestamp}] {message}"
-        self._debug_log.append(log_entry)
+    def _trace(self, record: TraceRecord) -> None:
+        """写入跟踪记录；debug 模式下同时打印"""
+        self.trace.append(record)
         if self.debug:
-            print(log_entry)
+            print(self.trace.format(record))
 
     def get_debug_log(self) -> str:
         """获取调试日志"""
-        return "\n".join(self._debug_log)
+        return self.trace.format_all()
 
     def clear_debug_log(self):
         """清除调试日志"""
-        self._debug_log.clear()
+        self.trace.clear()
+
+    def get_stats_summary(self) -> str:
+        """按命令类别的延迟分位数、超时/错误/重试次数与吞吐量（文本表格）"""
+        return self.stats.format()
+
+    def reset_stats(self) -> None:
+        """清零命令统计"""
+        self.stats.reset()
 
     def enable_debug(self, enabled: bool = True):
         """启用/禁用调试模式"""
         self.debug = enabled
 
     @staticmethod
-    def enumerate_devices() -> List[dict]:
+    def enumerate_devices(backend=None) -> List[dict]:
         """枚举所有 HID 设备"""
         try:
-            return hid.enumerate()
+            return (backend or hid).enumerate()
         except Exception as e:
             return []
 
     @staticmethod
-    def find_spd_devices(vid: int = DEFAULT_VID, pid: int = DEFAULT_PID) -> List[dict]:
+    def find_spd_devices(vid: int = DEFAULT_VID, pid: int = DEFAULT_PID, backend=None) -> List[dict]:
         """查找 SPD 读写器设备"""
         try:
-            return hid.enumerate(vid, pid)
+            return (backend or hid).enumerate(vid, pid)
         except Exception:
             return []
 
     def connect(self, log_callback: Optional[Callable[[str], None]] = None) -> bool:
         """连接到 HID 设备"""
+        self.stop_flag = False
         self._log_debug(f"尝试连接设备 VID=0x{self.vid:04X}, PID=0x{self.pid:04X}")
 
         # 先枚举检查设备是否存在
-        devices = self.find_spd_devices(self.vid, self.pid)
+        devices = self.find_spd_devices(self.vid, self.pid, self.hid_backend)
         self._log_debug(f"找到 {len(devices)} 个匹配设备")
 
         if not devices:
@@ -72,7 +190,7 @@ class SPDDriver:
                 log_callback("未找到 SPD 读写器设备，请检查连接")
 
             # 列出所有 HID 设备帮助调试
-            all_devices = self.enumerate_devices()
+            all_devices = self.enumerate_devices(self.hid_backend)
             self._log_debug(f"系统中共有 {len(all_devices)} 个 HID 设备:")
             for i, dev in enumerate(all_devices[:10]):  # 只显示前10个
                 self._log_debug(f"  [{i}] VID=0x{dev.get('vendor_id', 0):04X}, "
@@ -85,11 +203,28 @@ class SPDDriver:
             self._log_debug(f"找到设备: {dev.get('product_string', 'Unknown')} "
                           f"(Path: {dev.get('path', 'N/A')})")
 
+        target = devices[0]
+        if self.path is not None:
+            matches = [dev for dev in devices if dev.get("path") == self.path]
+            if not matches:
+                self._log_debug(f"错误: 未找到路径为 {self.path!r} 的设备")
+                if log_callback:
+                    log_callback("未找到指定的 SPD 读写器设备，请检查连接")
+                return False
+            target = matches[0]
+
         try:
-            self.device = hid.device()
+            self.device = self.hid_backend.device()
             self._log_debug("创建 HID device 对象成功")
 
-            self.device.open(self.vid, self.pid)
+            if self.path is not None:
+                self.device.open_path(self.path)
+            else:
+                self.device.open(self.vid, self.pid)
+            self._stale_response = False
+            self._device_key = self._make_device_key(target)
+            self._block_size_negotiated = False
+            self.block_size = self.BLOCK_SIZE_DEFAULT
             self._log_debug("设备打开成功")
 
             # 获取设备信息
@@ -108,6 +243,7 @@ class SPDDriver:
             if test_resp:
                 if log_callback:
                     log_callback(f"设备响应: {test_resp[:50]}..." if len(test_resp) > 50 else f"设备响应: {test_resp}")
+                self.negotiate_block_size(log_callback)
             else:
                 self._log_debug("警告: 设备未响应测试命令")
                 if log_callback:
@@ -131,6 +267,9 @@ class SPDDriver:
             except Exception as e:
                 self._log_debug(f"断开连接时出错: {e}")
             self.device = None
+            self._device_key = None
+            self._block_size_negotiated = False
+            self.block_size = self.BLOCK_SIZE_DEFAULT
 
     def is_connected(self) -> bool:
         """检查设备是否已连接"""
@@ -142,61 +281,217 @@ class SPDDriver:
 
         Args:
             cmd_str: 命令字符串
-            delay: 等待响应的延时（秒）
+            delay: 固定延时模式下等待响应的延时（秒）；自适应轮询模式下忽略
 
         Returns:
             响应字符串，失败返回 None
         """
+        return decode_text(self._transact(cmd_str, delay))
+
+    def _transact(
+        self, cmd_str: str, delay: float = 0.02, command_class: Optional[str] = None
+    ) -> Optional[List[int]]:
+        """
+        发送命令并返回原始响应报告（参数同 send_cmd；command_class 覆盖统计时按命令推断的类别）
+
+        Returns:
+            device.read 返回的原始报告，超时或失败返回 None
+        """
         if not self.device:
-            self._log_debug(f"发送命令失败: 设备未连接 (cmd={cmd_str})")
+            self._log_debug("发送命令失败: 设备未连接 (cmd=%s)", cmd_str)
             return None
 
-        # 构造数据包: ReportID(0) + 64 bytes data
-        data = [0x00] * 65
-        for i, char in enumerate(cmd_str):
-            if i + 1 < len(data):
-                data[i + 1] = ord(char)
-
         try:
-            self._log_debug(f"TX: {cmd_str}")
-            bytes_written = self.device.write(data)
-            self._log_debug(f"写入 {bytes_written} 字节")
+            if self.adaptive_polling and self._stale_response:
+                self._drain_input()
 
-            time.sleep(delay)
+            self._trace(TraceRecord(time.perf_counter(), TRACE_TX, raw=cmd_str))
+            start = time.perf_counter()
+            self.device.write(self._encoder.encode(cmd_str))
 
-            response = self.device.read(64, timeout_ms=1000)
-            if response:
-                resp_str = "".join([chr(x) for x in response if 32 <= x <= 126])
-                self._log_debug(f"RX: {resp_str}")
-                return resp_str
+            if self.adaptive_polling:
+                response = self._poll_response()
             else:
-                self._log_debug("RX: (无响应/超时)")
-                return None
+                time.sleep(delay)
+                response = self.device.read(64, timeout_ms=1000)
+                self._last_latency = time.perf_counter() - start if response else None
+
+            inferred, nbytes = classify_command(cmd_str)
+            self.stats.record(command_class or inferred, nbytes, start, time.perf_counter(), response)
+            self._trace_response(response)
+            return response or None
 
         except Exception as e:
-            self._log_debug(f"IO 错误: {type(e).__name__}: {str(e)}")
+            self._log_debug("IO 错误: %s: %s", type(e).__name__, e)
             return None
 
+    def _query_block(self, cmd_str: str, length: int, command_class: Optional[str] = None) -> Optional[List[int]]:
+        """发送读命令并直接在原始报告上解析 length 字节"""
+        return decode_block(self._transact(cmd_str, command_class=command_class), length)
+
+    def _trace_response(self, response: Optional[List[int]]) -> None:
+        """记录响应（原始报告的引用，显示时才解码）"""
+        self._trace(TraceRecord(time.perf_counter(), TRACE_RX, latency=self._last_latency, raw=response or None))
+
+    @property
+    def response_timeout(self) -> float:
+        """当前的响应等待上限（秒），由近期实测延迟校准"""
+        if not self._latency_samples:
+            return self.RESPONSE_TIMEOUT_MAX
+        bound = max(self._latency_samples) * self.RESPONSE_TIMEOUT_FACTOR
+        return min(self.RESPONSE_TIMEOUT_MAX, max(self.RESPONSE_TIMEOUT_MIN, bound))
+
+    def _poll_response(self) -> Optional[List[int]]:
+        """
+        以短超时片轮询响应报告
+
+        收到报告立即返回并记录延迟；超过校准上限仍无响应时返回 None，
+        并标记可能有迟到的响应，下一条命令发送前先清空输入缓冲。
+        """
+        start = time.perf_counter()
+        deadline = start + self.response_timeout
+        while True:
+            remaining_ms = int((deadline - time.perf_counter()) * 1000)
+            if remaining_ms <= 0:
+                break
+            response = self.device.read(64, timeout_ms=min(self.POLL_SLICE_MS, remaining_ms))
+            if response:
+                self._last_latency = time.perf_counter() - start
+                self._latency_samples.append(self._last_latency)
+                return response
+
+        self._last_latency = None
+        self._stale_response = True
+        # 超时说明设备可能比校准时更慢，放宽下一次的上限
+        self._latency_samples.clear()
+        return None
+
+    def _settle(self, delay: float) -> None:
+        """
+        激活/切页后的稳定等待
+
+        固定延时模式下按原延时等待；自适应模式下已收到命令响应，只保留很短的余量。
+        """
+        time.sleep(min(delay, self.ADAPTIVE_SETTLE) if self.adaptive_polling else delay)
+
+    def _drain_input(self) -> None:
+        """丢弃输入缓冲中迟到的响应报告"""
+        self._stale_response = False
+        while True:
+            stale = self.device.read(64, timeout_ms=0)
+            if not stale:
+                return
+            self._trace(TraceRecord(time.perf_counter(), TRACE_DROP, "丢弃迟到响应", raw=stale))
+
+    @staticmethod
+    def _make_device_key(info: dict) -> str:
+        """由枚举信息生成设备标识（优先序列号，其次设备路径）"""
+        serial = info.get("serial_number")
+        if serial:
+            return f"{info.get('vendor_id', 0):04X}:{info.get('product_id', 0):04X}:{serial}"
+        path = info.get("path")
+        if isinstance(path, bytes):
+            path = path.decode("utf-8", "replace")
+        return str(path or f"{info.get('vendor_id', 0):04X}:{info.get('product_id', 0):04X}")
+
+    def negotiate_block_size(
+        self,
+        log_callback: Optional[Callable[[str], None]] = None,
+        force: bool = False,
+        addr: int = SPD_DEFAULT_ADDR
+    ) -> int:
+        """
+        协商 BT-I2C2RD 单次读取的块长
+
+        先以 8 字节读取当前页 Offset 0 作为参照，再由大到小尝试 BLOCK_SIZE_CANDIDATES：
+        响应须完整解析出请求的字节数（放不下 64 字节 HID 报告的响应会被截断）
+        且前 8 字节与参照一致，才采用该块长。结果按设备缓存。
+
+        Args:
+            log_callback: 日志回调
+            force: 忽略缓存重新探测
+            addr: 用于探测的 SPD I2C 地址（须有模组应答）
+
+        Returns:
+            协商得到的块长
+        """
+        cached = self._block_size_cache.get(self._device_key) if self._device_key else None
+        if cached and not force:
+            self.block_size = cached
+            self._block_size_negotiated = True
+            self._log_debug(f"使用缓存的读取块长: {cached} 字节")
+            return cached
+
+        reference = self._try_read_block(addr, 0, self.BLOCK_SIZE_DEFAULT, retries=2)
+        if reference is None:
+            # 参照读取失败（如未插内存条），本次不缓存，下次读取时再协商
+            self._log_debug("块长协商: 参照读取失败，使用 8 字节")
+            self.block_size = self.BLOCK_SIZE_DEFAULT
+            return self.block_size
+
+        size = self.BLOCK_SIZE_DEFAULT
+        for candidate in self.BLOCK_SIZE_CANDIDATES:
+            if self.stop_flag:
+                # 协商被中断，本次不缓存，下次读取时再协商
+                self._log_debug("块长协商被用户取消，使用 8 字节")
+                self.block_size = self.BLOCK_SIZE_DEFAULT
+                return self.block_size
+            block = self._try_read_block(addr, 0, candidate, retries=1)
+            if block is not None and block[:len(reference)] == reference:
+                size = candidate
+                break
+            self._log_debug("块长协商: %d 字节不可用", candidate)
+
+        self.block_size = size
+        self._block_size_negotiated = True
+        if self._device_key:
+            self._block_size_cache[self._device_key] = size
+        self._log_debug(f"读取块长: {size} 字节")
+        if log_callback and size != self.BLOCK_SIZE_DEFAULT:
+            log_callback(f"读取块长: {size} 字节")
+        return size
+
+    def _fallback_block_size(self) -> None:
+        """大块读取失败，回退为 8 字节并更新缓存"""
+        self._log_debug(f"{self.block_size} 字节读取失败，回退为 {self.BLOCK_SIZE_DEFAULT} 字节")
+        self.block_size = self.BLOCK_SIZE_DEFAULT
+        if self._device_key:
+            self._block_size_cache[self._device_key] = self.BLOCK_SIZE_DEFAULT
+
     def read_spd(
         self,
         progress_callback: Optional[Callable[[float], None]] = None,
-        log_callback: Optional[Callable[[str], None]] = None
+        log_callback: Optional[Callable[[str], None]] = None,
+        skip_unused: bool = False,
+        stop_after: Optional[int] = None,
+        addr: int = SPD_DEFAULT_ADDR
     ) -> Optional[List[int]]:
         """
-        读取完整的 512 字节 SPD 数据
+        读取 SPD 数据（默认完整 512 字节）
+
+        skip_unused=True 时先读取首块，按 Byte 0 (bytes used) 跳过未使用的区域，整页未使用时不切换到该页；
+        XMP 区域 (384-511) 常位于 bytes used 之外，此时先读取 XMP 头，有 XMP 标识才读取该区域。
+        未读取的字节在结果中为 0，偏移记录在 unread_offsets 中（可传给 SPDDataModel.load_from_list）；
+        多次重试仍读取失败的块同样以 0 填充，起始偏移记录在 failed_blocks 中。
 
         Args:
             progress_callback: 进度回调函数，参数为 0-1 的进度值
             log_callback: 日志回调函数
+            skip_unused: 是否按 bytes used 跳过未使用的区域
+            stop_after: 读取上限偏移（不含），如 IDENTITY_END 只读到制造商/序列号区域为止
+            addr: SPD I2C 地址 (0x50-0x57)
 
         Returns:
             512 字节的数据列表，失败返回 None
         """
         self.stop_flag = False
+        self.unread_offsets = frozenset()
+        self.failed_blocks = frozenset()
+        self._failed_blocks = set()
         full_data = [0] * SPD_SIZE
-        read_errors = 0
+        end = SPD_SIZE if stop_after is None else max(8, min(SPD_SIZE, stop_after + (-stop_after) % 8))
 
-        self._log_debug("开始读取 SPD 数据")
+        self._log_debug(f"开始读取 SPD 数据 (addr=0x{addr:02X})")
 
         # 1. 激活与初始化
         self._log_debug("发送激活命令")
@@ -206,63 +501,507 @@ class SPDDriver:
             if log_callback:
                 log_callback("错误: 设备无响应")
             return None
-        time.sleep(0.1)
+        self._settle(0.1)
+
+        if not self._block_size_negotiated:
+            self.negotiate_block_size(log_callback, addr=addr)
 
         # 2. 读取 Page 0 (0-255)
         if log_callback:
             log_callback("正在读取 Page 0...")
-        self._log_debug("切换到 Page 0")
-        self.send_cmd("BT-I2C2WR360001")
-        time.sleep(0.2)
+        self._select_page(0)
+
+        page0_end = min(SPD_PAGE_SIZE, end)
+        page0_start = 0
+        used = SPD_SIZE
+        if skip_unused:
+            first = self._read_chunk(addr, 0, log_callback, limit=page0_end)
+            full_data[:len(first)] = first
+            page0_start = len(first)
+            used = spd_bytes_used(first[SPD_BYTES.BYTES_USED])
+            self._log_debug(f"Byte 0 = 0x{first[SPD_BYTES.BYTES_USED]:02X}: 已使用 {used} 字节")
+            page0_end = min(page0_end, used)
+
+        read_errors = self._read_page(
+            0, full_data, progress_callback, log_callback, check_zero=True, start=page0_start, limit=page0_end,
+            addr=addr
+        )
+        if read_errors is None:
+            return None
+        read_ranges = [(0, page0_end)]
 
-        for offset in range(0, SPD_PAGE_SIZE, 8):
+        # 3. 读取 Page 1 (256-511)
+        used_end = min(end, used)
+        probe_xmp = skip_unused and used < SPD_SIZE and end > SPD_BYTES.XMP_HEADER
+        if used_end > SPD_PAGE_SIZE or probe_xmp:
+            if log_callback:
+                log_callback("正在读取 Page 1...")
+            self._select_page(1)
+
+            if used_end > SPD_PAGE_SIZE:
+                if self._read_page(1, full_data, progress_callback, log_callback,
+                                   limit=used_end - SPD_PAGE_SIZE, addr=addr) is None:
+                    return None
+                read_ranges.append((SPD_PAGE_SIZE, used_end))
+
+            if probe_xmp:
+                xmp_offset = SPD_BYTES.XMP_HEADER - SPD_PAGE_SIZE
+                header = self._read_block(addr, xmp_offset, log_callback)
+                full_data[SPD_BYTES.XMP_HEADER:SPD_BYTES.XMP_HEADER + 8] = header
+                read_ranges.append((SPD_BYTES.XMP_HEADER, SPD_BYTES.XMP_HEADER + 8))
+                if header[0] == XMP_MAGIC and header[1] == 0x4A:
+                    self._log_debug("bytes used 之外发现 XMP 标识，读取 XMP 区域")
+                    if self._read_page(1, full_data, progress_callback, log_callback,
+                                       start=xmp_offset + 8, limit=end - SPD_PAGE_SIZE, addr=addr) is None:
+                        return None
+                    read_ranges.append((SPD_BYTES.XMP_HEADER + 8, end))
+
+        unread = set(range(SPD_SIZE))
+        for range_start, range_end in read_ranges:
+            unread.difference_update(range(range_start, range_end))
+        self.unread_offsets = frozenset(unread)
+        self.failed_blocks = frozenset(self._failed_blocks)
+
+        self._log_debug(
+            f"读取完成，共 {read_errors} 个潜在错误，{len(self.failed_blocks)} 个块读取失败，{len(unread)} 字节未读取"
+        )
+        if progress_callback:
+            progress_callback(1.0)
+
+        # 基本验证
+        if all(b == 0 for b in full_data[:page0_end]):
+            self._log_debug("错误: 读取的数据全为零")
+            if log_callback:
+                log_callback("警告: 读取的数据异常（全零），请检查内存条是否正确安装")
+            return None
+
+        return full_data
+
+    def probe_identity(
+        self,
+        log_callback: Optional[Callable[[str], None]] = None,
+        addr: int = SPD_DEFAULT_ADDR
+    ) -> Optional[ModuleIdentity]:
+        """
+        快速读取模组身份信息（盘点用）
+
+        只读取 Page 0 首块 (Byte 2-3: DRAM/模组类型) 与 Page 1 的 Byte 320-351
+        (制造商、日期、序列号、部件号、DRAM 制造商)，按地址顺序只切换一次页，
+        由 DDR4Parser.parse_identity() 解码。
+
+        Args:
+            log_callback: 日志回调
+            addr: SPD I2C 地址 (0x50-0x57)
+
+        Returns:
+            身份信息；设备无响应、读取结果全零或用户取消时返回 None
+        """
+        self.stop_flag = False
+        self._log_debug("开始读取模组身份信息")
+
+        if not self.send_cmd("BT-VER0010"):
+            self._log_debug("激活命令无响应")
+            if log_callback:
+                log_callback("错误: 设备无响应")
+            return None
+        self._settle(0.1)
+        if not self._block_size_negotiated:
+            self.negotiate_block_size(log_callback, addr=addr)
+
+        data = [0] * SPD_SIZE
+        if self.stop_flag:
+            self._log_debug("操作被用户取消")
+            return None
+        self._select_page(0)
+        head = self._read_chunk(addr, 0, log_callback, limit=8)
+        data[:8] = head
+
+        self._select_page(1)
+        offset = self.IDENTITY_START - SPD_PAGE_SIZE
+        limit = self.IDENTITY_END - SPD_PAGE_SIZE
+        while offset < limit:
             if self.stop_flag:
                 self._log_debug("操作被用户取消")
                 return None
+            chunk = self._read_chunk(addr, offset, log_callback, limit=limit)
+            data[SPD_PAGE_SIZE + offset:SPD_PAGE_SIZE + offset + len(chunk)] = chunk
+            offset += len(chunk)
+
+        if not any(head) and not any(data[self.IDENTITY_START:self.IDENTITY_END]):
+            self._log_debug("错误: 身份信息读取全零")
+            if log_callback:
+                log_callback("警告: 读取的数据异常（全零），请检查内存条是否正确安装")
+            return None
 
-            block = self._read_block(0x50, offset, log_callback)
+        identity = DDR4Parser(data).parse_identity()
+        self._log_debug(f"身份信息: {identity}")
+        return identity
 
-            # 检查是否全为0（可能是读取失败）
-            if all(b == 0 for b in block):
-                read_errors += 1
-                self._log_debug(f"警告: Offset 0x{offset:02X} 读取全零")
+    def scan_slots(
+        self,
+        log_callback: Optional[Callable[[str], None]] = None,
+        addrs: Tuple[int, ...] = SPD_SLOT_ADDRS
+    ) -> List[int]:
+        """
+        扫描有 SPD EEPROM 应答的 I2C 地址（插槽 0-7 对应 0x50-0x57）
 
-            for i, b in enumerate(block):
-                full_data[offset + i] = b
+        每个地址只读取 Page 0 的 Byte 0（1 字节、不重试）；无应答、无法解析
+        或读到 0xFF（总线悬空，DDR4 的 Byte 0 不会是 0xFF）的地址视为空槽。
 
-            if progress_callback:
-                progress_callback((offset + 8) / SPD_SIZE)
+        Args:
+            log_callback: 日志回调
+            addrs: 待扫描的地址
 
-        # 3. 读取 Page 1 (256-511)
+        Returns:
+            有模组的地址（升序）
+        """
+        self._log_debug("扫描 SPD 地址")
+        if not self.send_cmd("BT-VER0010"):
+            self._log_debug("激活命令无响应")
+            if log_callback:
+                log_callback("错误: 设备无响应")
+            return []
+        self._settle(0.1)
+        self._select_page(0)
+
+        found = []
+        for addr in sorted(addrs):
+            block = self._try_read_block(addr, 0, 1, retries=1)
+            if block is not None and block[0] != 0xFF:
+                found.append(addr)
+        self._log_debug(f"找到 {len(found)} 个模组: {', '.join(f'0x{a:02X}' for a in found)}")
         if log_callback:
-            log_callback("正在读取 Page 1...")
-        self._log_debug("切换到 Page 1")
-        self.send_cmd("BT-I2C2WR370001")
-        time.sleep(0.4)
+            log_callback(f"找到 {len(found)} 个模组" + (f": {', '.join(f'0x{a:02X}' for a in found)}" if found else ""))
+        return found
+
+    def read_slots(
+        self,
+        addrs: Optional[List[int]] = None,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        log_callback: Optional[Callable[[str], None]] = None
+    ) -> Optional[Dict[int, List[int]]]:
+        """
+        在一次会话中读取多个插槽的完整 SPD
+
+        EE1004 的页选择 (SPA0/SPA1) 是总线广播，对所有模组同时生效，
+        因此先切到 Page 0 依次读取全部模组的前 256 字节，再切到 Page 1 读取后 256 字节，
+        整个会话只切换两次页。
+
+        Args:
+            addrs: 待读取的地址；为 None 时先调用 scan_slots()
+            progress_callback: 整体进度回调 (0-1)
+            log_callback: 日志回调
+
+        Returns:
+            地址 -> 512 字节数据（读取结果全零的地址不包含在内，未找到模组时为空）；
+            用户取消或设备无响应时返回 None
+        """
+        self.stop_flag = False
+        self.unread_offsets = frozenset()
+        if addrs is None:
+            addrs = self.scan_slots(log_callback)
+        else:
+            addrs = sorted(addrs)
+            if not self.send_cmd("BT-VER0010"):
+                self._log_debug("激活命令无响应")
+                if log_callback:
+                    log_callback("错误: 设备无响应")
+                return None
+            self._settle(0.1)
+            self._current_page = None
+        if not addrs:
+            return {}
 
-        for offset in range(0, SPD_PAGE_SIZE, 8):
+        if not self._block_size_negotiated:
+            self.negotiate_block_size(log_callback, addr=addrs[0])
+
+        results = {addr: [0] * SPD_SIZE for addr in addrs}
+        total = len(addrs) * 2
+
+        def slot_progress(step: int, page: int) -> Optional[Callable[[float], None]]:
+            if not progress_callback:
+                return None
+            base = page * SPD_PAGE_SIZE
+            return lambda value: progress_callback((step + (value * SPD_SIZE - base) / SPD_PAGE_SIZE) / total)
+
+        for page in (0, 1):
+            if self._current_page != page:
+                if log_callback:
+                    log_callback(f"正在读取 Page {page}...")
+                self._select_page(page)
+            for index, addr in enumerate(addrs):
+                self._log_debug("读取 addr=0x%02X Page %d", addr, page)
+                if self._read_page(page, results[addr], slot_progress(page * len(addrs) + index, page),
+                                   log_callback, addr=addr) is None:
+                    return None
+
+        for addr in addrs:
+            if not any(results[addr]):
+                self._log_debug(f"addr=0x{addr:02X} 读取结果全零，已忽略")
+                if log_callback:
+                    log_callback(f"警告: 0x{addr:02X} 读取的数据异常（全零）")
+                del results[addr]
+
+        if progress_callback:
+            progress_callback(1.0)
+        return results
+
+    def _read_page(
+        self,
+        page: int,
+        full_data: List[int],
+        progress_callback: Optional[Callable[[float], None]] = None,
+        log_callback: Optional[Callable[[str], None]] = None,
+        check_zero: bool = False,
+        start: int = 0,
+        limit: int = SPD_PAGE_SIZE,
+        addr: int = SPD_DEFAULT_ADDR
+    ) -> Optional[int]:
+        """
+        按协商的块长读取当前页 (调用前已切换到该页)
+
+        Args:
+            page: 页号，决定写入 full_data 的基址
+            full_data: 512 字节结果缓冲
+            progress_callback: 进度回调
+            log_callback: 日志回调
+            check_zero: 是否统计全零的 8 字节块（可能是读取失败）
+            start: 页内起始偏移
+            limit: 页内结束偏移（不含），须为 8 的倍数
+            addr: SPD I2C 地址
+
+        Returns:
+            全零块数量；用户取消时返回 None
+        """
+        if self.adaptive_polling and self.pipeline_depth > 1:
+            return self._read_page_pipelined(
+                page, full_data, progress_callback, log_callback, check_zero, start, limit, addr
+            )
+
+        base = page * SPD_PAGE_SIZE
+        read_errors = 0
+        offset = start
+        while offset < limit:
             if self.stop_flag:
                 self._log_debug("操作被用户取消")
                 return None
 
-            block = self._read_block(0x50, offset, log_callback)
+            block = self._read_chunk(addr, offset, log_callback, limit=limit)
+            if check_zero:
+                read_errors += self._count_zero_blocks(block, offset)
 
-            for i, b in enumerate(block):
-                full_data[SPD_PAGE_SIZE + offset + i] = b
+            full_data[base + offset:base + offset + len(block)] = block
+            offset += len(block)
 
             if progress_callback:
-                progress_callback((SPD_PAGE_SIZE + offset + 8) / SPD_SIZE)
+                progress_callback((base + offset) / SPD_SIZE)
+        return read_errors
 
-        self._log_debug(f"读取完成，共 {read_errors} 个潜在错误")
+    def _read_page_pipelined(
+        self,
+        page: int,
+        full_data: List[int],
+        progress_callback: Optional[Callable[[float], None]] = None,
+        log_callback: Optional[Callable[[str], None]] = None,
+        check_zero: bool = False,
+        start: int = 0,
+        limit: int = SPD_PAGE_SIZE,
+        addr: int = SPD_DEFAULT_ADDR
+    ) -> Optional[int]:
+        """
+        流水线读取当前页（参数与返回值同 _read_page）
 
-        # 基本验证
-        if all(b == 0 for b in full_data[:256]):
-            self._log_debug("错误: 读取的数据全为零")
-            if log_callback:
-                log_callback("警告: 读取的数据异常（全零），请检查内存条是否正确安装")
-            return None
+        保持最多 pipeline_depth 条读请求在途。响应不带偏移，按发送顺序对应到请求并按请求长度
+        解析校验；丢失一条响应会使其后的对应关系整体错位，因此收到的块先暂存，
+        直到在途请求全部应答且没有多余响应（同步点）才确认写入。
+        出现超时、无法解析或多余的响应时，丢弃在途响应，把上个同步点以来的请求按原顺序放回队首重发；
+        同一页异常过多时退化为一问一答，单块多次失败时改为 8 字节顺序读取。
+        """
+        base = page * SPD_PAGE_SIZE
+        size = self.block_size
+        # 队列元素: [页内偏移, 长度, 已尝试次数]
+        pending: Deque[List[int]] = deque(
+            [offset, min(size, limit - offset), 0] for offset in range(start, limit, size)
+        )
+        in_flight: Deque[List[int]] = deque()
+        sent_times: Deque[float] = deque()     # 与 in_flight 一一对应的发送时间
+        unconfirmed: List[Tuple[List[int], List[int]]] = []
+        depth = self.pipeline_depth
+        anomalies = 0
+        read_errors = 0
+        done = 0
+
+        def commit(entry: List[int], block: List[int]) -> None:
+            nonlocal read_errors, done
+            offset = entry[0]
+            if check_zero:
+                read_errors += self._count_zero_blocks(block, offset)
+            full_data[base + offset:base + offset + len(block)] = block
+            done += len(block)
+            if progress_callback:
+                progress_callback((base + start + done) / SPD_SIZE)
 
-        return full_data
+        while pending or in_flight:
+            if self.stop_flag:
+                self._discard_in_flight(len(in_flight))
+                self._log_debug("操作被用户取消")
+                return None
+
+            entry = None
+            failed: Optional[List[int]] = None
+            try:
+                while (pending and len(in_flight) < depth
+                       and len(in_flight) + len(unconfirmed) < self.PIPELINE_SYNC_INTERVAL):
+                    entry = pending.popleft()
+                    sent_times.append(self._send_only(f"BT-I2C2RD{addr:02X}{entry[0]:02X}{entry[1]:02X}", entry[0]))
+                    in_flight.append(entry)
+                entry = in_flight.popleft()
+                sent_at = sent_times.popleft()
+                response = self._poll_response()
+                self.stats.record(CMD_READ, entry[1], sent_at, time.perf_counter(), response)
+                self._trace_response(response)
+                block = decode_block(response, entry[1])
+                if block is None:
+                    failed = entry
+                else:
+                    unconfirmed.append((entry, block))
+                    if in_flight:
+                        continue
+                    if not self._has_extra_response():
+                        # 同步点：应答数与请求数一致，暂存的块全部确认
+                        for item in unconfirmed:
+                            commit(*item)
+                        unconfirmed.clear()
+                        continue
+            except Exception as e:
+                self._log_debug("IO 错误: %s: %s", type(e).__name__, e)
+                # 已取出但尚未入列的请求按失败处理
+                held = any(entry is item for item in in_flight) or any(entry is item for item, _ in unconfirmed)
+                failed = None if entry is None or held else entry
+
+            anomalies += 1
+            self._log_debug("流水线异常: 重发 %d 个请求", len(unconfirmed) + len(in_flight) + (failed is not None))
+            self._discard_in_flight(len(in_flight))
+            requeue = [item[0] for item in unconfirmed]
+            if failed is not None:
+                failed[2] += 1
+                requeue.append(failed)
+            requeue.extend(in_flight)
+            self.stats.retry(CMD_READ, len(requeue))
+            unconfirmed.clear()
+            in_flight.clear()
+            sent_times.clear()
+            if anomalies >= self.PIPELINE_MAX_ANOMALIES and depth > 1:
+                depth = 1
+                self._log_debug("流水线异常过多，本页改为一问一答")
+
+            if failed is not None and failed[2] >= self.PIPELINE_RETRIES:
+                requeue.remove(failed)
+                if failed[1] > self.BLOCK_SIZE_DEFAULT:
+                    self._fallback_block_size()
+                    requeue.extend(pending)
+                    requeue = [
+                        [sub, self.BLOCK_SIZE_DEFAULT, 0]
+                        for item in requeue
+                        for sub in range(item[0], item[0] + item[1], self.BLOCK_SIZE_DEFAULT)
+                    ]
+                    pending.clear()
+                block = []
+                for sub in range(failed[0], failed[0] + failed[1], self.BLOCK_SIZE_DEFAULT):
+                    block.extend(self._read_block(addr, sub, log_callback))
+                commit(failed, block)
+            pending.extendleft(reversed(requeue))
+        return read_errors
+
+    def _send_only(self, cmd_str: str, offset: Optional[int] = None) -> float:
+        """只发送命令，不等待响应（流水线读取用），返回发送时间"""
+        if self._stale_response:
+            self._drain_input()
+        sent_at = time.perf_counter()
+        self._trace(TraceRecord(sent_at, TRACE_TX, offset=offset, raw=cmd_str))
+        self.device.write(self._encoder.encode(cmd_str))
+        return sent_at
+
+    def _has_extra_response(self) -> bool:
+        """在途请求已全部应答后，检查输入缓冲中是否还有多余的响应（有则丢弃）"""
+        extra = self.device.read(64, timeout_ms=0)
+        if extra:
+            self._trace(TraceRecord(time.perf_counter(), TRACE_DROP, "多余响应", raw=extra))
+            self._drain_input()
+            return True
+        return False
+
+    def _discard_in_flight(self, count: int) -> None:
+        """等待并丢弃仍在途的响应，再清空输入缓冲"""
+        for _ in range(count):
+            if self._poll_response() is None:
+                break
+        self._drain_input()
+
+    def _count_zero_blocks(self, block: List[int], offset: int) -> int:
+        """统计全零的 8 字节子块（可能是读取失败）"""
+        count = 0
+        for sub in range(0, len(block), 8):
+            if not any(block[sub:sub + 8]):
+                count += 1
+                self._log_debug("警告: Offset 0x%02X 读取全零", offset + sub)
+        return count
+
+    def _read_chunk(
+        self,
+        addr: int,
+        offset: int,
+        log_callback: Optional[Callable[[str], None]] = None,
+        limit: int = SPD_PAGE_SIZE
+    ) -> List[int]:
+        """
+        以当前块长读取一块；大块读取失败时回退为 8 字节并重读该范围
+
+        Args:
+            limit: 页内读取上限（不含），须为 8 的倍数
+
+        Returns:
+            block_size 字节数据列表（不超过 limit；读取失败的 8 字节子块为全零）
+        """
+        size = min(self.block_size, limit - offset)
+        if size > self.BLOCK_SIZE_DEFAULT:
+            block = self._try_read_block(addr, offset, size, retries=2)
+            if block is not None:
+                return block
+            self._fallback_block_size()
+
+        result: List[int] = []
+        for sub in range(offset, offset + size, self.BLOCK_SIZE_DEFAULT):
+            result.extend(self._read_block(addr, sub, log_callback))
+        return result
+
+    def _try_read_block(self, addr: int, offset: int, length: int, retries: int = 3) -> Optional[List[int]]:
+        """
+        读取指定长度的数据块
+
+        Args:
+            addr: I2C 地址
+            offset: 页内偏移
+            length: 字节数
+            retries: 尝试次数
+
+        Returns:
+            字节列表，全部尝试失败返回 None
+        """
+        cmd = f"BT-I2C2RD{addr:02X}{offset:02X}{length:02X}"
+
+        for retry in range(retries):
+            response = self._transact(cmd)
+            result = decode_block(response, length)
+            if result is not None:
+                return result
+            self._trace(TraceRecord(
+                time.perf_counter(), TRACE_DROP, f"无效响应 (重试 {retry + 1}/{retries})", offset=offset, raw=response
+            ))
+            if retry + 1 < retries:
+                self.stats.retry(CMD_READ)
+                time.sleep(0.05)
+        return None
 
     def _read_block(
         self,
@@ -281,28 +1020,12 @@ class SPDDriver:
         Returns:
             8 字节数据列表
         """
-        cmd = f"BT-I2C2RD{addr:02X}{offset:02X}08"
-
-        for retry in range(3):  # 重试 3 次
-            resp = self.send_cmd(cmd)
-
-            if resp and resp.startswith(":"):
-                try:
-                    parts = resp[1:].strip().split()
-                    hex_parts = [p for p in parts if len(p) == 2][:8]
-                    if len(hex_parts) == 8:
-                        result = [int(x, 16) for x in hex_parts]
-                        return result
-                    else:
-                        self._log_debug(f"解析失败: 只找到 {len(hex_parts)} 个十六进制值")
-                except Exception as e:
-                    self._log_debug(f"解析异常: {e}, 响应: {repr(resp)}")
-            else:
-                self._log_debug(f"无效响应 (重试 {retry+1}/3): {repr(resp)}")
+        result = self._try_read_block(addr, offset, 8)
+        if result is not None:
+            return result
 
-            time.sleep(0.05)
-
-        self._log_debug(f"读取块失败: addr=0x{addr:02X}, offset=0x{offset:02X}")
+        self._log_debug("读取块失败: addr=0x%02X, offset=0x%02X", addr, offset)
+        self._failed_blocks.add((self._current_page or 0) * SPD_PAGE_SIZE + offset)
         if log_callback:
             log_callback(f"警告: 读取 0x{offset:02X} 失败，使用默认值")
         return [0] * 8
@@ -311,20 +1034,40 @@ class SPDDriver:
         self,
         data: List[int],
         progress_callback: Optional[Callable[[float], None]] = None,
-        log_callback: Optional[Callable[[str], None]] = None
+        log_callback: Optional[Callable[[str], None]] = None,
+        fix_crc: bool = True,
+        baseline: Optional[List[int]] = None,
+        differential: bool = False,
+        verify: bool = True,
+        addr: int = SPD_DEFAULT_ADDR
     ) -> bool:
         """
         写入 SPD 数据到内存条
 
+        提供 baseline（确知的设备当前内容）或 differential=True（写入前先从设备读取当前内容）时
+        为差分写入：只写入与之不同的 8 字节块；内存中的旧快照可能已过时（已写入过或更换了内存条），
+        不能确定时应使用 differential=True（基准读取失败的块内容未知，总是写入），
+        按地址顺序先写 Page 0 再写 Page 1，且只切换到有待写块的页。
+
+        每个块检查写入响应 (:00) 并以 ACK 轮询等待 EEPROM 写周期结束；verify 时轮询直接回读该块，
+        不一致或未确认的块单独重写（最多 WRITE_RETRIES 次），无需再整片回读校验。
+
         Args:
             data: 512 字节数据列表
             progress_callback: 进度回调函数
             log_callback: 日志回调函数
+            fix_crc: 写入前是否刷新 DDR4 CRC (Byte 126-127 / 254-255)；只作用于写入的副本，
+                调用方的数据不变，实际写入的内容见 written_data（或先用 SPDDataModel.fix_crc()）
+            baseline: 设备上的当前内容 (512 字节)
+            differential: 未提供 baseline 时是否先读取设备作为差分基准
+            verify: 是否逐块回读校验
+            addr: SPD I2C 地址 (0x50-0x57)
 
         Returns:
             是否写入成功
         """
         self.stop_flag = False
+        self.written_data = None
         self._log_debug("开始写入 SPD 数据")
 
         if len(data) != SPD_SIZE:
@@ -333,56 +1076,85 @@ class SPDDriver:
                 log_callback(f"错误: 数据长度必须是 {SPD_SIZE} 字节")
             return False
 
-        # 1. 激活
-        self._log_debug("发送激活命令")
-        self.send_cmd("BT-VER0010")
-        time.sleep(0.1)
-
-        # 2. 写入 Page 0 (0-255)
-        if log_callback:
-            log_callback("正在写入 Page 0...")
-        self._log_debug("切换到 Page 0")
-        self.send_cmd("BT-I2C2WR360001")
-        time.sleep(0.2)
+        if fix_crc and data[2] == DDR4_TYPE:
+            patch = crc_patch(data)
+            if patch:
+                data = list(data)
+                for offset, value in patch.items():
+                    data[offset] = value
+                self._log_debug(f"CRC 已刷新: {', '.join(f'0x{o:03X}=0x{v:02X}' for o, v in patch.items())}")
+                if log_callback:
+                    log_callback("已更新 SPD CRC")
 
-        for offset in range(0, SPD_PAGE_SIZE, 8):
+        unknown_blocks: FrozenSet[int] = frozenset()
+        if baseline is None and differential:
+            if log_callback:
+                log_callback("正在读取设备当前内容...")
+            baseline = self.read_spd(log_callback=log_callback, addr=addr)
+            unknown_blocks = self.failed_blocks
+            if baseline is None:
+                self._log_debug("差分基准读取失败，改为完整写入")
+                if log_callback:
+                    log_callback("无法读取设备当前内容，改为完整写入")
             if self.stop_flag:
                 self._log_debug("写入被用户取消")
                 return False
-            chunk = data[offset:offset + 8]
-            if not self._write_block(0x50, offset, chunk):
-                self._log_debug(f"写入失败: offset=0x{offset:02X}")
+
+        if baseline is not None and len(baseline) == SPD_SIZE:
+            blocks = sorted(unknown_blocks.union(dirty_blocks(data, baseline)))
+            if unknown_blocks:
+                self._log_debug(f"差分基准中 {len(unknown_blocks)} 个块读取失败，按待写块处理")
+            self._log_debug(f"差分写入: {len(blocks)}/{SPD_SIZE // 8} 个块")
+            if not blocks:
                 if log_callback:
-                    log_callback(f"写入失败: Offset {hex(offset)}")
-                return False
-            if progress_callback:
-                progress_callback((offset + 8) / SPD_SIZE)
+                    log_callback("数据与设备内容一致，无需写入")
+                self.written_data = list(data)
+                return True
+            if log_callback:
+                log_callback(f"差分写入: {len(blocks)} 个块 ({len(blocks) * 8} 字节)")
+        else:
+            blocks = list(range(0, SPD_SIZE, 8))
 
-        # 3. 写入 Page 1 (256-511)
-        if log_callback:
-            log_callback("正在写入 Page 1...")
-        self._log_debug("切换到 Page 1")
-        self.send_cmd("BT-I2C2WR370001")
-        time.sleep(0.4)
+        # 1. 激活
+        self._log_debug("发送激活命令")
+        self.send_cmd("BT-VER0010")
+        self._settle(0.1)
+        self._current_page = None
 
-        for offset in range(0, SPD_PAGE_SIZE, 8):
+        # 2. 按地址顺序写入，每页最多切换一次
+        for index, address in enumerate(blocks):
             if self.stop_flag:
                 self._log_debug("写入被用户取消")
                 return False
-            chunk = data[SPD_PAGE_SIZE + offset:SPD_PAGE_SIZE + offset + 8]
-            if not self._write_block(0x50, offset, chunk):
-                self._log_debug(f"写入失败: offset=0x{SPD_PAGE_SIZE + offset:02X}")
+            page, offset = divmod(address, SPD_PAGE_SIZE)
+            if page != self._current_page:
                 if log_callback:
-                    log_callback(f"写入失败: Offset {hex(SPD_PAGE_SIZE + offset)}")
+                    log_callback(f"正在写入 Page {page}...")
+                self._select_page(page)
+            chunk = data[address:address + 8]
+            if not self._program_block(addr, offset, chunk, verify):
+                self._log_debug(f"写入失败: offset=0x{address:02X}")
+                if log_callback:
+                    log_callback(f"写入失败: Offset {hex(address)}")
                 return False
             if progress_callback:
-                progress_callback((SPD_PAGE_SIZE + offset + 8) / SPD_SIZE)
+                progress_callback((index + 1) / len(blocks))
 
         self._log_debug("写入完成")
         if log_callback:
+            if verify:
+                log_callback(f"已逐块校验 {len(blocks)} 个块")
             log_callback("写入完成，请重启电脑！")
+        self.written_data = list(data)
         return True
 
+    def _select_page(self, page: int) -> None:
+        """切换 EE1004 页 (0: Byte 0-255, 1: Byte 256-511) 并等待稳定"""
+        self._log_debug("切换到 Page %d", page)
+        self.send_cmd("BT-I2C2WR370001" if page else "BT-I2C2WR360001")
+        self._settle(0.4 if page else 0.2)
+        self._current_page = page
+
     def _write_block(self, addr: int, offset: int, data_bytes: List[int]) -> bool:
         """
         写入 8 字节数据块
@@ -393,23 +1165,133 @@ class SPDDriver:
             data_bytes: 8 字节数据
 
         Returns:
-            是否写入成功
+            设备是否确认写入（响应状态 :00）
         """
-        data_hex = "".join(f"{b:02X}" for b in data_bytes)
-        cmd = f"BT-I2C2WR{addr:02X}{offset:02X}08{data_hex}"
-        resp = self.send_cmd(cmd, delay=0.1)
-        # 写入通常返回 :00 表示成功
+        data_hex = bytes(data_bytes).hex().upper()
+        cmd = f"BT-I2C2WR{addr:02X}{offset:02X}{len(data_bytes):02X}{data_hex}"
+        response = self._transact(cmd, delay=0.1)
+        if decode_block(response, 1) != [0]:
+            self._log_debug("写入未确认: offset=0x%02X, 响应: %r", offset, decode_text(response))
+            return False
         return True
 
+    def _wait_write_complete(self, addr: int, offset: int, length: int) -> Optional[List[int]]:
+        """
+        ACK 轮询：EEPROM 内部写周期内不应答读操作，反复读取直到返回有效数据
+
+        Args:
+            addr: I2C 地址
+            offset: 页内偏移
+            length: 读取长度（1 只等待写周期结束，8 同时回读整块用于校验）
+
+        Returns:
+            读取到的数据；超过 ACK_POLL_TIMEOUT 仍无有效响应时返回 None
+        """
+        cmd = f"BT-I2C2RD{addr:02X}{offset:02X}{length:02X}"
+        deadline = time.perf_counter() + self.ACK_POLL_TIMEOUT
+        while True:
+            block = self._query_block(cmd, length, CMD_ACK_POLL)
+            if block is not None:
+                return block
+            if time.perf_counter() >= deadline:
+                self._log_debug("ACK 轮询超时: offset=0x%02X", offset)
+                return None
+
+    def _program_block(self, addr: int, offset: int, data_bytes: List[int], verify: bool = True) -> bool:
+        """
+        写入一个块并等待写周期结束，失败时只重试该块
+
+        Args:
+            addr: I2C 地址
+            offset: 页内偏移
+            data_bytes: 8 字节数据
+            verify: 是否回读该块校验（ACK 轮询直接读取整块，不增加额外往返）
+
+        Returns:
+            是否写入成功（verify 时还要求回读一致）
+        """
+        expected = list(data_bytes)
+        for attempt in range(self.WRITE_RETRIES):
+            if attempt:
+                self.stats.retry(CMD_WRITE)
+                self._log_debug("重试写入 (%d/%d): offset=0x%02X", attempt + 1, self.WRITE_RETRIES, offset)
+            if not self._write_block(addr, offset, expected):
+                # NAK 可能是上一次写周期尚未结束，等待后重试
+                self._wait_write_complete(addr, offset, 1)
+                continue
+            readback = self._wait_write_complete(addr, offset, len(expected) if verify else 1)
+            if readback is None:
+                continue
+            if verify and readback != expected:
+                self._log_debug(
+                    f"回读不一致: offset=0x{offset:02X}, "
+                    f"预期 {' '.join(f'{b:02X}' for b in expected)}, 实际 {' '.join(f'{b:02X}' for b in readback)}"
+                )
+                continue
+            return True
+        return False
+
     def stop(self) -> None:
         """停止当前操作"""
         self._log_debug("停止操作请求")
         self.stop_flag = True
 
+    def iter_verify(
+        self,
+        data: List[int],
+        start: int = 0,
+        end: int = SPD_SIZE,
+        log_callback: Optional[Callable[[str], None]] = None,
+        addr: int = SPD_DEFAULT_ADDR
+    ) -> Iterator[Tuple[int, List[int], List[int]]]:
+        """
+        流式回读对比：按协商的块长边读边产出，调用方可随时停止迭代（不再继续读取）
+
+        Args:
+            data: 预期数据 (512 字节)
+            start: 起始偏移（向下对齐到 8 字节）
+            end: 结束偏移，不含（向上对齐到 8 字节）
+            log_callback: 日志回调
+            addr: SPD I2C 地址
+
+        Yields:
+            (块起始偏移, 预期 8 字节, 实际 8 字节)；设备无响应或用户取消时提前结束
+        """
+        self.stop_flag = False
+        start = max(0, start - start % 8)
+        end = min(SPD_SIZE, end + (-end) % 8)
+
+        if self.send_cmd("BT-VER0010") is None:
+            self._log_debug("验证: 激活命令无响应")
+            return
+        self._settle(0.1)
+        if not self._block_size_negotiated:
+            self.negotiate_block_size(log_callback, addr=addr)
+        self._current_page = None
+
+        address = start
+        while address < end:
+            if self.stop_flag:
+                self._log_debug("验证被用户取消")
+                return
+            page, offset = divmod(address, SPD_PAGE_SIZE)
+            if page != self._current_page:
+                self._select_page(page)
+            limit = min(SPD_PAGE_SIZE, end - page * SPD_PAGE_SIZE)
+            chunk = self._read_chunk(addr, offset, log_callback, limit=limit)
+            for sub in range(0, len(chunk), 8):
+                block_start = address + sub
+                yield block_start, list(data[block_start:block_start + 8]), chunk[sub:sub + 8]
+            address += len(chunk)
+
     def verify_spd(
         self,
         data: List[int],
-        log_callback: Optional[Callable[[str], None]] = None
+        log_callback: Optional[Callable[[str], None]] = None,
+        fail_fast: bool = False,
+        start: int = 0,
+        end: int = SPD_SIZE,
+        addr: int = SPD_DEFAULT_ADDR
     ) -> bool:
         """
         验证写入的数据（回读对比）
@@ -417,36 +1299,58 @@ class SPDDriver:
         Args:
             data: 预期数据
             log_callback: 日志回调
+            fail_fast: 发现第一个不一致的块即停止读取
+            start: 验证范围起始偏移
+            end: 验证范围结束偏移（不含）
+            addr: SPD I2C 地址
 
         Returns:
-            验证是否通过
+            验证是否通过；未读完整个范围（用户取消、设备中途无响应）时为 False
         """
-        self._log_debug("开始验证数据")
+        self._log_debug(f"开始验证数据 (0x{start:03X}-0x{end:03X})")
         if log_callback:
             log_callback("正在验证数据...")
 
-        read_data = self.read_spd(log_callback=log_callback)
-        if not read_data:
+        mismatches = []
+        checked = 0
+        # iter_verify 按 8 字节对齐范围，covered 为已读取到的位置
+        covered = max(0, start - start % 8)
+        end = min(SPD_SIZE, end + (-end) % 8)
+        for block_start, expected, actual in self.iter_verify(data, start, end, log_callback, addr):
+            checked += 1
+            covered = block_start + 8
+            for i, (want, got) in enumerate(zip(expected, actual)):
+                if want != got:
+                    mismatches.append((block_start + i, want, got))
+            if mismatches and fail_fast:
+                break
+
+        if not checked:
             self._log_debug("验证失败: 无法读取数据")
             if log_callback:
                 log_callback("验证失败: 无法读取数据")
             return False
 
-        mismatches = []
-        for i, (expected, actual) in enumerate(zip(data, read_data)):
-            if expected != actual:
-                mismatches.append((i, expected, actual))
-
         if mismatches:
             self._log_debug(f"验证失败: {len(mismatches)} 字节不匹配")
             if log_callback:
-                log_callback(f"验证失败: {len(mismatches)} 字节不匹配")
+                if fail_fast:
+                    log_callback(f"验证失败: Offset {mismatches[0][0]:03X} 所在块不匹配")
+                else:
+                    log_callback(f"验证失败: {len(mismatches)} 字节不匹配")
                 for offset, expected, actual in mismatches[:5]:
                     log_callback(f"  Offset {offset:03X}: 预期 {expected:02X}, 实际 {actual:02X}")
                 if len(mismatches) > 5:
                     log_callback(f"  ... 还有 {len(mismatches) - 5} 处不匹配")
             return False
 
+        if covered < end:
+            message = "验证已取消" if self.stop_flag else f"验证未完成: 只读取到 0x{covered:03X}"
+            self._log_debug(message)
+            if log_callback:
+                log_callback(message)
+            return False
+
         self._log_debug("验证通过")
         if log_callback:
             log_callback("验证通过！")
@@ -460,6 +1364,9 @@ class SPDDriver:
                 f.write("SPD Tools Debug Log\n")
                 f.write(f"Exported: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
                 f.write("=" * 60 + "\n\n")
+                summary = self.get_stats_summary()
+                if summary:
+                    f.write(summary + "\n\n")
                 f.write(self.get_debug_log())
             return True
         except Exception:
@@ -0,0 +1,286 @@
+"""
+SPD 读写器模拟器
+进程内模拟 hid.device，应答 SPDDriver 使用的 BT 协议命令，由 .bin 镜像提供 EEPROM 内容，
+可配置往返延迟、抖动、I2C 总线时间、响应丢失与 EEPROM 写周期，用于无硬件的基准测试与回归测试
+
+用法:
+    device = EmulatedHIDDevice.from_file("samples/DDR4_Hynix_HMA42GR7MFR4N.bin", latency=0.002)
+    driver = SPDDriver()
+    driver.device = device
+
+    # 或经由 connect()，与真实设备走同样的枚举/打开流程
+    backend = EmulatedHIDBackend([device])
+    driver = SPDDriver(hid_backend=backend)
+    driver.connect()
+"""
+
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+from ..utils.constants import DEFAULT_VID, DEFAULT_PID, SPD_SIZE, SPD_PAGE_SIZE, SPD_DEFAULT_ADDR
+
+ImageLike = Union[bytes, bytearray, Sequence[int]]
+
+
+class EmulatedHIDDevice:
+    """
+    应答 BT 协议命令的模拟读写器（与 hid.device 接口兼容）
+
+    时序模型：命令经 (latency + 抖动) / 2 到达适配器，按到达顺序串行占用 I2C 总线
+    (每 8 字节 bus_time 秒)，响应再经 (latency + 抖动) / 2 返回主机。
+    响应与真实固件一样受 64 字节 HID 报告限制，过长的读取响应被截断。
+
+    - BT-VER...: 激活，应答版本字符串
+    - BT-I2C2WR360001 / 370001: 页选择，对总线上所有 EEPROM 生效
+    - BT-I2C2RD{addr}{offset}{len}: 读取，应答 ":XX XX ..."
+    - BT-I2C2WR{addr}{offset}{len}{data}: 写入，应答 ":00"，之后 write_time 秒内该 EEPROM 不应答 (NACK)
+    - 无模组的地址或 EEPROM 忙时应答 NACK_RESPONSE；超过 max_read_length 的读取同样应答 NACK_RESPONSE
+
+    测试可在子类中覆盖 _execute() 按命令注入故障（乱码、NAK、不应答）。
+    """
+
+    REPORT_SIZE = 64
+    VERSION_RESPONSE = "BT-VER 1.0"
+    NACK_RESPONSE = "ERR"
+
+    def __init__(
+        self,
+        images: Union[ImageLike, Dict[int, ImageLike]],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        bus_time: float = 0.0,
+        drop_rate: float = 0.0,
+        write_time: float = 0.0,
+        max_read_length: Optional[int] = None,
+        seed: Optional[int] = None,
+        path: bytes = b"emulated:0",
+        serial_number: str = "EMU00000",
+        vid: int = DEFAULT_VID,
+        pid: int = DEFAULT_PID
+    ):
+        """
+        Args:
+            images: 单个 512 字节镜像（地址 0x50），或 I2C 地址 -> 镜像
+            latency: USB 往返延迟 (秒)
+            jitter: 每条命令额外的随机延迟上限 (秒)
+            bus_time: 每 8 字节的 I2C 总线时间 (秒)
+            drop_rate: 响应丢失的概率 (0-1)
+            write_time: EEPROM 内部写周期 (秒)
+            max_read_length: 固件支持的最大读取长度（如旧固件只支持 8 字节），None 为不限
+            seed: 随机数种子（抖动与丢失可复现）
+            path / serial_number / vid / pid: 枚举信息
+        """
+        if not isinstance(images, dict):
+            images = {SPD_DEFAULT_ADDR: images}
+        self.eeproms: Dict[int, bytearray] = {}
+        for addr, image in images.items():
+            data = bytearray(image)
+            if len(data) != SPD_SIZE:
+                raise ValueError(f"镜像 0x{addr:02X} 长度 {len(data)} != {SPD_SIZE}")
+            self.eeproms[addr] = data
+
+        self.latency = latency
+        self.jitter = jitter
+        self.bus_time = bus_time
+        self.drop_rate = drop_rate
+        self.write_time = write_time
+        self.max_read_length = max_read_length
+        self._random = random.Random(seed)
+
+        self.path = path
+        self.serial_number = serial_number
+        self.vendor_id = vid
+        self.product_id = pid
+        self.opened = False
+
+        self.page = 0
+        self._busy_until = 0.0
+        self._write_busy: Dict[int, float] = {}     # 地址 -> 写周期结束时间
+        self._pending: Deque[Tuple[float, bytes]] = deque()   # (就绪时间, 响应报告)
+
+        # 统计
+        self.commands: List[str] = []
+        self.dropped = 0
+        self.nacks = 0
+        self.max_pending = 0    # 同时在途（已发送、尚未被读取）的响应数峰值
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "EmulatedHIDDevice":
+        """由 .bin 文件创建（镜像位于地址 0x50）"""
+        with open(path, "rb") as f:
+            return cls(f.read(), **kwargs)
+
+    @classmethod
+    def from_files(cls, paths: Dict[int, str], **kwargs) -> "EmulatedHIDDevice":
+        """由多个 .bin 文件创建：I2C 地址 -> 文件路径"""
+        images = {}
+        for addr, path in paths.items():
+            with open(path, "rb") as f:
+                images[addr] = f.read()
+        return cls(images, **kwargs)
+
+    def info(self) -> dict:
+        """hid.enumerate() 格式的枚举信息"""
+        return {
+            "path": self.path,
+            "vendor_id": self.vendor_id,
+            "product_id": self.product_id,
+            "serial_number": self.serial_number,
+            "manufacturer_string": "SPDStudio",
+            "product_string": "Emulated SPD Adapter",
+        }
+
+    # ---- hid.device 接口 ----
+
+    def open(self, vid: int = DEFAULT_VID, pid: int = DEFAULT_PID, serial_number: Optional[str] = None) -> None:
+        if (vid, pid) != (self.vendor_id, self.product_id):
+            raise OSError("open failed")
+        self.opened = True
+
+    def open_path(self, path: bytes) -> None:
+        if path != self.path:
+            raise OSError("open failed")
+        self.opened = True
+
+    def close(self) -> None:
+        self.opened = False
+        self._pending.clear()
+
+    def get_manufacturer_string(self) -> str:
+        return "SPDStudio"
+
+    def get_product_string(self) -> str:
+        return "Emulated SPD Adapter"
+
+    def get_serial_number_string(self) -> str:
+        return self.serial_number
+
+    def write(self, data: Sequence[int]) -> int:
+        cmd = bytes(data[1:]).rstrip(b"\x00").decode("ascii", "replace")
+        self.commands.append(cmd)
+
+        now = time.perf_counter()
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        arrive = now + delay / 2
+        start = max(arrive, self._busy_until)
+        length = int(cmd[13:15], 16) if cmd.startswith("BT-I2C2RD") else max(0, (len(cmd) - 15) // 2)
+        self._busy_until = start + self.bus_time * max(1, length / 8) if cmd.startswith("BT-I2C2") else start
+
+        resp = self._execute(cmd, start)
+        if resp is None or (self.drop_rate and self._random.random() < self.drop_rate):
+            self.dropped += 1
+        else:
+            report = resp.encode("ascii")[:self.REPORT_SIZE]
+            self._pending.append((self._busy_until + delay / 2, report))
+            self.max_pending = max(self.max_pending, len(self._pending))
+        return len(data)
+
+    def read(self, size: int, timeout_ms: int = 0) -> List[int]:
+        if not self._pending:
+            if timeout_ms:
+                time.sleep(timeout_ms / 1000)
+            return []
+        ready, report = self._pending[0]
+        wait = ready - time.perf_counter()
+        if wait > timeout_ms / 1000:
+            if timeout_ms:
+                time.sleep(timeout_ms / 1000)
+            return []
+        if wait > 0:
+            time.sleep(wait)
+        self._pending.popleft()
+        return list(report[:size])
+
+    # ---- 协议 ----
+
+    def _execute(self, cmd: str, at: float) -> Optional[str]:
+        """在 at 时刻执行命令，返回响应字符串；None 表示不应答"""
+        if cmd.startswith("BT-VER"):
+            return self.VERSION_RESPONSE
+        if cmd.startswith("BT-I2C2WR36"):
+            self.page = 0
+            return ":00"
+        if cmd.startswith("BT-I2C2WR37"):
+            self.page = 1
+            return ":00"
+        if not cmd.startswith(("BT-I2C2RD", "BT-I2C2WR")) or len(cmd) < 15:
+            return self.NACK_RESPONSE
+
+        try:
+            addr = int(cmd[9:11], 16)
+            offset = self.page * SPD_PAGE_SIZE + int(cmd[11:13], 16)
+            length = int(cmd[13:15], 16)
+        except ValueError:
+            return self.NACK_RESPONSE
+        eeprom = self.eeproms.get(addr)
+        if eeprom is None or at < self._write_busy.get(addr, 0.0):
+            self.nacks += 1
+            return self.NACK_RESPONSE
+
+        if cmd.startswith("BT-I2C2RD"):
+            if self.max_read_length is not None and length > self.max_read_length:
+                return self.NACK_RESPONSE
+            return ":" + " ".join(f"{b:02X}" for b in eeprom[offset:offset + length])
+
+        try:
+            payload = bytes.fromhex(cmd[15:15 + length * 2])
+        except ValueError:
+            return self.NACK_RESPONSE
+        if len(payload) != length or offset + length > SPD_SIZE:
+            return self.NACK_RESPONSE
+        eeprom[offset:offset + length] = payload
+        self._write_busy[addr] = self._busy_until + self.write_time
+        return ":00"
+
+
+class _EmulatedHandle:
+    """EmulatedHIDBackend.device() 返回的未打开句柄，open/open_path 后代理到对应的模拟设备"""
+
+    def __init__(self, backend: "EmulatedHIDBackend"):
+        self._backend = backend
+        self._device: Optional[EmulatedHIDDevice] = None
+
+    def open(self, vid: int = DEFAULT_VID, pid: int = DEFAULT_PID, serial_number: Optional[str] = None) -> None:
+        for device in self._backend.devices:
+            if (device.vendor_id, device.product_id) == (vid, pid) and \
+                    (serial_number is None or device.serial_number == serial_number):
+                device.open(vid, pid)
+                self._device = device
+                return
+        raise OSError("open failed")
+
+    def open_path(self, path: bytes) -> None:
+        for device in self._backend.devices:
+            if device.path == path:
+                device.open_path(path)
+                self._device = device
+                return
+        raise OSError("open failed")
+
+    def __getattr__(self, name):
+        if self._device is None:
+            raise OSError("not open")
+        return getattr(self._device, name)
+
+
+class EmulatedHIDBackend:
+    """
+    与 hid 模块接口兼容的模拟后端（enumerate / device），传给 SPDDriver(hid_backend=...)
+
+    Args:
+        devices: 模拟读写器；路径须互不相同
+    """
+
+    def __init__(self, devices: Sequence[EmulatedHIDDevice]):
+        self.devices = list(devices)
+
+    def enumerate(self, vid: int = 0, pid: int = 0) -> List[dict]:
+        return [
+            device.info() for device in self.devices
+            if (not vid or device.vendor_id == vid) and (not pid or device.product_id == pid)
+        ]
+
+    def device(self) -> _EmulatedHandle:
+        return _EmulatedHandle(self)
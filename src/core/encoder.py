@@ -0,0 +1,474 @@
+"""
+SPD 编码器
+将时序、XMP Profile 与详细参数编码为字节补丁 (偏移 -> 新值)，
+字段布局与解析器共用 parser/schema 字段表
+
+补丁可通过 SPDDataModel.apply_patch() 一次性应用到数据模型，
+也可通过 apply_patch() 直接应用到任意 SPD 镜像（批量离线处理）
+"""
+
+import math
+from typing import Dict, Any, Tuple, Optional, Sequence, MutableSequence
+
+from .parser.schema import SPDField, BASE_TIMING_DECODER, XMP_PROFILE_DECODER
+from .parser.manufacturers import get_manufacturer_id
+from ..utils.constants import SPD_SIZE, SPD_BYTES, XMP_PROFILE_OFFSETS, MODULE_TYPES, MTB, FTB
+
+
+Patch = Dict[int, int]
+
+
+class PatchBuilder:
+    """
+    补丁构造器
+
+    在源镜像之上叠加修改：get() 返回已写入补丁的新值（否则为源值），
+    set() 只记录到补丁，不修改源镜像。取值规则与 SPDDataModel.set_byte 一致。
+    """
+
+    def __init__(self, source: Sequence[int]):
+        """
+        Args:
+            source: 源 SPD 镜像（list / bytes / bytearray）
+        """
+        self.source = source
+        self._patch: Patch = {}
+
+    def get(self, offset: int) -> int:
+        """读取字节（优先返回补丁中的值）"""
+        if offset in self._patch:
+            return self._patch[offset]
+        return self.source[offset] if 0 <= offset < len(self.source) else 0
+
+    def set(self, offset: int, value: int) -> bool:
+        """
+        写入字节到补丁
+
+        Returns:
+            是否写入成功（偏移或取值越界时忽略）
+        """
+        if not (0 <= offset < SPD_SIZE) or not (0 <= value <= 255):
+            return False
+        self._patch[offset] = value
+        return True
+
+    def set_bits(self, offset: int, mask: int, value: int) -> bool:
+        """只更新字节中 mask 覆盖的位，其余位保持不变"""
+        return self.set(offset, (self.get(offset) & ~mask & 0xFF) | (value & mask))
+
+    def result(self) -> Patch:
+        """获取补丁（仅包含与源镜像不同的字节）"""
+        return {
+            offset: value for offset, value in sorted(self._patch.items())
+            if offset >= len(self.source) or self.source[offset] != value
+        }
+
+
+def apply_patch(image: MutableSequence[int], patch: Patch) -> int:
+    """
+    将补丁应用到 SPD 镜像（原地修改）
+
+    Args:
+        image: 可变的 SPD 镜像（list / bytearray）
+        patch: 偏移 -> 新值
+
+    Returns:
+        实际改变的字节数
+    """
+    changed = 0
+    for offset, value in patch.items():
+        if image[offset] != value:
+            image[offset] = value
+            changed += 1
+    return changed
+
+
+# ==================== 基础编码 ====================
+
+def signed_byte_to_u8(value: int) -> int:
+    """有符号字节 -> 无符号存储值"""
+    return value & 0xFF
+
+
+def u8_to_signed(value: int) -> int:
+    """无符号存储值 -> 有符号字节"""
+    return value if value < 128 else value - 256
+
+
+def _ceil_div(numerator: int, denominator: int) -> int:
+    if denominator <= 0:
+        return 0
+    return (numerator + denominator - 1) // denominator
+
+
+def encode_time_ps(time_ps: int, max_mtb: int = 0xFF) -> Tuple[int, int]:
+    """
+    将 ps 编码为 (MTB, FTB) 形式：time = mtb*125ps + ftb*1ps
+
+    优先生成 0..124 的正 FTB，避免不必要的负值；超出 MTB 范围时回退到最大可表示值。
+
+    Args:
+        time_ps: 时间 (ps)
+        max_mtb: MTB 部分最大值（8 位字段 0xFF，12 位字段 0xFFF）
+
+    Returns:
+        (mtb, ftb 存储值)
+    """
+    if time_ps <= 0:
+        return 0, 0
+
+    mtb_value = time_ps // MTB
+    ftb_value = int(time_ps - mtb_value * MTB)
+
+    if mtb_value > max_mtb:
+        return max_mtb, 0
+
+    # ftb_value 理论上在 0..124；仍做保护
+    ftb_value = max(-128, min(127, ftb_value))
+
+    return int(mtb_value), signed_byte_to_u8(ftb_value)
+
+
+def encode_cycles_to_mtb(cycles: int, tck_ps: int, max_mtb: int) -> int:
+    """
+    将 cycles 编码为 MTB 整数（无 FTB）
+
+    目标：尽量保持解析回来的 cycles 不变（ceil(time/tCK)）。
+    """
+    if cycles <= 0 or tck_ps <= 0:
+        return 0
+
+    # 找到能保证 ceil((mtb*MTB)/tCK) >= cycles 的最小 mtb
+    time_min_ps = (cycles - 1) * tck_ps + 1  # strictly greater than (cycles-1)*tCK
+    mtb_value = int(math.ceil(time_min_ps / MTB))
+    mtb_value = max(0, min(int(max_mtb), mtb_value))
+
+    # 如果由于 clamp 导致 cycles 不够，向上补齐
+    while mtb_value < max_mtb and _ceil_div(mtb_value * MTB, tck_ps) < cycles:
+        mtb_value += 1
+
+    # 尽量向下收敛，保持 cycles 不变（减小编码值）
+    while mtb_value > 0 and _ceil_div((mtb_value - 1) * MTB, tck_ps) == cycles:
+        mtb_value -= 1
+
+    return int(mtb_value)
+
+
+def write_field(
+    builder: PatchBuilder,
+    field: SPDField,
+    mtb: int,
+    ftb: Optional[int] = None,
+    base: int = 0
+) -> None:
+    """
+    按字段描述写入 MTB（及可选 FTB）
+
+    12 位字段只更新共享字节中属于该字段的 nibble；8 位字段的取值超出 0..255 时
+    与 SPDDataModel.set_byte 一样被忽略。
+
+    Args:
+        builder: 补丁构造器
+        field: 字段描述
+        mtb: MTB 整数
+        ftb: FTB 存储值 (0..255)，None 表示不写
+        base: 字段偏移的基址
+    """
+    if field.high_offset is None:
+        builder.set(base + field.offset, mtb)
+    else:
+        builder.set(base + field.offset, mtb & 0xFF)
+        high = (mtb >> 8) & (0x0F if field.width == 12 else 0xFF)
+        builder.set_bits(base + field.high_offset, field.high_mask, high << field.high_shift)
+    if ftb is not None and field.ftb_offset is not None:
+        builder.set(base + field.ftb_offset, ftb)
+
+
+# ==================== 基础时序 ====================
+
+def encode_timing(source: Sequence[int], key: str, value_ns: float) -> Patch:
+    """
+    编码单个基础时序参数 (Byte 17-125)
+
+    Args:
+        source: 当前 SPD 镜像
+        key: 时序名（见 schema.BASE_TIMING_FIELDS）
+        value_ns: 新值 (ns)
+
+    Returns:
+        字节补丁；未知参数返回空补丁
+    """
+    field = BASE_TIMING_DECODER.by_name.get(key)
+    if field is None:
+        return {}
+
+    value_ps = value_ns * 1000
+    mtb_value = int(value_ps / MTB)
+    ftb_value = int((value_ps - mtb_value * MTB) / FTB)
+
+    # 将 FTB 转换为有符号字节 (-128 到 127)
+    if ftb_value > 127:
+        ftb_value = ftb_value - 256
+    elif ftb_value < -128:
+        ftb_value = ftb_value + 256
+
+    builder = PatchBuilder(source)
+    write_field(builder, field, mtb_value, ftb_value & 0xFF)
+    return builder.result()
+
+
+# ==================== 详细参数 ====================
+
+def encode_detail(source: Sequence[int], key: str, value: str) -> Patch:
+    """
+    编码详细参数页的可编辑字段
+
+    Args:
+        source: 当前 SPD 镜像
+        key: 字段名 (manufacturer / part_number / serial_number /
+             manufacturing_date / module_type / speed_grade)
+        value: 用户输入的文本
+
+    Returns:
+        字节补丁；无法解析的输入返回空补丁
+    """
+    builder = PatchBuilder(source)
+
+    if key == "manufacturer":
+        first_byte, second_byte = get_manufacturer_id(value)
+        builder.set(SPD_BYTES.MANUFACTURER_ID_FIRST, first_byte)
+        builder.set(SPD_BYTES.MANUFACTURER_ID_SECOND, second_byte)
+
+    elif key == "part_number":
+        # 部件号 (20 字符，右侧填充空格)
+        part_number = value.ljust(20)[:20]
+        for i, char in enumerate(part_number):
+            builder.set(SPD_BYTES.PART_NUMBER_START + i, ord(char))
+
+    elif key == "serial_number":
+        # 序列号 (4 字节十六进制)
+        try:
+            hex_str = value.replace("0x", "").replace("0X", "").replace(" ", "")
+            if len(hex_str) <= 8:
+                hex_str = hex_str.zfill(8)
+                for i in range(4):
+                    builder.set(SPD_BYTES.SERIAL_NUMBER_1 + i, int(hex_str[i*2:(i+1)*2], 16))
+        except ValueError:
+            return {}
+
+    elif key == "manufacturing_date":
+        # 生产日期 (格式: YYYY-WXX、WXX/YYYY 或 YYYY)
+        try:
+            value = value.strip()
+            year = None
+            week = None
+
+            if "/" in value:
+                parts = value.split("/")
+                week = int(parts[0].replace("W", "").replace("w", ""))
+                year = int(parts[1]) % 100
+            elif "-W" in value.upper():
+                parts = value.upper().split("-W")
+                year = int(parts[0]) % 100
+                week = int(parts[1])
+            elif len(value) == 4 and value.isdigit():
+                year = int(value) % 100
+                week = 1
+
+            if year is not None:
+                builder.set(SPD_BYTES.MANUFACTURING_YEAR, year)
+            if week is not None:
+                builder.set(SPD_BYTES.MANUFACTURING_WEEK, week)
+        except (ValueError, IndexError):
+            return {}
+
+    elif key == "module_type":
+        for type_code, type_name in MODULE_TYPES.items():
+            if type_name == value:
+                builder.set(SPD_BYTES.MODULE_TYPE, type_code)
+                break
+
+    elif key == "speed_grade":
+        # 速度等级通过 tCK_min 表示：tCK_min (ps) = 2000000 / speed_grade
+        try:
+            speed = int(value)
+        except ValueError:
+            return {}
+        if 1600 <= speed <= 5000:
+            tck_ps = int(round(2000000 / speed))
+            tck_mtb = int(tck_ps // MTB)
+            tck_ftb = int(tck_ps - tck_mtb * MTB)  # 0..124
+            write_field(builder, BASE_TIMING_DECODER.by_name["tCK"], tck_mtb, tck_ftb & 0xFF)
+
+    return builder.result()
+
+
+# ==================== XMP Profile ====================
+
+def _select_xmp_tck(builder: PatchBuilder, profile_offset: int, freq_mt_s: int, frequency_changed: bool) -> Tuple[int, int, int]:
+    """
+    确定 Profile 的 tCK
+
+    “只改其它字段”时优先使用 SPD 中已有的 tCK（避免吸附/取整造成不必要漂移）。
+
+    Returns:
+        (tck_ps, tck_mtb, tck_ftb)
+    """
+    current_tck_mtb = builder.get(profile_offset + XMP_PROFILE_OFFSETS.TCK_MTB)
+    current_tck_ftb = u8_to_signed(builder.get(profile_offset + XMP_PROFILE_OFFSETS.TCK_FTB))
+    current_tck_ps = current_tck_mtb * MTB + current_tck_ftb * FTB
+
+    if not frequency_changed and current_tck_ps > 0:
+        return int(current_tck_ps), int(current_tck_mtb), int(current_tck_ftb)
+
+    tck_ps_exact = 2000000 / max(1, freq_mt_s)  # 2000000 ps / MT/s
+
+    # XMP 的 tCK/时序以 1ps 为分辨率，选取最接近目标频点的整数 ps
+    tck_ps_floor = max(1, int(tck_ps_exact // 1))
+    tck_ps_ceil = max(1, tck_ps_floor if abs(tck_ps_exact - tck_ps_floor) < 1e-9 else tck_ps_floor + 1)
+
+    def _freq_error(ps: int) -> float:
+        return abs((2000000 / ps) - freq_mt_s)
+
+    tck_ps = tck_ps_floor if _freq_error(tck_ps_floor) <= _freq_error(tck_ps_ceil) else tck_ps_ceil
+    tck_mtb = int(tck_ps // MTB)
+    tck_ftb = int(tck_ps - tck_mtb * MTB)  # 0..124
+    return tck_ps, tck_mtb, tck_ftb
+
+
+def encode_xmp_profile(
+    source: Sequence[int],
+    profile_num: int,
+    data: Dict[str, Any],
+    is_new: bool = False
+) -> Patch:
+    """
+    编码 XMP 2.0 Profile
+
+    Args:
+        source: 当前 SPD 镜像
+        profile_num: Profile 编号 (1 或 2)
+        data: 编辑对话框数据（时序为 cycles；"__changed_keys" 为用户修改过的字段，
+              "__experimental_fields" 为是否写入实验性字段）
+        is_new: 是否新建 Profile（初始化 XMP 头部并写入全部字段）
+
+    Returns:
+        字节补丁
+    """
+    changed_keys = set(data.get("__changed_keys", []) or [])
+    if not is_new and not changed_keys:
+        return {}
+
+    builder = PatchBuilder(source)
+    fields = XMP_PROFILE_DECODER.by_name
+
+    # 如果是新建 Profile，先初始化 XMP 头部
+    if is_new and builder.get(SPD_BYTES.XMP_HEADER) != 0x0C:
+        builder.set(SPD_BYTES.XMP_HEADER, 0x0C)
+        builder.set(SPD_BYTES.XMP_HEADER + 1, 0x4A)  # 'J'
+        builder.set(SPD_BYTES.XMP_REVISION, 0x20)  # XMP 2.0
+
+    profile_offset = SPD_BYTES.XMP_PROFILE1_START if profile_num == 1 else SPD_BYTES.XMP_PROFILE2_START
+
+    # 新建 Profile2 时，优先以 Profile1 作为模板拷贝一份，避免遗漏/破坏未建模字段
+    if is_new and profile_num == 2:
+        p1_voltage = builder.get(SPD_BYTES.XMP_PROFILE1_START)
+        if (p1_voltage & 0x80) != 0 and p1_voltage not in (0x00, 0xFF):
+            profile_len = SPD_BYTES.XMP_PROFILE2_START - SPD_BYTES.XMP_PROFILE1_START  # 47 bytes
+            for i in range(profile_len):
+                builder.set(SPD_BYTES.XMP_PROFILE2_START + i, builder.get(SPD_BYTES.XMP_PROFILE1_START + i))
+
+    # 频率 -> tCK (MTB+FTB)
+    freq_mt_s = int(data.get("frequency", 3200))
+    frequency_changed = is_new or ("frequency" in changed_keys)
+    tck_ps, tck_mtb, tck_ftb = _select_xmp_tck(builder, profile_offset, freq_mt_s, frequency_changed)
+
+    # 电压编码: bit7 = enabled, bits6:0 为 10mV 步进
+    voltage = data.get("voltage", 1.350)
+    voltage_code = max(0, min(0x7F, int(round((voltage - 1.0) * 100))))
+    voltage_byte = 0x80 | voltage_code
+
+    # CL/tRCD/tRP/tRAS 时序 (对话框给出的是周期数)，time(ps) = cycles * tCK(ps)
+    cl = data.get("CL", 16)
+    trcd_cycles = data.get("tRCD", 18)
+    trp_cycles = data.get("tRP", 18)
+    tras_cycles = data.get("tRAS", 38)
+    trc_cycles_input = int(data.get("tRC", 0) or 0)
+
+    tras_mtb = min(int(int(tras_cycles * tck_ps) // MTB), 0xFFF)
+
+    # Offset +0: 电压
+    if is_new or ("voltage" in changed_keys):
+        builder.set(profile_offset + XMP_PROFILE_OFFSETS.VDD_VOLTAGE, voltage_byte)
+
+    # Offset +3/+38: tCK (MTB/FTB)
+    if frequency_changed:
+        write_field(builder, fields["tCK"], tck_mtb, signed_byte_to_u8(tck_ftb), base=profile_offset)
+
+    # Offset +8/+34, +9/+35, +10/+36: tAA/tRCD/tRP (MTB/FTB)
+    for name, key, cycles in (("tAA", "CL", cl), ("tRCD", "tRCD", trcd_cycles), ("tRP", "tRP", trp_cycles)):
+        if frequency_changed or (key in changed_keys):
+            mtb, ftb = encode_time_ps(int(cycles * tck_ps))
+            write_field(builder, fields[name], mtb, ftb, base=profile_offset)
+
+    # Offset +11-13: tRAS/tRC (12-bit: Byte11 = [tRC upper nibble | tRAS upper nibble])
+    should_write_tras = is_new or frequency_changed or ("tRAS" in changed_keys)
+    should_write_trc = is_new or frequency_changed or ("tRC" in changed_keys)
+    tras_high = fields["tRAS"]
+
+    # tRC：对现有 Profile，若用户输入 0 则保留原值；否则写入用户指定值
+    if should_write_trc and (trc_cycles_input > 0 or is_new):
+        trc_cycles = trc_cycles_input if trc_cycles_input > 0 else int(tras_cycles + trp_cycles)
+        trc_mtb, trc_ftb = encode_time_ps(int(trc_cycles * tck_ps), max_mtb=fields["tRC"].max_mtb)
+        write_field(builder, fields["tRC"], trc_mtb, trc_ftb, base=profile_offset)
+        builder.set_bits(profile_offset + tras_high.high_offset, tras_high.high_mask, tras_mtb >> 8)
+    elif should_write_tras:
+        # 保留 tRC nibble，只更新 tRAS nibble
+        builder.set_bits(profile_offset + tras_high.high_offset, tras_high.high_mask, tras_mtb >> 8)
+
+    if should_write_tras:
+        builder.set(profile_offset + tras_high.offset, tras_mtb & 0xFF)
+
+    # 确保所选 CL 在 Profile 的 CAS Latencies bitmap 中标记为支持（不清除其它位）
+    if is_new or frequency_changed or ("CL" in changed_keys):
+        cl_bit = int(cl) - 7
+        if 0 <= cl_bit < 24:
+            cas_offsets = [
+                XMP_PROFILE_OFFSETS.CAS_LATENCIES_0,
+                XMP_PROFILE_OFFSETS.CAS_LATENCIES_1,
+                XMP_PROFILE_OFFSETS.CAS_LATENCIES_2,
+            ]
+            cas_off = profile_offset + cas_offsets[cl_bit // 8]
+            builder.set(cas_off, builder.get(cas_off) | (1 << (cl_bit % 8)))
+
+    # ===== 进阶时序（cycles -> MTB；0 表示保留现状，新建时 0 则写 0） =====
+    def _maybe_write_cycles(key: str, force: bool) -> None:
+        if not force:
+            return
+        value_cycles = int(data.get(key, 0) or 0)
+        if value_cycles <= 0 and not is_new:
+            return
+        field = fields[key]
+        mtb_value = encode_cycles_to_mtb(value_cycles, tck_ps, field.max_mtb) if value_cycles > 0 else 0
+        write_field(builder, field, mtb_value, base=profile_offset)
+
+    def _force(key: str) -> bool:
+        return is_new or frequency_changed or (key in changed_keys)
+
+    # tRFC1/2/4 (u16)、tFAW (u12)、tRRD_S/L (u8)
+    for key in ("tRFC1", "tRFC2", "tRFC4", "tFAW", "tRRD_S", "tRRD_L"):
+        _maybe_write_cycles(key, _force(key))
+
+    # 实验性字段：仅在对话框显式开启时才写入，默认完全不触碰（避免与外部工具解析冲突）
+    if bool(data.get("__experimental_fields")):
+        for key in ("tCCD_L", "tWTR_S", "tWTR_L"):
+            _maybe_write_cycles(key, key in changed_keys)
+
+    # tWR (u12)
+    _maybe_write_cycles("tWR", _force("tWR"))
+
+    # 启用 Profile
+    enable_bit = 0x01 if profile_num == 1 else 0x02
+    builder.set(SPD_BYTES.XMP_PROFILE_ENABLED, builder.get(SPD_BYTES.XMP_PROFILE_ENABLED) | enable_bit)
+
+    return builder.result()
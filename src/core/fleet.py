@@ -0,0 +1,218 @@
+"""
+多读写器并行读取
+枚举所有匹配 VID/PID 的读写器，每个设备一个工作线程（各自的 SPDDriver 按路径打开设备）并发读取
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from .driver import SPDDriver
+from ..utils.constants import DEFAULT_VID, DEFAULT_PID
+
+
+def device_path(info: dict) -> str:
+    """枚举信息中的设备路径（str）"""
+    path = info.get("path")
+    if isinstance(path, bytes):
+        path = path.decode("utf-8", "replace")
+    return str(path or "")
+
+
+@dataclass
+class DeviceReadResult:
+    """单个读写器的读取结果"""
+    path: str
+    serial: str
+    data: Optional[List[int]] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    unread_offsets: frozenset = frozenset()
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
+    @property
+    def bytes_read(self) -> int:
+        return len(self.data) - len(self.unread_offsets) if self.data is not None else 0
+
+
+@dataclass
+class FleetStats:
+    """整批读取的汇总统计"""
+    devices: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    bytes_read: int = 0
+    elapsed: float = 0.0            # 整批耗时 (秒)
+    device_time: float = 0.0        # 各设备耗时之和 (秒)
+
+    @property
+    def throughput(self) -> float:
+        """整批吞吐量 (字节/秒)"""
+        return self.bytes_read / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def parallelism(self) -> float:
+        """实际并行度 = 各设备耗时之和 / 整批耗时"""
+        return self.device_time / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class FleetReport:
+    """FleetReader.read_all() 的返回值"""
+    results: Dict[str, DeviceReadResult] = field(default_factory=dict)   # 设备路径 -> 结果
+    stats: FleetStats = field(default_factory=FleetStats)
+
+    def by_serial(self) -> Dict[str, DeviceReadResult]:
+        """按读写器序列号索引（无序列号的设备以路径代替）"""
+        return {result.serial or path: result for path, result in self.results.items()}
+
+
+class FleetReader:
+    """
+    多读写器并行读取
+
+    用法:
+        reader = FleetReader()
+        report = reader.read_all()
+        for path, result in report.results.items():
+            ...
+        print(report.stats.throughput)
+    """
+
+    def __init__(
+        self,
+        vid: int = DEFAULT_VID,
+        pid: int = DEFAULT_PID,
+        driver_factory: Optional[Callable[[dict], SPDDriver]] = None,
+        hid_backend=None
+    ):
+        """
+        Args:
+            vid: USB VID
+            pid: USB PID
+            driver_factory: 由枚举信息创建驱动的函数；默认 SPDDriver(vid, pid, path=info["path"])。
+                返回已连接的驱动时不再调用 connect()
+            hid_backend: HID 后端（见 SPDDriver），默认 hid 模块
+        """
+        self.vid = vid
+        self.pid = pid
+        self.hid_backend = hid_backend
+        self.driver_factory = driver_factory or self._default_factory
+        self._drivers: List[SPDDriver] = []
+        self._lock = threading.Lock()
+        # 整批的停止请求：驱动的 stop_flag 会在 read_spd 开始时被清除，单独设置一次可能丢失
+        self._stop_event = threading.Event()
+
+    def _default_factory(self, info: dict) -> SPDDriver:
+        return SPDDriver(self.vid, self.pid, path=info.get("path"), hid_backend=self.hid_backend)
+
+    def discover(self) -> List[dict]:
+        """枚举全部匹配的读写器"""
+        return SPDDriver.find_spd_devices(self.vid, self.pid, self.hid_backend)
+
+    def read_all(
+        self,
+        devices: Optional[List[dict]] = None,
+        progress_callback: Optional[Callable[[str, float], None]] = None,
+        log_callback: Optional[Callable[[str, str], None]] = None,
+        **read_kwargs
+    ) -> FleetReport:
+        """
+        并行读取全部读写器
+
+        回调在各设备的工作线程中调用，GUI 使用时需自行转发到主线程。
+
+        Args:
+            devices: 枚举信息列表；为 None 时调用 discover()
+            progress_callback: 进度回调 (设备路径, 0-1 进度)
+            log_callback: 日志回调 (设备路径, 消息)
+            **read_kwargs: 传给 SPDDriver.read_spd 的参数（如 skip_unused）
+
+        Returns:
+            FleetReport（结果按设备路径索引）
+        """
+        if devices is None:
+            devices = self.discover()
+        report = FleetReport()
+        if not devices:
+            return report
+
+        self._stop_event.clear()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(devices), thread_name_prefix="spd-fleet") as executor:
+            futures = [
+                executor.submit(self._read_one, info, progress_callback, log_callback, read_kwargs)
+                for info in devices
+            ]
+            results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+
+        stats = report.stats
+        stats.devices = len(results)
+        stats.elapsed = elapsed
+        for result in results:
+            report.results[result.path] = result
+            stats.device_time += result.elapsed
+            if result.ok:
+                stats.succeeded += 1
+                stats.bytes_read += result.bytes_read
+            else:
+                stats.failed += 1
+        return report
+
+    def _read_one(
+        self,
+        info: dict,
+        progress_callback: Optional[Callable[[str, float], None]],
+        log_callback: Optional[Callable[[str, str], None]],
+        read_kwargs: dict
+    ) -> DeviceReadResult:
+        """工作线程：连接、读取并断开单个读写器"""
+        path = device_path(info)
+        result = DeviceReadResult(path=path, serial=info.get("serial_number") or "")
+        log = (lambda message: log_callback(path, message)) if log_callback else None
+
+        def progress(value: float) -> None:
+            # 每个块后重新设置 stop_flag，覆盖 read_spd 开始时的清除
+            if self._stop_event.is_set():
+                driver.stop()
+            if progress_callback:
+                progress_callback(path, value)
+
+        started = time.perf_counter()
+        driver = None
+        try:
+            driver = self.driver_factory(info)
+            with self._lock:
+                self._drivers.append(driver)
+            if not driver.is_connected() and not driver.connect(log):
+                result.error = "连接失败"
+            elif self._stop_event.is_set():
+                result.error = "已停止"
+            else:
+                result.data = driver.read_spd(progress, log, **read_kwargs)
+                if result.data is None:
+                    result.error = "已停止" if driver.stop_flag or self._stop_event.is_set() else "读取失败"
+                else:
+                    result.unread_offsets = driver.unread_offsets
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        finally:
+            if driver is not None:
+                driver.disconnect()
+                with self._lock:
+                    self._drivers.remove(driver)
+            result.elapsed = time.perf_counter() - started
+        return result
+
+    def stop(self) -> None:
+        """停止所有正在进行的读取（尚未开始读取的设备不再读取）"""
+        self._stop_event.set()
+        with self._lock:
+            for driver in self._drivers:
+                driver.stop()
@@ -3,20 +3,21 @@ SPD 数据模型
 实现观察者模式，支持数据变更通知
 """
 
-from typing import List, Optional, Callable, Set, Dict, Any
+from typing import List, Optional, Callable, Set, Dict, Any, FrozenSet, Iterable, Iterator, Tuple, Hashable
 from dataclasses import dataclass, field
+from contextlib import contextmanager
 from enum import Enum
 import json
 import os
 from datetime import datetime
 
-from ..utils.constants import SPD_SIZE
+from ..utils.constants import DDR4_TYPE, SPD_SIZE
 
 
 class DataChangeType(Enum):
     """数据变更类型"""
     BYTE_CHANGED = "byte_changed"      # 单字节修改
-    RANGE_CHANGED = "range_changed"    # 范围修改
+    RANGE_CHANGED = "range_changed"    # 范围修改（含批量事务提交）
     DATA_LOADED = "data_loaded"        # 数据加载
     DATA_RESET = "data_reset"          # 数据重置
 
@@ -29,6 +30,7 @@ class DataChangeEvent:
     length: Optional[int] = None
     old_value: Optional[int] = None
     new_value: Optional[int] = None
+    offsets: Optional[FrozenSet[int]] = None  # 本次变更涉及的全部偏移（RANGE_CHANGED）
 
 
 class SPDDataModel:
@@ -45,16 +47,31 @@ class SPDDataModel:
         self._modified_bytes: Set[int] = set()
         self._file_path: Optional[str] = None
         self._is_from_device: bool = False
+        # 未从设备读取的偏移（按 bytes used 跳过或提前停止读取），数据中为 0 占位
+        self._unread_offsets: FrozenSet[int] = frozenset()
+        # 批量事务状态：嵌套深度与事务期间被修改的偏移
+        self._batch_depth: int = 0
+        self._batch_offsets: Set[int] = set()
+        # 数据版本号：每次实际修改数据时单调递增，解析缓存以此判断是否失效
+        self._version: int = 0
+        self._parse_cache: Dict[Hashable, Tuple[int, Any]] = {}
+        # 每个缓存项自生成以来累计的变更偏移，用于按分区增量重算
+        self._dirty_offsets: Dict[Hashable, Set[int]] = {}
 
     @property
     def data(self) -> List[int]:
         """获取数据副本"""
         return self._data.copy()
 
+    @property
+    def version(self) -> int:
+        """数据版本号（单调递增）"""
+        return self._version
+
     @property
     def has_data(self) -> bool:
         """是否有有效数据"""
-        return any(b != 0 for b in self._data)
+        return self._cached("has_data", lambda: any(b != 0 for b in self._data))
 
     @property
     def is_modified(self) -> bool:
@@ -66,11 +83,25 @@ class SPDDataModel:
         """获取修改的字节数"""
         return len(self._modified_bytes)
 
+    @property
+    def original_data(self) -> Optional[List[int]]:
+        """加载/读取时的原始数据副本；未加载时为 None"""
+        return self._original_data.copy() if self._original_data else None
+
     @property
     def modified_bytes(self) -> Set[int]:
         """获取修改的字节索引集合"""
         return self._modified_bytes.copy()
 
+    @property
+    def unread_offsets(self) -> FrozenSet[int]:
+        """未从设备读取的字节偏移"""
+        return self._unread_offsets
+
+    def is_byte_read(self, offset: int) -> bool:
+        """指定字节是否包含实际读取（或加载）的数据"""
+        return offset not in self._unread_offsets
+
     @property
     def file_path(self) -> Optional[str]:
         """获取文件路径"""
@@ -104,11 +135,179 @@ class SPDDataModel:
             except Exception as e:
                 print(f"Observer callback error: {e}")
 
+    def _bump_version(self, offsets: Optional[Iterable[int]] = None) -> None:
+        """
+        数据已变更，递增版本号
+
+        Args:
+            offsets: 变更的字节偏移；为 None 表示整体替换，丢弃全部缓存
+        """
+        self._version += 1
+        if offsets is None:
+            self._parse_cache.clear()
+            self._dirty_offsets.clear()
+            return
+        for dirty in self._dirty_offsets.values():
+            dirty.update(offsets)
+
+    def _cached(
+        self,
+        key: Hashable,
+        builder: Callable[[], Any],
+        updater: Optional[Callable[[Any, Set[int]], Any]] = None
+    ) -> Any:
+        """
+        按数据版本缓存计算结果
+
+        Args:
+            key: 缓存键
+            builder: 无可用缓存时调用的完整计算函数
+            updater: 可选的增量计算函数，参数为 (旧结果, 变更偏移集合)
+
+        Returns:
+            当前版本对应的计算结果
+        """
+        entry = self._parse_cache.get(key)
+        if entry is not None and entry[0] == self._version:
+            return entry[1]
+        if entry is not None and updater is not None:
+            value = updater(entry[1], self._dirty_offsets[key])
+        else:
+            value = builder()
+        self._parse_cache[key] = (self._version, value)
+        self._dirty_offsets[key] = set()
+        return value
+
+    def get_parsed_info(self, mode: str = "spd") -> Dict[str, Any]:
+        """
+        获取解析结果（DDR4Parser.to_dict）
+
+        同一数据版本内只解析一次，所有选项卡、导出与日志共享结果。
+        数据变更后只重算受变更字节影响的解析分区（见 DDR4Parser.update_dict）。
+        返回的字典为共享缓存，调用方不应修改。
+
+        Args:
+            mode: 显示模式 ("spd" 或 "read")
+        """
+        from .parser import DDR4Parser
+        return self._cached(
+            ("info", mode),
+            lambda: DDR4Parser(self._data).to_dict(mode=mode),
+            lambda previous, offsets: DDR4Parser(self._data).update_dict(previous, offsets, mode=mode)
+        )
+
+    def get_timing_info(self):
+        """获取时序参数（DDR4Parser.parse_timings，按版本缓存）"""
+        from .parser import DDR4Parser
+
+        def _update(previous, offsets: Set[int]):
+            if "timings" not in DDR4Parser.sections_for_offsets(offsets):
+                return previous
+            return DDR4Parser(self._data).parse_timings()
+
+        return self._cached("timings", lambda: DDR4Parser(self._data).parse_timings(), _update)
+
+    def _block_crcs(self) -> List[int]:
+        """
+        各 CRC 块的当前 CRC 值（增量维护）
+
+        缓存值为 (各块 CRC, 上次计算时的数据快照)；数据变更后只对变更偏移
+        按 core.crc.crc_delta 异或修正，不重新遍历整个块。
+        """
+        from .crc import compute_block_crcs, crc_delta
+
+        def _update(previous, offsets: Set[int]):
+            crcs, snapshot = previous
+            crcs = list(crcs)
+            for offset in offsets:
+                delta = crc_delta(offset, snapshot[offset], self._data[offset])
+                snapshot[offset] = self._data[offset]
+                if delta is not None:
+                    crcs[delta[0]] ^= delta[1]
+            return crcs, snapshot
+
+        return self._cached(
+            "crc",
+            lambda: (compute_block_crcs(self._data), self._data.copy()),
+            _update
+        )[0]
+
+    def check_crc(self):
+        """
+        校验 CRC（基础配置区 Byte 0-125 与模组区 Byte 128-253）
+
+        Returns:
+            各 CRC 块的校验结果 (List[CRCStatus])；不是 DDR4 数据时为空
+        """
+        from .crc import build_status
+
+        if self._data[2] != DDR4_TYPE:
+            return []
+        return build_status(self._data, self._block_crcs())
+
+    @property
+    def crc_valid(self) -> bool:
+        """全部 CRC 块是否有效"""
+        statuses = self.check_crc()
+        return bool(statuses) and all(s.valid for s in statuses)
+
+    def fix_crc(self) -> Dict[int, int]:
+        """
+        刷新 DDR4 CRC (Byte 126-127 / 254-255)，写入设备前调用，使模型与写入的内容一致
+
+        Returns:
+            修改的偏移 -> 新值；CRC 已正确或不是 DDR4 数据时为空
+        """
+        from .crc import crc_patch
+
+        if self._data[2] != DDR4_TYPE:
+            return {}
+        patch = crc_patch(self._data)
+        if patch:
+            self.apply_patch(patch)
+        return patch
+
+    @property
+    def in_batch(self) -> bool:
+        """是否处于批量事务中"""
+        return self._batch_depth > 0
+
+    @contextmanager
+    def batch(self) -> Iterator["SPDDataModel"]:
+        """
+        批量修改事务
+
+        事务期间的 set_byte/set_bytes 不会立即通知观察者，
+        退出最外层事务时合并为一次 RANGE_CHANGED 事件，
+        事件的 offsets 字段携带全部被修改的偏移。支持嵌套。
+
+        用法:
+            with model.batch():
+                model.set_byte(0x18, 0x05)
+                model.set_byte(0x7D, 0x00)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_offsets:
+                offsets = frozenset(self._batch_offsets)
+                self._batch_offsets.clear()
+                start = min(offsets)
+                self._notify_observers(DataChangeEvent(
+                    change_type=DataChangeType.RANGE_CHANGED,
+                    offset=start,
+                    length=max(offsets) - start + 1,
+                    offsets=offsets
+                ))
+
     def load_from_list(
         self,
         data: List[int],
         is_from_device: bool = False,
-        file_path: Optional[str] = None
+        file_path: Optional[str] = None,
+        unread_offsets: Optional[Iterable[int]] = None
     ) -> bool:
         """
         从列表加载数据
@@ -117,6 +316,7 @@ class SPDDataModel:
             data: 512 字节数据列表
             is_from_device: 是否来自设备
             file_path: 文件路径（如果从文件加载）
+            unread_offsets: 未从设备读取的偏移（见 SPDDriver.read_spd 的 skip_unused / stop_after）
 
         Returns:
             是否加载成功
@@ -129,6 +329,8 @@ class SPDDataModel:
         self._modified_bytes.clear()
         self._is_from_device = is_from_device
         self._file_path = file_path
+        self._unread_offsets = frozenset(unread_offsets or ())
+        self._bump_version()
 
         self._notify_observers(DataChangeEvent(
             change_type=DataChangeType.DATA_LOADED
@@ -197,6 +399,7 @@ class SPDDataModel:
             return True
 
         self._data[offset] = value
+        self._bump_version((offset,))
 
         # 更新修改标记
         if self._original_data:
@@ -205,6 +408,10 @@ class SPDDataModel:
             elif offset in self._modified_bytes:
                 self._modified_bytes.discard(offset)
 
+        if self._batch_depth:
+            self._batch_offsets.add(offset)
+            return True
+
         self._notify_observers(DataChangeEvent(
             change_type=DataChangeType.BYTE_CHANGED,
             offset=offset,
@@ -232,10 +439,13 @@ class SPDDataModel:
                 return False
 
         # 批量更新
+        changed: Set[int] = set()
         for i, value in enumerate(values):
             pos = offset + i
-            old_value = self._data[pos]
+            if self._data[pos] == value:
+                continue
             self._data[pos] = value
+            changed.add(pos)
 
             if self._original_data:
                 if self._data[pos] != self._original_data[pos]:
@@ -243,13 +453,40 @@ class SPDDataModel:
                 elif pos in self._modified_bytes:
                     self._modified_bytes.discard(pos)
 
+        if changed:
+            self._bump_version(changed)
+
+        if self._batch_depth:
+            self._batch_offsets.update(changed)
+            return True
+
         self._notify_observers(DataChangeEvent(
             change_type=DataChangeType.RANGE_CHANGED,
             offset=offset,
-            length=len(values)
+            length=len(values),
+            offsets=frozenset(changed)
         ))
         return True
 
+    def apply_patch(self, patch: Dict[int, int]) -> bool:
+        """
+        应用字节补丁（见 core.encoder），所有修改合并为一次数据变更通知
+
+        Args:
+            patch: 偏移 -> 新值
+
+        Returns:
+            是否应用成功（任一偏移或取值越界时不做任何修改）
+        """
+        for offset, value in patch.items():
+            if not (0 <= offset < SPD_SIZE) or not (0 <= value <= 255):
+                return False
+
+        with self.batch():
+            for offset, value in patch.items():
+                self.set_byte(offset, value)
+        return True
+
     def get_range(self, offset: int, length: int) -> List[int]:
         """获取一段连续的字节"""
         if offset < 0 or offset + length > SPD_SIZE:
@@ -273,12 +510,27 @@ class SPDDataModel:
 
         self._data = self._original_data.copy()
         self._modified_bytes.clear()
+        self._bump_version()
 
         self._notify_observers(DataChangeEvent(
             change_type=DataChangeType.DATA_RESET
         ))
         return True
 
+    def commit_original(self) -> None:
+        """
+        当前数据已写入设备：作为新的原始数据（清除修改标记，视为来自设备）
+
+        写入成功后调用；之后的 reset_byte / reset_to_original 回到写入的内容，而不是写入前的快照。
+        """
+        self._original_data = self._data.copy()
+        self._modified_bytes.clear()
+        self._is_from_device = True
+
+        self._notify_observers(DataChangeEvent(
+            change_type=DataChangeType.DATA_RESET
+        ))
+
     def reset_byte(self, offset: int) -> bool:
         """重置单个字节为原始值"""
         if not self._original_data or not (0 <= offset < SPD_SIZE):
@@ -311,6 +563,8 @@ class SPDDataModel:
         self._modified_bytes.clear()
         self._file_path = None
         self._is_from_device = False
+        self._unread_offsets = frozenset()
+        self._bump_version()
 
         self._notify_observers(DataChangeEvent(
             change_type=DataChangeType.DATA_RESET
@@ -318,14 +572,11 @@ class SPDDataModel:
 
     def export_to_json(self) -> Dict[str, Any]:
         """导出为 JSON 格式"""
-        from .parser import DDR4Parser
-        parser = DDR4Parser(self._data)
-
         return {
             "export_time": datetime.now().isoformat(),
             "source": "device" if self._is_from_device else self._file_path or "unknown",
             "raw_data": self._data,
-            "parsed_info": parser.to_dict(),
+            "parsed_info": self.get_parsed_info(),
             "modifications": {
                 str(k): {"original": v[0], "current": v[1]}
                 for k, v in self.get_modifications().items()
@@ -334,9 +585,7 @@ class SPDDataModel:
 
     def export_to_text(self) -> str:
         """导出为文本报告"""
-        from .parser import DDR4Parser
-        parser = DDR4Parser(self._data)
-        info = parser.to_dict()
+        info = self.get_parsed_info()
 
         lines = [
             "=" * 50,
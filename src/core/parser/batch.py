@@ -0,0 +1,276 @@
+"""
+DDR4 SPD 批量解码器
+基于 NumPy 对 (N, 512) 的 SPD 镜像数组做列式向量化解码，用于大量归档 dump 的统计分析
+
+NumPy 为可选依赖：未安装时导入本模块不会失败，调用解码函数时抛出 ImportError。
+"""
+
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 可选依赖
+    np = None
+
+from .manufacturers import get_manufacturer_name
+from .schema import SPDField, BASE_TIMING_FIELDS, XMP_PROFILE_FIELDS
+from ...utils.constants import (
+    SPD_SIZE, SPD_BYTES, DDR4_TYPE, XMP_MAGIC, MTB, FTB,
+    DENSITY_MAP, DEVICE_WIDTH, DIE_COUNTS, SPEED_GRADES,
+)
+
+
+# XMP 频率吸附候选值（与 DDR4Parser._parse_xmp_profile 一致）
+XMP_FREQUENCY_CANDIDATES = [
+    1600, 1866, 2133, 2400, 2666, 2800, 2933, 3000, 3200, 3333,
+    3400, 3466, 3600, 3733, 3800, 3866, 4000, 4133, 4266, 4400, 4500, 4600,
+    4800, 5000, 5200, 5400, 5600, 5800, 6000,
+]
+
+# XMP Profile 中以 cycles 表示的时序（CL 由 tAA 换算）
+XMP_CYCLE_FIELDS = {
+    "CL": "tAA", "tRCD": "tRCD", "tRP": "tRP", "tRAS": "tRAS", "tRC": "tRC",
+    "tRFC1": "tRFC1", "tRFC2": "tRFC2", "tRFC4": "tRFC4", "tFAW": "tFAW",
+    "tRRD_S": "tRRD_S", "tRRD_L": "tRRD_L", "tWR": "tWR",
+}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("批量解码需要 NumPy，请先安装: pip install numpy")
+
+
+def _lookup(table: Dict[int, float], size: int, default: float = 0, dtype=None):
+    """将常量映射表展开为可按编码直接索引的查找数组"""
+    lut = np.full(size, default, dtype=dtype or np.float64)
+    for code, value in table.items():
+        if 0 <= code < size:
+            lut[code] = value
+    return lut
+
+
+def as_spd_array(images) -> "np.ndarray":
+    """
+    规整输入为 (N, 512) uint8 数组
+
+    Args:
+        images: (N, 512) 数组、连续拼接的 bytes/bytearray，或由 512 字节镜像组成的序列
+
+    Returns:
+        (N, 512) uint8 数组
+    """
+    _require_numpy()
+    if isinstance(images, (bytes, bytearray, memoryview)):
+        array = np.frombuffer(images, dtype=np.uint8)
+    else:
+        array = np.asarray(images, dtype=np.uint8)
+    if array.ndim == 1:
+        if array.size % SPD_SIZE:
+            raise ValueError(f"数据长度 {array.size} 不是 {SPD_SIZE} 的整数倍")
+        array = array.reshape(-1, SPD_SIZE)
+    if array.ndim != 2 or array.shape[1] < SPD_SIZE:
+        raise ValueError(f"需要 (N, {SPD_SIZE}) 的数组，实际为 {array.shape}")
+    return array
+
+
+def load_archive(path: str) -> "np.ndarray":
+    """
+    读取由多个 512 字节 dump 连续拼接而成的归档文件
+
+    Args:
+        path: 归档文件路径
+
+    Returns:
+        (N, 512) uint8 数组
+    """
+    _require_numpy()
+    return as_spd_array(np.fromfile(path, dtype=np.uint8))
+
+
+def decode_fields(images, fields: List[SPDField], base: int = 0) -> Dict[str, "np.ndarray"]:
+    """
+    按字段表向量化解码
+
+    Args:
+        images: (N, 512) uint8 数组
+        fields: 字段表（见 schema）
+        base: 字段偏移的基址
+
+    Returns:
+        字段名 -> int32 列（"ps" 单位为皮秒，"raw" 为原始整数）
+    """
+    _require_numpy()
+    columns: Dict[str, np.ndarray] = {}
+    for field in fields:
+        value = images[:, base + field.offset].astype(np.int32)
+        if field.high_offset is not None:
+            high = images[:, base + field.high_offset].astype(np.int32)
+            mask = 0x0F if field.width == 12 else 0xFF
+            value |= ((high >> field.high_shift) & mask) << 8
+        if field.unit == "ps":
+            value *= MTB
+            if field.ftb_offset is not None:
+                value += images[:, base + field.ftb_offset].view(np.int8).astype(np.int32) * FTB
+        columns[field.name] = value
+    return columns
+
+
+def _speed_grade(tck_ps: "np.ndarray") -> "np.ndarray":
+    """tCK (ps) -> 速度等级 (MT/s)，规则同 DDR4Parser.parse_speed_grade"""
+    safe = np.where(tck_ps > 0, tck_ps, 1)
+    speed = np.where(tck_ps > 0, (2000000 / safe).astype(np.int32), 0)
+    # 逆序赋值，使先出现的区间优先（与逐个匹配 SPEED_GRADES 的顺序一致）
+    for (min_ps, max_ps), grade in reversed(list(SPEED_GRADES.items())):
+        speed = np.where((tck_ps >= min_ps) & (tck_ps < max_ps), grade, speed)
+    return speed.astype(np.int32)
+
+
+def _decode_capacity(images) -> Dict[str, "np.ndarray"]:
+    """容量相关列，规则同 DDR4Parser.parse_capacity"""
+    density_byte = images[:, SPD_BYTES.DENSITY_BANKS]
+    org_byte = images[:, SPD_BYTES.MODULE_ORG]
+    package_byte = images[:, SPD_BYTES.PACKAGE_TYPE]
+
+    density_gb = _lookup(DENSITY_MAP, 16)[density_byte & 0x0F]
+    device_width = _lookup(DEVICE_WIDTH, 8, default=8, dtype=np.int32)[org_byte & 0x07]
+    ranks = ((org_byte >> 3) & 0x07).astype(np.int32) + 1
+    bus_width = 8 * (1 << (images[:, SPD_BYTES.BUS_WIDTH] & 0x07).astype(np.int32))
+    is_3ds = ((package_byte >> 7) & 0x01).astype(bool)
+    die_count = np.where(
+        is_3ds, _lookup(DIE_COUNTS, 8, default=1, dtype=np.int32)[(package_byte >> 4) & 0x07], 1
+    ).astype(np.int32)
+
+    return {
+        "density_per_die_gb": density_gb,
+        "device_width": device_width,
+        "ranks": ranks,
+        "bus_width": bus_width,
+        "is_3ds": is_3ds,
+        "die_count": die_count,
+        "total_capacity_gb": density_gb * (bus_width / device_width) * ranks * die_count / 8,
+    }
+
+
+def _decode_xmp_profile(images, start_offset: int, try_mask: "np.ndarray") -> Dict[str, "np.ndarray"]:
+    """单个 XMP Profile 的列，规则同 DDR4Parser._parse_xmp_profile"""
+    fields = decode_fields(images, XMP_PROFILE_FIELDS, base=start_offset)
+    voltage_byte = fields["voltage"]
+    enabled = try_mask & (voltage_byte != 0xFF) & ((voltage_byte & 0x80) != 0)
+
+    tck_ps = fields["tCK"]
+    tck_valid = enabled & (tck_ps >= 200) & (tck_ps <= 2000)
+    safe_tck = np.where(tck_valid, tck_ps, 1)
+
+    # 频率吸附到最近的常见标称值（偏差 <= 3 MT/s），否则四舍五入
+    raw_freq = 2000000 / safe_tck
+    candidates = np.asarray(XMP_FREQUENCY_CANDIDATES, dtype=np.float64)
+    distance = np.abs(candidates[None, :] - raw_freq[:, None])
+    nearest_idx = distance.argmin(axis=1)
+    nearest = candidates[nearest_idx]
+    snapped = np.where(distance[np.arange(len(raw_freq)), nearest_idx] <= 3, nearest, np.rint(raw_freq))
+    frequency = np.where(tck_valid, snapped, 0).astype(np.int32)
+    frequency = np.where((frequency < 1600) | (frequency > 6000), 0, frequency)
+
+    columns: Dict[str, np.ndarray] = {
+        "enabled": enabled,
+        "voltage": np.where(enabled, 1.0 + (voltage_byte & 0x7F) * 0.01, 0.0),
+        "tCK": np.where(tck_valid, tck_ps / 1000, 0.0),
+        "frequency": frequency,
+    }
+    for name, source in XMP_CYCLE_FIELDS.items():
+        time_ps = fields[source]
+        cycles = (time_ps + safe_tck - 1) // safe_tck
+        columns[name] = np.where(tck_valid & (time_ps > 0), cycles, 0).astype(np.int32)
+    return columns
+
+
+def decode_batch(images, xmp: bool = True) -> Dict[str, "np.ndarray"]:
+    """
+    批量解码 SPD 镜像
+
+    所有列长度均为 N；非 DDR4 镜像 ("valid" 为 False) 的其它列仍按原始字节计算，
+    使用前应先按 "valid" 过滤。
+
+    Args:
+        images: (N, 512) uint8 数组，或 as_spd_array() 接受的其它输入
+        xmp: 是否解码 XMP Profile
+
+    Returns:
+        列名 -> NumPy 数组：
+        - valid, memory_type_code, module_type_code
+        - 基础时序 tCK/tAA/.../tWTR_L (ns, float64) 与 CL
+        - speed_grade (MT/s)
+        - 容量: density_per_die_gb, device_width, ranks, bus_width, is_3ds, die_count, total_capacity_gb
+        - manufacturer_id / dram_manufacturer_id (uint16, 高字节为 continuation code)
+        - xmp_supported, xmp1_* / xmp2_* (enabled, voltage, tCK, frequency, CL, tRCD, ...)
+    """
+    images = as_spd_array(images)
+    columns: Dict[str, np.ndarray] = {
+        "valid": images[:, SPD_BYTES.DRAM_TYPE] == DDR4_TYPE,
+        "memory_type_code": images[:, SPD_BYTES.DRAM_TYPE].copy(),
+        "module_type_code": images[:, SPD_BYTES.MODULE_TYPE] & 0x0F,
+    }
+
+    # 基础时序
+    timings_ps = decode_fields(images, BASE_TIMING_FIELDS)
+    for name, value in timings_ps.items():
+        columns[name] = value / 1000
+    tck_ps = timings_ps["tCK"]
+    safe_tck = np.where(tck_ps > 0, tck_ps, 1)
+    columns["CL"] = np.where(tck_ps > 0, np.rint(columns["tAA"] / (safe_tck / 1000)), 0).astype(np.int32)
+    columns["speed_grade"] = _speed_grade(tck_ps)
+
+    columns.update(_decode_capacity(images))
+
+    columns["manufacturer_id"] = (
+        images[:, SPD_BYTES.MANUFACTURER_ID_FIRST].astype(np.uint16) << 8
+    ) | images[:, SPD_BYTES.MANUFACTURER_ID_SECOND]
+    columns["dram_manufacturer_id"] = (
+        images[:, SPD_BYTES.DRAM_MANUFACTURER_ID_FIRST].astype(np.uint16) << 8
+    ) | images[:, SPD_BYTES.DRAM_MANUFACTURER_ID_SECOND]
+
+    if xmp:
+        supported = (images[:, SPD_BYTES.XMP_HEADER] == XMP_MAGIC) & (images[:, SPD_BYTES.XMP_HEADER + 1] == 0x4A)
+        profile_enabled = images[:, SPD_BYTES.XMP_PROFILE_ENABLED]
+        columns["xmp_supported"] = supported
+        for num, start in ((1, SPD_BYTES.XMP_PROFILE1_START), (2, SPD_BYTES.XMP_PROFILE2_START)):
+            try_mask = supported & ((profile_enabled == 0) | ((profile_enabled & num) != 0))
+            for name, value in _decode_xmp_profile(images, start, try_mask).items():
+                columns[f"xmp{num}_{name}"] = value
+
+    return columns
+
+
+def manufacturer_names(ids) -> "np.ndarray":
+    """
+    将 manufacturer_id 列映射为制造商名称（每个不同 ID 只查询一次）
+
+    Args:
+        ids: decode_batch() 的 manufacturer_id / dram_manufacturer_id 列
+
+    Returns:
+        名称数组 (object)
+    """
+    _require_numpy()
+    unique, inverse = np.unique(np.asarray(ids, dtype=np.uint16), return_inverse=True)
+    names = np.array([get_manufacturer_name(int(i) >> 8, int(i) & 0xFF) for i in unique], dtype=object)
+    return names[inverse.reshape(-1)]
+
+
+def to_structured(columns: Dict[str, "np.ndarray"]) -> "np.ndarray":
+    """
+    将 decode_batch() 的列字典合并为结构化数组
+
+    Args:
+        columns: 列名 -> 等长一维数组
+
+    Returns:
+        NumPy 结构化数组（每个镜像一条记录）
+    """
+    _require_numpy()
+    names = list(columns)
+    length = len(columns[names[0]]) if names else 0
+    result = np.empty(length, dtype=[(name, columns[name].dtype) for name in names])
+    for name in names:
+        result[name] = columns[name]
+    return result
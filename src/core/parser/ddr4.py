@@ -3,18 +3,23 @@ DDR4 SPD 解析器
 根据 JEDEC 标准解析 DDR4 内存 SPD 数据
 """
 
-from typing import List, Dict, Any, Optional
+import logging
+from typing import List, Dict, Any, Optional, Iterable, Set, Tuple, FrozenSet
 from dataclasses import dataclass
 
 from .manufacturers import get_manufacturer_name
 from .die_database import infer_die_type, get_die_description
+from .schema import BASE_TIMING_NS_DECODER, XMP_PROFILE_DECODER
 from ...utils.constants import (
-    SPD_SIZE, SPD_BYTES, XMP_PROFILE_OFFSETS, DDR4_TYPE, MODULE_TYPES,
+    SPD_SIZE, SPD_BYTES, DDR4_TYPE, MODULE_TYPES,
     DENSITY_MAP, DEVICE_WIDTH, ROW_BITS, COL_BITS,
     MTB, FTB, SPEED_GRADES, XMP_MAGIC,
     PACKAGE_TYPES, DIE_COUNTS, SIGNAL_LOADING, BANKS_PER_GROUP
 )
 
+# XMP 解码诊断信息，默认不输出（logging 配置为 DEBUG 级别时才格式化）
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class TimingInfo:
@@ -85,6 +90,67 @@ class XMPProfile:
     tWR: int = 0
 
 
+@dataclass
+class ModuleIdentity:
+    """模组身份信息（盘点用，仅依赖 Byte 2-3 与 320-351）"""
+    memory_type: str = ""
+    module_type: str = ""
+    manufacturer: str = ""
+    manufacturer_id: str = ""
+    dram_manufacturer: str = ""
+    part_number: str = ""
+    serial_number: str = ""
+    manufacturing_date: str = ""
+
+
+# 解析分区依赖表：分区名 -> 该分区依赖的 SPD 字节范围（闭区间）
+# to_dict() 的结果由各分区合并而成；增量解析时仅重算与变更字节相交的分区。
+# DRAM_TYPE (Byte 2) 决定整份数据是否有效，其变更总是触发完整解析。
+SECTION_RANGES: Dict[str, Tuple[Tuple[int, int], ...]] = {
+    "type": ((SPD_BYTES.DRAM_TYPE, SPD_BYTES.MODULE_TYPE),),
+    "capacity": (
+        (SPD_BYTES.DENSITY_BANKS, SPD_BYTES.PACKAGE_TYPE),
+        (SPD_BYTES.MODULE_ORG, SPD_BYTES.BUS_WIDTH),
+    ),
+    "timings": (
+        (SPD_BYTES.TIMEBASES, SPD_BYTES.TWTR_L_MIN),
+        (SPD_BYTES.TRC_MIN_FTB, SPD_BYTES.TCK_MIN_FTB),
+    ),
+    "static": (),
+    "manufacturer": ((SPD_BYTES.MANUFACTURER_ID_FIRST, SPD_BYTES.SERIAL_NUMBER_4),),
+    "part_number": ((SPD_BYTES.PART_NUMBER_START, SPD_BYTES.PART_NUMBER_END),),
+    "xmp": ((SPD_BYTES.XMP_HEADER, SPD_SIZE - 1),),
+    "organization": (
+        (SPD_BYTES.DENSITY_BANKS, SPD_BYTES.PACKAGE_TYPE),
+        (SPD_BYTES.MODULE_ORG, SPD_BYTES.MODULE_ORG),
+    ),
+    "ecc": ((SPD_BYTES.BUS_WIDTH, SPD_BYTES.BUS_WIDTH),),
+    "thermal": ((SPD_BYTES.THERMAL_SENSOR, SPD_BYTES.THERMAL_SENSOR),),
+    "dram_manufacturer": (
+        (SPD_BYTES.DRAM_MANUFACTURER_ID_FIRST, SPD_BYTES.DRAM_MANUFACTURER_ID_SECOND),
+    ),
+    # 仅 "read" 模式：由部件号、DRAM 制造商与 Die 密度推断
+    "die_inferred": (
+        (SPD_BYTES.DENSITY_BANKS, SPD_BYTES.DENSITY_BANKS),
+        (SPD_BYTES.PART_NUMBER_START, SPD_BYTES.PART_NUMBER_END),
+        (SPD_BYTES.DRAM_MANUFACTURER_ID_FIRST, SPD_BYTES.DRAM_MANUFACTURER_ID_SECOND),
+    ),
+}
+
+
+def _build_offset_sections() -> List[FrozenSet[str]]:
+    """预计算每个字节偏移所影响的分区集合"""
+    table: List[Set[str]] = [set() for _ in range(SPD_SIZE)]
+    for name, ranges in SECTION_RANGES.items():
+        for start, end in ranges:
+            for offset in range(start, end + 1):
+                table[offset].add(name)
+    return [frozenset(names) for names in table]
+
+
+_OFFSET_SECTIONS: List[FrozenSet[str]] = _build_offset_sections()
+
+
 class DDR4Parser:
     """DDR4 SPD 数据解析器"""
 
@@ -95,7 +161,13 @@ class DDR4Parser:
         Args:
             data: 512 字节的 SPD 数据
         """
-        self.data = data if len(data) >= SPD_SIZE else data + [0] * (SPD_SIZE - len(data))
+        if len(data) < SPD_SIZE:
+            # 不足 512 字节时补 0（复制）；list 保持为 list，bytes / memoryview 等转为 bytearray
+            padding = SPD_SIZE - len(data)
+            data = data + [0] * padding if isinstance(data, list) else bytearray(data) + bytes(padding)
+        self.data = data
+        self._buf: Optional[bytearray] = None
+        self._timing: Optional[TimingInfo] = None
 
     def is_valid(self) -> bool:
         """检查数据是否有效"""
@@ -208,83 +280,31 @@ class DDR4Parser:
 
         return voltages
 
+    def _buffer(self):
+        """
+        数据的缓冲区快照（供 struct 解码器使用）
+
+        data 本身为 bytes/bytearray/memoryview 时直接使用，否则首次调用时转换并缓存；
+        解析器实例的生命周期应限于一次解析。
+        """
+        if self._buf is None:
+            data = self.data
+            self._buf = data if isinstance(data, (bytes, bytearray, memoryview)) else bytearray(data)
+        return self._buf
+
     def parse_timings(self) -> TimingInfo:
-        """解析时序参数"""
-        timing = TimingInfo()
+        """解析时序参数（同一解析器实例内只解码一次）"""
+        if self._timing is not None:
+            return self._timing
 
-        # tCK (时钟周期)
-        tck_mtb = self.data[SPD_BYTES.TCK_MIN]
-        tck_ftb = self._signed_byte(self.data[SPD_BYTES.TCK_MIN_FTB])
-        timing.tCK = (tck_mtb * MTB + tck_ftb * FTB) / 1000  # 转换为 ns
-
-        # tAA (CAS Latency Time)
-        taa_mtb = self.data[SPD_BYTES.TAA_MIN]
-        taa_ftb = self._signed_byte(self.data[SPD_BYTES.TAA_MIN_FTB])
-        timing.tAA = (taa_mtb * MTB + taa_ftb * FTB) / 1000
-
-        # tRCD
-        trcd_mtb = self.data[SPD_BYTES.TRCD_MIN]
-        trcd_ftb = self._signed_byte(self.data[SPD_BYTES.TRCD_MIN_FTB])
-        timing.tRCD = (trcd_mtb * MTB + trcd_ftb * FTB) / 1000
-
-        # tRP
-        trp_mtb = self.data[SPD_BYTES.TRP_MIN]
-        trp_ftb = self._signed_byte(self.data[SPD_BYTES.TRP_MIN_FTB])
-        timing.tRP = (trp_mtb * MTB + trp_ftb * FTB) / 1000
-
-        # tRAS
-        tras_high = (self.data[SPD_BYTES.TRAS_TRC_HIGH] & 0x0F) << 8
-        tras_low = self.data[SPD_BYTES.TRAS_MIN_LOW]
-        timing.tRAS = (tras_high + tras_low) * MTB / 1000
-
-        # tRC
-        trc_high = (self.data[SPD_BYTES.TRAS_TRC_HIGH] >> 4) << 8
-        trc_low = self.data[SPD_BYTES.TRC_MIN_LOW]
-        trc_ftb = self._signed_byte(self.data[SPD_BYTES.TRC_MIN_FTB])
-        timing.tRC = ((trc_high + trc_low) * MTB + trc_ftb * FTB) / 1000
-
-        # tRFC1
-        trfc1 = (self.data[SPD_BYTES.TRFC1_HIGH] << 8) + self.data[SPD_BYTES.TRFC1_LOW]
-        timing.tRFC1 = trfc1 * MTB / 1000
-
-        # tRFC2 (bytes 32-33)
-        trfc2 = (self.data[SPD_BYTES.TRFC2_HIGH] << 8) + self.data[SPD_BYTES.TRFC2_LOW]
-        timing.tRFC2 = trfc2 * MTB / 1000
-
-        # tRFC4 (bytes 34-35)
-        trfc4 = (self.data[SPD_BYTES.TRFC4_HIGH] << 8) + self.data[SPD_BYTES.TRFC4_LOW]
-        timing.tRFC4 = trfc4 * MTB / 1000
-
-        # tFAW
-        tfaw_high = (self.data[SPD_BYTES.TFAW_HIGH] & 0x0F) << 8
-        tfaw_low = self.data[SPD_BYTES.TFAW_LOW]
-        timing.tFAW = (tfaw_high + tfaw_low) * MTB / 1000
-
-        # tRRD_S
-        timing.tRRD_S = self.data[SPD_BYTES.TRRD_S_MIN] * MTB / 1000
-
-        # tRRD_L
-        timing.tRRD_L = self.data[SPD_BYTES.TRRD_L_MIN] * MTB / 1000
-
-        # tCCD_L
-        timing.tCCD_L = self.data[SPD_BYTES.TCCD_L_MIN] * MTB / 1000
-
-        # tWR (bytes 41-42, uses high nibble + low byte)
-        twr_high = (self.data[SPD_BYTES.TWR_MIN_HIGH] & 0x0F) << 8
-        twr_low = self.data[SPD_BYTES.TWR_MIN_LOW]
-        timing.tWR = (twr_high + twr_low) * MTB / 1000
-
-        # tWTR_S / tWTR_L (bytes 43-45, 12-bit using shared high-nibble byte)
-        twtr_high = self.data[SPD_BYTES.TWTR_MIN_HIGH]
-        twtr_s = ((twtr_high & 0x0F) << 8) | self.data[SPD_BYTES.TWTR_S_MIN]
-        twtr_l = ((twtr_high >> 4) << 8) | self.data[SPD_BYTES.TWTR_L_MIN]
-        timing.tWTR_S = twtr_s * MTB / 1000
-        timing.tWTR_L = twtr_l * MTB / 1000
+        # 字段布局见 schema.BASE_TIMING_FIELDS（顺序与 TimingInfo 字段一致），单次 unpack 得到全部时序 (ns)
+        timing = TimingInfo(*BASE_TIMING_NS_DECODER.decode_tuple(self._buffer()))
 
         # 计算 CL (cycles)
         if timing.tCK > 0:
             timing.CL = round(timing.tAA / timing.tCK)
 
+        self._timing = timing
         return timing
 
     def _signed_byte(self, value: int) -> int:
@@ -362,6 +382,20 @@ class DDR4Parser:
 
         return f"{year_str} Week {week_str}"
 
+    def parse_identity(self) -> ModuleIdentity:
+        """解析模组身份信息（类型、制造商、部件号、序列号、生产日期）"""
+        manufacturer = self.parse_manufacturer()
+        return ModuleIdentity(
+            memory_type=self.parse_memory_type(),
+            module_type=self.parse_module_type(),
+            manufacturer=manufacturer["name"],
+            manufacturer_id=manufacturer["id_bytes"],
+            dram_manufacturer=self.parse_dram_manufacturer()["name"],
+            part_number=self.parse_part_number(),
+            serial_number=self.parse_serial_number(),
+            manufacturing_date=self.parse_manufacturing_date(),
+        )
+
     def parse_die_info(self) -> DieInfo:
         """解析 Die 和封装信息"""
         density_byte = self.data[SPD_BYTES.DENSITY_BANKS]
@@ -613,17 +647,24 @@ class DDR4Parser:
         """
         profile = XMPProfile()
 
-        if start_offset + 15 > len(self.data):
+        if start_offset + XMP_PROFILE_DECODER.window_size > len(self.data):
             return profile
 
-        # 调试：打印 XMP Profile 原始数据
-        raw_bytes = self.data[start_offset:start_offset + 20]
-        print(f"[DEBUG XMP] Profile {profile_num} raw bytes at 0x{start_offset:03X}: {' '.join(f'{b:02X}' for b in raw_bytes)}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            raw_bytes = self.data[start_offset:start_offset + 20]
+            logger.debug(
+                "XMP Profile %d raw bytes at 0x%03X: %s",
+                profile_num, start_offset, " ".join(f"{b:02X}" for b in raw_bytes)
+            )
+
+        # 字段布局见 schema.XMP_PROFILE_FIELDS，单次 unpack 得到全部字段 (时序单位 ps)
+        fields = XMP_PROFILE_DECODER.decode(self._buffer(), start_offset)
 
         # 电压字节
-        voltage_byte = self.data[start_offset]
+        voltage_byte = fields["voltage"]
         if voltage_byte == 0 or voltage_byte == 0xFF or (voltage_byte & 0x80) == 0:
-            print(f"[DEBUG XMP] Profile {profile_num} disabled (voltage_byte=0x{voltage_byte:02X})")
+            logger.debug("XMP Profile %d disabled (voltage_byte=0x%02X)", profile_num, voltage_byte)
             return profile
 
         profile.enabled = True
@@ -631,18 +672,7 @@ class DDR4Parser:
         # 电压解析: bit7=Profile enabled, bits6:0 为 10mV 步进
         # 例如: 0xA3 & 0x7F = 0x23 = 35 => 1.00V + 0.35V = 1.35V
         profile.voltage = 1.0 + (voltage_byte & 0x7F) * 0.01
-        print(f"[DEBUG XMP] Profile {profile_num} voltage: {profile.voltage:.3f}V (byte=0x{voltage_byte:02X})")
-
-        def _ceil_div(numerator: int, denominator: int) -> int:
-            if denominator <= 0:
-                return 0
-            return (numerator + denominator - 1) // denominator
-
-        # tCK 解析
-        # XMP Profile 的 tCK 使用 MTB+FTB 编码：tCK(ps)=tCK_MTB*125 + tCK_FTB*1 (FTB 为 signed int8)
-        tck_mtb = self.data[start_offset + XMP_PROFILE_OFFSETS.TCK_MTB] if start_offset + XMP_PROFILE_OFFSETS.TCK_MTB < len(self.data) else 0
-        tck_ftb_raw = self.data[start_offset + XMP_PROFILE_OFFSETS.TCK_FTB] if start_offset + XMP_PROFILE_OFFSETS.TCK_FTB < len(self.data) else 0
-        tck_ftb = self._signed_byte(tck_ftb_raw)
+        logger.debug("XMP Profile %d voltage: %.3fV (byte=0x%02X)", profile_num, profile.voltage, voltage_byte)
 
         def _snap_xmp_frequency(raw_mt_s: float) -> int:
             """将非整数/非标准频点吸附到常见 XMP 标称值，避免出现 3597/3604 这类读数。"""
@@ -660,123 +690,59 @@ class DDR4Parser:
                 return int(nearest)
             return int(round(raw_mt_s))
 
-        tck_ps = tck_mtb * MTB + tck_ftb * FTB
+        # tCK 解析
+        # XMP Profile 的 tCK 使用 MTB+FTB 编码：tCK(ps)=tCK_MTB*125 + tCK_FTB*1 (FTB 为 signed int8)
+        tck_ps = fields["tCK"]
         if 200 <= tck_ps <= 2000:
             profile.tCK = tck_ps / 1000  # 转换为 ns
             raw_freq = 2000000 / tck_ps
             profile.frequency = _snap_xmp_frequency(raw_freq)
-            print(
-                f"[DEBUG XMP] Profile {profile_num} tCK: MTB={tck_mtb}, FTB={tck_ftb} (raw=0x{tck_ftb_raw:02X}), "
-                f"tCK={profile.tCK:.3f}ns, freq≈{raw_freq:.1f} MT/s -> {profile.frequency} MT/s"
+            logger.debug(
+                "XMP Profile %d tCK=%.3fns, freq≈%.1f MT/s -> %d MT/s",
+                profile_num, profile.tCK, raw_freq, profile.frequency
             )
 
         if profile.frequency < 1600 or profile.frequency > 6000:
-            print(f"[DEBUG XMP] Profile {profile_num} WARNING: Invalid frequency {profile.frequency}")
+            logger.debug("XMP Profile %d WARNING: Invalid frequency %d", profile_num, profile.frequency)
             profile.frequency = 0
 
-        # 时序参数
-        # tAA (CAS Latency Time) 在 offset +8
-        taa_mtb = self.data[start_offset + XMP_PROFILE_OFFSETS.TAA_MTB] if start_offset + XMP_PROFILE_OFFSETS.TAA_MTB < len(self.data) else 0
-        taa_ftb_raw = self.data[start_offset + XMP_PROFILE_OFFSETS.TAA_FTB] if start_offset + XMP_PROFILE_OFFSETS.TAA_FTB < len(self.data) else 0
-        taa_ftb = self._signed_byte(taa_ftb_raw)
-        print(f"[DEBUG XMP] Profile {profile_num} tAA raw: MTB=0x{taa_mtb:02X} ({taa_mtb}), FTB=0x{taa_ftb_raw:02X} ({taa_ftb})")
-
-        # CL: 取满足 tAAmin 的最小整数 cycles (ceil)
-        if profile.tCK > 0 and taa_mtb > 0 and tck_ps > 0:
-            taa_ps = taa_mtb * MTB + taa_ftb * FTB
-            profile.CL = _ceil_div(taa_ps, tck_ps)
-            taa_ns = taa_ps / 1000
-            print(f"[DEBUG XMP] Profile {profile_num} CL: tAA={taa_ns:.3f}ns / tCK={profile.tCK:.3f}ns => CL{profile.CL}")
-
-        # tRCD 在 offset +9
-        trcd_mtb = self.data[start_offset + XMP_PROFILE_OFFSETS.TRCD_MTB] if start_offset + XMP_PROFILE_OFFSETS.TRCD_MTB < len(self.data) else 0
-        trcd_ftb_raw = self.data[start_offset + XMP_PROFILE_OFFSETS.TRCD_FTB] if start_offset + XMP_PROFILE_OFFSETS.TRCD_FTB < len(self.data) else 0
-        trcd_ftb = self._signed_byte(trcd_ftb_raw)
-        if profile.tCK > 0 and trcd_mtb > 0 and tck_ps > 0:
-            trcd_ps = trcd_mtb * MTB + trcd_ftb * FTB
-            profile.tRCD = _ceil_div(trcd_ps, tck_ps)
-            trcd_ns = trcd_ps / 1000
-            print(f"[DEBUG XMP] Profile {profile_num} tRCD: {trcd_ns:.3f}ns => {profile.tRCD} cycles")
-
-        # tRP 在 offset +10
-        trp_mtb = self.data[start_offset + XMP_PROFILE_OFFSETS.TRP_MTB] if start_offset + XMP_PROFILE_OFFSETS.TRP_MTB < len(self.data) else 0
-        trp_ftb_raw = self.data[start_offset + XMP_PROFILE_OFFSETS.TRP_FTB] if start_offset + XMP_PROFILE_OFFSETS.TRP_FTB < len(self.data) else 0
-        trp_ftb = self._signed_byte(trp_ftb_raw)
-        if profile.tCK > 0 and trp_mtb > 0 and tck_ps > 0:
-            trp_ps = trp_mtb * MTB + trp_ftb * FTB
-            profile.tRP = _ceil_div(trp_ps, tck_ps)
-            trp_ns = trp_ps / 1000
-            print(f"[DEBUG XMP] Profile {profile_num} tRP: {trp_ns:.3f}ns => {profile.tRP} cycles")
-
-        # tRAS 在 offset +11-12 (upper nibble + lower byte)
-        tras_upper = (self.data[start_offset + XMP_PROFILE_OFFSETS.TRAS_TRC_HIGH] & 0x0F) if start_offset + XMP_PROFILE_OFFSETS.TRAS_TRC_HIGH < len(self.data) else 0
-        tras_lower = self.data[start_offset + XMP_PROFILE_OFFSETS.TRAS_MTB_LOW] if start_offset + XMP_PROFILE_OFFSETS.TRAS_MTB_LOW < len(self.data) else 0
-        tras_mtb = (tras_upper << 8) | tras_lower
-        if profile.tCK > 0 and tras_mtb > 0 and tck_ps > 0:
-            tras_ps = tras_mtb * MTB
-            profile.tRAS = _ceil_div(tras_ps, tck_ps)
-            tras_ns = tras_ps / 1000
-            print(f"[DEBUG XMP] Profile {profile_num} tRAS: raw=0x{tras_upper:X}{tras_lower:02X} ({tras_mtb}), {tras_ns:.3f}ns => {profile.tRAS} cycles")
-
-        # tRC (offset +11 high nibble +13 low byte +34 FTB)
-        trc_upper = (self.data[start_offset + XMP_PROFILE_OFFSETS.TRAS_TRC_HIGH] >> 4) & 0x0F if start_offset + XMP_PROFILE_OFFSETS.TRAS_TRC_HIGH < len(self.data) else 0
-        trc_low = self.data[start_offset + XMP_PROFILE_OFFSETS.TRC_MTB_LOW] if start_offset + XMP_PROFILE_OFFSETS.TRC_MTB_LOW < len(self.data) else 0
-        trc_mtb = (trc_upper << 8) | trc_low
-        trc_ftb_raw = self.data[start_offset + XMP_PROFILE_OFFSETS.TRC_FTB] if start_offset + XMP_PROFILE_OFFSETS.TRC_FTB < len(self.data) else 0
-        trc_ftb = self._signed_byte(trc_ftb_raw)
-        if profile.tCK > 0 and trc_mtb > 0 and tck_ps > 0:
-            trc_ps = trc_mtb * MTB + trc_ftb * FTB
-            profile.tRC = _ceil_div(trc_ps, tck_ps)
-            trc_ns = trc_ps / 1000
-            print(f"[DEBUG XMP] Profile {profile_num} tRC: raw=0x{trc_upper:X}{trc_low:02X} ({trc_mtb}), FTB=0x{trc_ftb_raw:02X} ({trc_ftb}), {trc_ns:.3f}ns => {profile.tRC} cycles")
-
-        # tRFC1/2/4 (16-bit MTB, little-endian)
-        def _read_u16_le(rel_off_low: int, rel_off_high: int) -> int:
-            low = self.data[start_offset + rel_off_low] if start_offset + rel_off_low < len(self.data) else 0
-            high = self.data[start_offset + rel_off_high] if start_offset + rel_off_high < len(self.data) else 0
-            return (high << 8) | low
-
-        trfc1_mtb = _read_u16_le(XMP_PROFILE_OFFSETS.TRFC1_LOW, XMP_PROFILE_OFFSETS.TRFC1_HIGH)
-        if profile.tCK > 0 and trfc1_mtb > 0 and tck_ps > 0:
-            trfc1_ps = trfc1_mtb * MTB
-            profile.tRFC1 = _ceil_div(trfc1_ps, tck_ps)
-
-        trfc2_mtb = _read_u16_le(XMP_PROFILE_OFFSETS.TRFC2_LOW, XMP_PROFILE_OFFSETS.TRFC2_HIGH)
-        if profile.tCK > 0 and trfc2_mtb > 0 and tck_ps > 0:
-            trfc2_ps = trfc2_mtb * MTB
-            profile.tRFC2 = _ceil_div(trfc2_ps, tck_ps)
-
-        trfc4_mtb = _read_u16_le(XMP_PROFILE_OFFSETS.TRFC4_LOW, XMP_PROFILE_OFFSETS.TRFC4_HIGH)
-        if profile.tCK > 0 and trfc4_mtb > 0 and tck_ps > 0:
-            trfc4_ps = trfc4_mtb * MTB
-            profile.tRFC4 = _ceil_div(trfc4_ps, tck_ps)
-
-        # tFAW (12-bit MTB: low nibble + low byte)
-        tfaw_high = (self.data[start_offset + XMP_PROFILE_OFFSETS.TFAW_HIGH] & 0x0F) if start_offset + XMP_PROFILE_OFFSETS.TFAW_HIGH < len(self.data) else 0
-        tfaw_low = self.data[start_offset + XMP_PROFILE_OFFSETS.TFAW_LOW] if start_offset + XMP_PROFILE_OFFSETS.TFAW_LOW < len(self.data) else 0
-        tfaw_mtb = (tfaw_high << 8) | tfaw_low
-        if profile.tCK > 0 and tfaw_mtb > 0 and tck_ps > 0:
-            tfaw_ps = tfaw_mtb * MTB
-            profile.tFAW = _ceil_div(tfaw_ps, tck_ps)
-
-        # tRRD_S / tRRD_L (1-byte MTB)
-        trrd_s_mtb = self.data[start_offset + XMP_PROFILE_OFFSETS.TRRD_S_MIN] if start_offset + XMP_PROFILE_OFFSETS.TRRD_S_MIN < len(self.data) else 0
-        if profile.tCK > 0 and trrd_s_mtb > 0 and tck_ps > 0:
-            profile.tRRD_S = _ceil_div(trrd_s_mtb * MTB, tck_ps)
-
-        trrd_l_mtb = self.data[start_offset + XMP_PROFILE_OFFSETS.TRRD_L_MIN] if start_offset + XMP_PROFILE_OFFSETS.TRRD_L_MIN < len(self.data) else 0
-        if profile.tCK > 0 and trrd_l_mtb > 0 and tck_ps > 0:
-            profile.tRRD_L = _ceil_div(trrd_l_mtb * MTB, tck_ps)
-
-        # tWR (12-bit MTB)
-        twr_high = (self.data[start_offset + XMP_PROFILE_OFFSETS.TWR_HIGH] & 0x0F) if start_offset + XMP_PROFILE_OFFSETS.TWR_HIGH < len(self.data) else 0
-        twr_low = self.data[start_offset + XMP_PROFILE_OFFSETS.TWR_LOW] if start_offset + XMP_PROFILE_OFFSETS.TWR_LOW < len(self.data) else 0
-        twr_mtb = (twr_high << 8) | twr_low
-        if profile.tCK > 0 and twr_mtb > 0 and tck_ps > 0:
-            profile.tWR = _ceil_div(twr_mtb * MTB, tck_ps)
-
-        extra = f"-{profile.tRC}" if profile.tRC else ""
-        print(f"[DEBUG XMP] Profile {profile_num} FINAL: CL{profile.CL}-{profile.tRCD}-{profile.tRP}-{profile.tRAS}{extra} @ {profile.frequency} MT/s, {profile.voltage:.3f}V")
+        # 时序参数: cycles 取满足最小时间的最小整数 (ceil(time / tCK))；
+        # MTB 部分为 0 的字段视为未定义，FTB 单独不生效
+        def _cycles(name: str) -> int:
+            time_ps = fields[name]
+            ftb_offset = XMP_PROFILE_DECODER.by_name[name].ftb_offset
+            mtb_ps = time_ps
+            if ftb_offset is not None:
+                mtb_ps -= self._signed_byte(self.data[start_offset + ftb_offset]) * FTB
+            if profile.tCK <= 0 or mtb_ps <= 0:
+                return 0
+            return (time_ps + tck_ps - 1) // tck_ps
+
+        profile.CL = _cycles("tAA")
+        profile.tRCD = _cycles("tRCD")
+        profile.tRP = _cycles("tRP")
+        profile.tRAS = _cycles("tRAS")
+        profile.tRC = _cycles("tRC")
+        profile.tRFC1 = _cycles("tRFC1")
+        profile.tRFC2 = _cycles("tRFC2")
+        profile.tRFC4 = _cycles("tRFC4")
+        profile.tFAW = _cycles("tFAW")
+        profile.tRRD_S = _cycles("tRRD_S")
+        profile.tRRD_L = _cycles("tRRD_L")
+        profile.tWR = _cycles("tWR")
+
+        if debug:
+            logger.debug(
+                "XMP Profile %d tAA=%.3fns, tRCD=%.3fns, tRP=%.3fns, tRAS=%.3fns, tRC=%.3fns",
+                profile_num, fields["tAA"] / 1000, fields["tRCD"] / 1000, fields["tRP"] / 1000,
+                fields["tRAS"] / 1000, fields["tRC"] / 1000
+            )
+            extra = f"-{profile.tRC}" if profile.tRC else ""
+            logger.debug(
+                "XMP Profile %d FINAL: CL%d-%d-%d-%d%s @ %d MT/s, %.3fV",
+                profile_num, profile.CL, profile.tRCD, profile.tRP, profile.tRAS, extra,
+                profile.frequency, profile.voltage
+            )
 
         return profile
 
@@ -795,6 +761,141 @@ class DDR4Parser:
 
         return f"CL{cl}-{trcd}-{trp}-{tras}"
 
+    @staticmethod
+    def sections_for_offsets(offsets: Iterable[int]) -> Set[str]:
+        """
+        获取受指定字节偏移影响的解析分区
+
+        Args:
+            offsets: 变更的字节偏移
+
+        Returns:
+            分区名集合（见 SECTION_RANGES）
+        """
+        sections: Set[str] = set()
+        for offset in offsets:
+            if 0 <= offset < SPD_SIZE:
+                sections |= _OFFSET_SECTIONS[offset]
+        return sections
+
+    def parse_section(self, name: str, mode: str = "spd") -> Dict[str, Any]:
+        """
+        解析单个分区
+
+        Args:
+            name: 分区名（见 SECTION_RANGES）
+            mode: 显示模式
+
+        Returns:
+            该分区对应的 to_dict() 字段
+        """
+        if name == "type":
+            return {
+                "memory_type": self.parse_memory_type(),
+                "module_type": self.parse_module_type(),
+            }
+
+        if name == "capacity":
+            capacity = self.parse_capacity()
+            return {
+                "capacity": capacity["capacity_str"],
+                "organization": capacity["organization"],
+                "capacity_details": capacity,
+            }
+
+        if name == "timings":
+            timing = self.parse_timings()
+            return {
+                "speed_grade": self.parse_speed_grade(),
+                "timing_string": self.get_timing_string(),
+                "timings": {
+                    "tCK": f"{timing.tCK:.3f} ns",
+                    "tAA": f"{timing.tAA:.3f} ns",
+                    "tRCD": f"{timing.tRCD:.3f} ns",
+                    "tRP": f"{timing.tRP:.3f} ns",
+                    "tRAS": f"{timing.tRAS:.3f} ns",
+                    "tRC": f"{timing.tRC:.3f} ns",
+                    "tRFC1": f"{timing.tRFC1:.1f} ns",
+                    "tRFC2": f"{timing.tRFC2:.1f} ns",
+                    "tRFC4": f"{timing.tRFC4:.1f} ns",
+                    "tWR": f"{timing.tWR:.3f} ns",
+                    "tWTR_S": f"{timing.tWTR_S:.3f} ns",
+                    "tWTR_L": f"{timing.tWTR_L:.3f} ns",
+                    "CL": timing.CL,
+                },
+                "supported_cl": self.parse_cas_latencies(),
+            }
+
+        if name == "static":
+            return {
+                "voltage": 1.2,
+                "display_mode": mode,
+            }
+
+        if name == "manufacturer":
+            return {
+                "manufacturer": self.parse_manufacturer()["name"],
+                "serial_number": self.parse_serial_number(),
+                "manufacturing_date": self.parse_manufacturing_date(),
+            }
+
+        if name == "part_number":
+            return {"part_number": self.parse_part_number()}
+
+        if name == "xmp":
+            return {"xmp": self.parse_xmp()}
+
+        if name == "organization":
+            die_info = self.parse_die_info()
+            bank_config = self.parse_bank_config()
+            addressing = self.parse_addressing_info()
+            return {
+                "die_info": {
+                    "density_gb": die_info.density_gb,
+                    "die_count": die_info.die_count,
+                    "package_type": die_info.package_type,
+                    "signal_loading": die_info.signal_loading,
+                    "organization": die_info.organization,
+                },
+                "bank_config": {
+                    "bank_groups": bank_config.bank_groups,
+                    "banks_per_group": bank_config.banks_per_group,
+                    "total_banks": bank_config.total_banks,
+                },
+                "addressing": {
+                    "row_bits": addressing.row_bits,
+                    "col_bits": addressing.col_bits,
+                    "page_size_bytes": addressing.page_size_bytes,
+                    "page_size_str": f"{addressing.page_size_bytes // 1024} KB" if addressing.page_size_bytes >= 1024 else f"{addressing.page_size_bytes} bytes",
+                },
+            }
+
+        if name == "ecc":
+            return {"ecc_info": self.parse_ecc_info()}
+
+        if name == "thermal":
+            return {"thermal_sensor": self.parse_thermal_sensor()}
+
+        if name == "dram_manufacturer":
+            return {"dram_manufacturer": self.parse_dram_manufacturer()}
+
+        if name == "die_inferred":
+            # Add inferred information in "read" mode
+            if mode != "read":
+                return {}
+            inferred = infer_die_type(self.parse_part_number(), self.parse_dram_manufacturer()["name"])
+            density_gb = DENSITY_MAP.get(self.data[SPD_BYTES.DENSITY_BANKS] & 0x0F, 0)
+            return {
+                "die_info_inferred": {
+                    "die_type": inferred.get("die_type", "Unknown") if inferred else "Unknown",
+                    "process_node": inferred.get("process", "Unknown") if inferred else "Unknown",
+                    "die_description": get_die_description(inferred, density_gb),
+                    "inferred": inferred is not None,
+                }
+            }
+
+        raise KeyError(f"Unknown parser section: {name}")
+
     def to_dict(self, mode: str = "spd") -> Dict[str, Any]:
         """
         转换为字典格式
@@ -805,83 +906,35 @@ class DDR4Parser:
         if not self.is_valid():
             return {"error": "Invalid DDR4 data"}
 
-        capacity = self.parse_capacity()
-        timing = self.parse_timings()
-        manufacturer = self.parse_manufacturer()
-        xmp = self.parse_xmp()
-        die_info = self.parse_die_info()
-        bank_config = self.parse_bank_config()
-        addressing = self.parse_addressing_info()
-        ecc_info = self.parse_ecc_info()
-        thermal = self.parse_thermal_sensor()
-        dram_manufacturer = self.parse_dram_manufacturer()
+        result: Dict[str, Any] = {}
+        for name in SECTION_RANGES:
+            result.update(self.parse_section(name, mode))
+        return result
 
-        result = {
-            "memory_type": self.parse_memory_type(),
-            "module_type": self.parse_module_type(),
-            "capacity": capacity["capacity_str"],
-            "organization": capacity["organization"],
-            "speed_grade": self.parse_speed_grade(),
-            "voltage": 1.2,
-            "manufacturer": manufacturer["name"],
-            "part_number": self.parse_part_number(),
-            "serial_number": self.parse_serial_number(),
-            "manufacturing_date": self.parse_manufacturing_date(),
-            "timing_string": self.get_timing_string(),
-            "timings": {
-                "tCK": f"{timing.tCK:.3f} ns",
-                "tAA": f"{timing.tAA:.3f} ns",
-                "tRCD": f"{timing.tRCD:.3f} ns",
-                "tRP": f"{timing.tRP:.3f} ns",
-                "tRAS": f"{timing.tRAS:.3f} ns",
-                "tRC": f"{timing.tRC:.3f} ns",
-                "tRFC1": f"{timing.tRFC1:.1f} ns",
-                "tRFC2": f"{timing.tRFC2:.1f} ns",
-                "tRFC4": f"{timing.tRFC4:.1f} ns",
-                "tWR": f"{timing.tWR:.3f} ns",
-                "tWTR_S": f"{timing.tWTR_S:.3f} ns",
-                "tWTR_L": f"{timing.tWTR_L:.3f} ns",
-                "CL": timing.CL,
-            },
-            "supported_cl": self.parse_cas_latencies(),
-            "xmp": xmp,
-            "capacity_details": capacity,
-            "die_info": {
-                "density_gb": die_info.density_gb,
-                "die_count": die_info.die_count,
-                "package_type": die_info.package_type,
-                "signal_loading": die_info.signal_loading,
-                "organization": die_info.organization,
-            },
-            "bank_config": {
-                "bank_groups": bank_config.bank_groups,
-                "banks_per_group": bank_config.banks_per_group,
-                "total_banks": bank_config.total_banks,
-            },
-            "addressing": {
-                "row_bits": addressing.row_bits,
-                "col_bits": addressing.col_bits,
-                "page_size_bytes": addressing.page_size_bytes,
-                "page_size_str": f"{addressing.page_size_bytes // 1024} KB" if addressing.page_size_bytes >= 1024 else f"{addressing.page_size_bytes} bytes",
-            },
-            "ecc_info": ecc_info,
-            "thermal_sensor": thermal,
-            "dram_manufacturer": dram_manufacturer,
-            "display_mode": mode,
-        }
+    def update_dict(
+        self,
+        previous: Dict[str, Any],
+        offsets: Iterable[int],
+        mode: str = "spd"
+    ) -> Dict[str, Any]:
+        """
+        增量解析：仅重算受变更字节影响的分区
 
-        # Add inferred information in "read" mode
-        if mode == "read":
-            part_number = self.parse_part_number()
-            inferred = infer_die_type(part_number, dram_manufacturer["name"])
+        Args:
+            previous: 变更前 to_dict(mode) 的结果（不会被修改）
+            offsets: 自 previous 生成以来变更过的字节偏移
+            mode: 显示模式，需与 previous 一致
 
-            result["die_info_inferred"] = {
-                "die_type": inferred.get("die_type", "Unknown") if inferred else "Unknown",
-                "process_node": inferred.get("process", "Unknown") if inferred else "Unknown",
-                "die_description": get_die_description(inferred, die_info.density_gb),
-                "inferred": inferred is not None,
-            }
+        Returns:
+            与 to_dict(mode) 等价的新字典
+        """
+        offsets = set(offsets)
+        if "error" in previous or not self.is_valid() or SPD_BYTES.DRAM_TYPE in offsets:
+            return self.to_dict(mode)
 
+        result = dict(previous)
+        for name in self.sections_for_offsets(offsets):
+            result.update(self.parse_section(name, mode))
         return result
 
     def parse(self) -> str:
@@ -0,0 +1,208 @@
+"""
+SPD 字段描述表
+以声明式表格描述时序字段的字节布局（偏移、位宽、高位 nibble、MTB/FTB 组合、单位），
+并在导入时编译为基于 struct.unpack_from 的单次解码器
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from ...utils.constants import SPD_BYTES, XMP_PROFILE_OFFSETS, MTB, FTB
+
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+@dataclass(frozen=True)
+class SPDField:
+    """
+    SPD 字段描述
+
+    偏移均相对于解码时传入的基址（基础时序为 0，XMP 为 Profile 起始偏移）。
+
+    Attributes:
+        name: 字段名
+        offset: 低 8 位（MTB）所在字节
+        width: 位宽 (8 / 12 / 16)
+        high_offset: 高位所在字节；12 位字段为共享的 nibble 字节，16 位字段为高字节
+        high_shift: 高位 nibble 在 high_offset 字节中的位置 (0 = bits 3:0, 4 = bits 7:4)
+        ftb_offset: FTB 微调字节 (signed int8, 1ps)，没有则为 None
+        unit: "ps" = MTB*125ps + FTB*1ps；"raw" = 原始整数
+    """
+    name: str
+    offset: int
+    width: int = 8
+    high_offset: Optional[int] = None
+    high_shift: int = 0
+    ftb_offset: Optional[int] = None
+    unit: str = "ps"
+
+    def __post_init__(self):
+        if self.width not in (8, 12, 16):
+            raise ValueError(f"{self.name}: unsupported width {self.width}")
+        if self.width > 8 and self.high_offset is None:
+            raise ValueError(f"{self.name}: {self.width}-bit field needs high_offset")
+        if self.unit not in ("ps", "raw"):
+            raise ValueError(f"{self.name}: unsupported unit {self.unit}")
+
+    @property
+    def max_mtb(self) -> int:
+        """MTB 部分可表示的最大值"""
+        return (1 << self.width) - 1
+
+    @property
+    def high_mask(self) -> int:
+        """高位在 high_offset 字节中占用的位掩码"""
+        if self.width == 12:
+            return 0x0F << self.high_shift
+        if self.width == 16:
+            return 0xFF
+        return 0
+
+    def offsets(self) -> Tuple[int, ...]:
+        """该字段占用的全部字节偏移"""
+        result = [self.offset]
+        if self.high_offset is not None:
+            result.append(self.high_offset)
+        if self.ftb_offset is not None:
+            result.append(self.ftb_offset)
+        return tuple(result)
+
+
+class CompiledSchema:
+    """
+    编译后的字段解码器
+
+    将字段表覆盖的字节窗口编译为一个 struct 格式（FTB 字节为有符号 'b'，其余为 'B'），
+    并为字段表生成一个专用解码函数：只调用一次 unpack_from，各字段由内联表达式组合，
+    不再逐字段做边界检查。
+    """
+
+    def __init__(self, fields: List[SPDField], ps_divisor: Optional[int] = None):
+        """
+        Args:
+            fields: 字段表
+            ps_divisor: 可选的 "ps" 字段除数（如 1000 直接输出 ns 浮点数）
+        """
+        self.ps_divisor = ps_divisor
+        self.fields: Tuple[SPDField, ...] = tuple(fields)
+        self.names: Tuple[str, ...] = tuple(f.name for f in self.fields)
+        self.by_name: Dict[str, SPDField] = {f.name: f for f in self.fields}
+
+        used = [off for f in self.fields for off in f.offsets()]
+        self.window_start = min(used)
+        self.window_size = max(used) - self.window_start + 1
+
+        # 未被任何字段引用的字节编译为填充 'x'，unpack 只产出实际用到的字节
+        signed = {f.ftb_offset for f in self.fields if f.ftb_offset is not None}
+        used_set = set(used)
+        fmt = []
+        self._index: Dict[int, int] = {}
+        for offset in range(self.window_start, self.window_start + self.window_size):
+            if offset not in used_set:
+                fmt.append("x")
+                continue
+            self._index[offset] = len(self._index)
+            fmt.append("b" if offset in signed else "B")
+        self._struct = struct.Struct("<" + "".join(fmt))
+        self.decode_tuple: Callable[..., Tuple[int, ...]] = self._compile()
+
+    def _field_expr(self, f: SPDField) -> str:
+        """生成单个字段的取值表达式（v 为 unpack 结果）"""
+        index = self._index
+        expr = f"v[{index[f.offset]}]"
+        if f.high_offset is not None:
+            mask = 0x0F if f.width == 12 else 0xFF
+            high = f"v[{index[f.high_offset]}]"
+            if f.high_shift:
+                high = f"({high} >> {f.high_shift})"
+            expr = f"({expr} | ({high} & {mask}) << 8)"
+        if f.unit == "ps":
+            expr = f"{expr} * {MTB}"
+            if f.ftb_offset is not None:
+                expr = f"{expr} + v[{index[f.ftb_offset]}] * {FTB}"
+            if self.ps_divisor:
+                expr = f"({expr}) / {self.ps_divisor}"
+        return expr
+
+    def _compile(self) -> Callable[..., Tuple[int, ...]]:
+        """生成并编译解码函数 decode(buf, base=0) -> tuple"""
+        exprs = ",\n        ".join(self._field_expr(f) for f in self.fields)
+        source = (
+            "def decode(buf, base=0):\n"
+            f"    v = unpack_from(buf, base + {self.window_start})\n"
+            "    return (\n"
+            f"        {exprs},\n"
+            "    )\n"
+        )
+        namespace = {"unpack_from": self._struct.unpack_from}
+        exec(compile(source, f"<spd-schema {self.names[0]}..{self.names[-1]}>", "exec"), namespace)
+        return namespace["decode"]
+
+    def decode(self, buf: Buffer, base: int = 0) -> Dict[str, int]:
+        """
+        解码全部字段
+
+        Args:
+            buf: SPD 数据缓冲区 (bytes / bytearray / memoryview)
+            base: 字段偏移的基址
+
+        Returns:
+            字段名 -> 值（"ps" 单位为皮秒整数或按 ps_divisor 换算后的值，"raw" 为原始整数）
+        """
+        return dict(zip(self.names, self.decode_tuple(buf, base)))
+
+
+# ==================== 字段表 ====================
+
+# DDR4 基础时序 (Byte 17-125)，偏移为绝对偏移
+BASE_TIMING_FIELDS: List[SPDField] = [
+    SPDField("tCK", SPD_BYTES.TCK_MIN, ftb_offset=SPD_BYTES.TCK_MIN_FTB),
+    SPDField("tAA", SPD_BYTES.TAA_MIN, ftb_offset=SPD_BYTES.TAA_MIN_FTB),
+    SPDField("tRCD", SPD_BYTES.TRCD_MIN, ftb_offset=SPD_BYTES.TRCD_MIN_FTB),
+    SPDField("tRP", SPD_BYTES.TRP_MIN, ftb_offset=SPD_BYTES.TRP_MIN_FTB),
+    SPDField("tRAS", SPD_BYTES.TRAS_MIN_LOW, width=12, high_offset=SPD_BYTES.TRAS_TRC_HIGH, high_shift=0),
+    SPDField("tRC", SPD_BYTES.TRC_MIN_LOW, width=12, high_offset=SPD_BYTES.TRAS_TRC_HIGH, high_shift=4,
+             ftb_offset=SPD_BYTES.TRC_MIN_FTB),
+    SPDField("tRFC1", SPD_BYTES.TRFC1_LOW, width=16, high_offset=SPD_BYTES.TRFC1_HIGH),
+    SPDField("tRFC2", SPD_BYTES.TRFC2_LOW, width=16, high_offset=SPD_BYTES.TRFC2_HIGH),
+    SPDField("tRFC4", SPD_BYTES.TRFC4_LOW, width=16, high_offset=SPD_BYTES.TRFC4_HIGH),
+    SPDField("tFAW", SPD_BYTES.TFAW_LOW, width=12, high_offset=SPD_BYTES.TFAW_HIGH, high_shift=0),
+    SPDField("tRRD_S", SPD_BYTES.TRRD_S_MIN),
+    SPDField("tRRD_L", SPD_BYTES.TRRD_L_MIN),
+    SPDField("tCCD_L", SPD_BYTES.TCCD_L_MIN),
+    SPDField("tWR", SPD_BYTES.TWR_MIN_LOW, width=12, high_offset=SPD_BYTES.TWR_MIN_HIGH, high_shift=0),
+    SPDField("tWTR_S", SPD_BYTES.TWTR_S_MIN, width=12, high_offset=SPD_BYTES.TWTR_MIN_HIGH, high_shift=0),
+    SPDField("tWTR_L", SPD_BYTES.TWTR_L_MIN, width=12, high_offset=SPD_BYTES.TWTR_MIN_HIGH, high_shift=4),
+]
+
+# XMP 2.0 Profile 字段，偏移相对于 XMP_PROFILE*_START
+XMP_PROFILE_FIELDS: List[SPDField] = [
+    SPDField("voltage", XMP_PROFILE_OFFSETS.VDD_VOLTAGE, unit="raw"),
+    SPDField("tCK", XMP_PROFILE_OFFSETS.TCK_MTB, ftb_offset=XMP_PROFILE_OFFSETS.TCK_FTB),
+    SPDField("tAA", XMP_PROFILE_OFFSETS.TAA_MTB, ftb_offset=XMP_PROFILE_OFFSETS.TAA_FTB),
+    SPDField("tRCD", XMP_PROFILE_OFFSETS.TRCD_MTB, ftb_offset=XMP_PROFILE_OFFSETS.TRCD_FTB),
+    SPDField("tRP", XMP_PROFILE_OFFSETS.TRP_MTB, ftb_offset=XMP_PROFILE_OFFSETS.TRP_FTB),
+    SPDField("tRAS", XMP_PROFILE_OFFSETS.TRAS_MTB_LOW, width=12,
+             high_offset=XMP_PROFILE_OFFSETS.TRAS_TRC_HIGH, high_shift=0),
+    SPDField("tRC", XMP_PROFILE_OFFSETS.TRC_MTB_LOW, width=12,
+             high_offset=XMP_PROFILE_OFFSETS.TRAS_TRC_HIGH, high_shift=4,
+             ftb_offset=XMP_PROFILE_OFFSETS.TRC_FTB),
+    SPDField("tRFC1", XMP_PROFILE_OFFSETS.TRFC1_LOW, width=16, high_offset=XMP_PROFILE_OFFSETS.TRFC1_HIGH),
+    SPDField("tRFC2", XMP_PROFILE_OFFSETS.TRFC2_LOW, width=16, high_offset=XMP_PROFILE_OFFSETS.TRFC2_HIGH),
+    SPDField("tRFC4", XMP_PROFILE_OFFSETS.TRFC4_LOW, width=16, high_offset=XMP_PROFILE_OFFSETS.TRFC4_HIGH),
+    SPDField("tFAW", XMP_PROFILE_OFFSETS.TFAW_LOW, width=12,
+             high_offset=XMP_PROFILE_OFFSETS.TFAW_HIGH, high_shift=0),
+    SPDField("tRRD_S", XMP_PROFILE_OFFSETS.TRRD_S_MIN),
+    SPDField("tRRD_L", XMP_PROFILE_OFFSETS.TRRD_L_MIN),
+    SPDField("tCCD_L", XMP_PROFILE_OFFSETS.TCCD_L_MIN),
+    SPDField("tWR", XMP_PROFILE_OFFSETS.TWR_LOW, width=12,
+             high_offset=XMP_PROFILE_OFFSETS.TWR_HIGH, high_shift=0),
+    SPDField("tWTR_S", XMP_PROFILE_OFFSETS.TWTR_S_MIN),
+    SPDField("tWTR_L", XMP_PROFILE_OFFSETS.TWTR_L_MIN),
+]
+
+BASE_TIMING_DECODER = CompiledSchema(BASE_TIMING_FIELDS)
+BASE_TIMING_NS_DECODER = CompiledSchema(BASE_TIMING_FIELDS, ps_divisor=1000)
+XMP_PROFILE_DECODER = CompiledSchema(XMP_PROFILE_FIELDS)
@@ -0,0 +1,115 @@
+"""
+BT 协议报文编解码
+命令编码到复用的 65 字节 bytearray（Report ID + 64 字节），激活/切页等固定命令的报文预先生成；
+响应直接在原始报告字节上解析（bytes.fromhex），不经过逐字符 chr()/ord() 与字符串拆分
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+REPORT_SIZE = 64
+PACKET_SIZE = REPORT_SIZE + 1   # Report ID (0) + 报告
+
+# 发送频繁且内容固定的命令：激活、Page 0、Page 1
+CONSTANT_COMMANDS = ("BT-VER0010", "BT-I2C2WR360001", "BT-I2C2WR370001")
+
+_NON_PRINTABLE = bytes(x for x in range(256) if not 32 <= x <= 126)
+
+
+def encode_packet(cmd_str: str) -> bytes:
+    """编码为新的报文（ReportID(0) + 64 字节，超长截断、不足补 0）"""
+    raw = cmd_str.encode("ascii")[:REPORT_SIZE]
+    return b"\x00" + raw + bytes(REPORT_SIZE - len(raw))
+
+
+class PacketEncoder:
+    """
+    复用缓冲的命令编码器
+
+    encode() 返回的 bytearray 在下一次 encode() 时被覆盖，须在此之前交给 device.write()；
+    固定命令返回预先生成的只读 bytes。
+    """
+
+    def __init__(self, constants: Sequence[str] = CONSTANT_COMMANDS):
+        self._buffer = bytearray(PACKET_SIZE)
+        self._length = 0    # 缓冲中上一条命令的长度，只需清零超出新命令的部分
+        self._cache: Dict[str, bytes] = {cmd: encode_packet(cmd) for cmd in constants}
+
+    def encode(self, cmd_str: str):
+        """
+        编码命令
+
+        Args:
+            cmd_str: 命令字符串 (ASCII)
+
+        Returns:
+            报文 (65 字节)
+        """
+        cached = self._cache.get(cmd_str)
+        if cached is not None:
+            return cached
+        raw = cmd_str.encode("ascii")[:REPORT_SIZE]
+        length = len(raw)
+        buffer = self._buffer
+        buffer[1:1 + length] = raw
+        if self._length > length:
+            buffer[1 + length:1 + self._length] = bytes(self._length - length)
+        self._length = length
+        return buffer
+
+
+def report_bytes(report: Optional[Sequence[int]]) -> bytes:
+    """原始报告（device.read 返回的 int 列表）截取到第一个 0 字节之前"""
+    if not report:
+        return b""
+    raw = bytes(report)
+    end = raw.find(0)
+    return raw if end < 0 else raw[:end]
+
+
+def decode_text(report: Optional[Sequence[int]]) -> Optional[str]:
+    """报告转换为字符串（只保留可打印字符），空报告返回 None"""
+    if not report:
+        return None
+    return bytes(report).translate(None, _NON_PRINTABLE).decode("ascii")
+
+
+def decode_block(report, length: int) -> Optional[List[int]]:
+    """
+    解析读取响应 ":XX XX ..."（也接受不带分隔的连续十六进制）
+
+    Args:
+        report: 原始报告 (int 列表 / bytes) 或已解码的响应字符串
+        length: 期望的字节数
+
+    Returns:
+        字节列表；格式不符或字节数不足时返回 None
+    """
+    if not report:
+        return None
+    raw = report.encode("ascii", "replace") if isinstance(report, str) else report_bytes(report)
+    raw = raw.strip()
+    if raw[:1] != b":":
+        return None
+    try:
+        data = bytes.fromhex(raw[1:].decode("ascii"))
+    except ValueError:
+        # 夹带非十六进制内容（如尾部状态文本）时按记号逐个解析
+        return _decode_tokens(raw[1:], length)
+    if len(data) < length:
+        return None
+    return list(data[:length])
+
+
+def _decode_tokens(body: bytes, length: int) -> Optional[List[int]]:
+    """慢路径：只取 2 字符的记号，前 length 个须为十六进制，忽略其后的其他内容"""
+    text = body.translate(None, _NON_PRINTABLE).decode("ascii").strip()
+    parts = text.split()
+    if len(parts) == 1 and len(text) > 2:
+        parts = [text[i:i + 2] for i in range(0, len(text), 2)]
+    hex_parts = [part for part in parts if len(part) == 2][:length]
+    if len(hex_parts) != length:
+        return None
+    try:
+        return [int(part, 16) for part in hex_parts]
+    except ValueError:
+        return None
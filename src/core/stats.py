@@ -0,0 +1,213 @@
+"""
+命令延迟统计
+按命令类别（激活、切页、读块、写块、写入后的 ACK 轮询）把 TX→RX 延迟记入固定分桶的直方图，并统计超时、错误响应、重试与吞吐量；
+每条命令只做一次二分查找与计数，分位数在显示时由直方图估算，内存占用与命令数无关
+"""
+
+import math
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 命令类别
+CMD_ACTIVATE = "activate"   # BT-VER
+CMD_PAGE = "page"           # BT-I2C2WR36 / 37 (EE1004 页选择)
+CMD_READ = "read"           # BT-I2C2RD
+CMD_WRITE = "write"         # BT-I2C2WR (数据写入)
+CMD_ACK_POLL = "ack_poll"   # 写入后的 ACK 轮询 (BT-I2C2RD)：写周期内的 NAK 是预期的，不计入读块
+CMD_OTHER = "other"
+
+COMMAND_CLASSES = (CMD_ACTIVATE, CMD_PAGE, CMD_READ, CMD_WRITE, CMD_ACK_POLL, CMD_OTHER)
+COMMAND_LABELS = {
+    CMD_ACTIVATE: "激活",
+    CMD_PAGE: "切页",
+    CMD_READ: "读块",
+    CMD_WRITE: "写块",
+    CMD_ACK_POLL: "轮询",
+    CMD_OTHER: "其他",
+}
+
+# 直方图桶上界（秒）：0.1 ms 起每 4 个桶翻倍（相邻桶约差 19%），最后一个约 3.3 s，更慢的计入溢出桶
+LATENCY_BUCKETS: Tuple[float, ...] = tuple(1e-4 * 2 ** (i / 4) for i in range(61))
+
+_PAGE_ADDRS = ("36", "37")
+
+
+def classify_command(cmd_str: str) -> Tuple[str, int]:
+    """
+    命令类别与数据字节数
+
+    Args:
+        cmd_str: 命令字符串
+
+    Returns:
+        (类别, 读取/写入的字节数)；激活与切页的字节数为 0
+    """
+    if cmd_str.startswith("BT-I2C2"):
+        if cmd_str[9:11] in _PAGE_ADDRS:
+            return CMD_PAGE, 0
+        try:
+            length = int(cmd_str[13:15], 16)
+        except ValueError:
+            return CMD_OTHER, 0
+        return (CMD_READ if cmd_str[7:9] == "RD" else CMD_WRITE), length
+    if cmd_str.startswith("BT-VER"):
+        return CMD_ACTIVATE, 0
+    return CMD_OTHER, 0
+
+
+class LatencyHistogram:
+    """固定分桶的延迟直方图"""
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)   # 最后一个为溢出桶
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, latency: float) -> None:
+        self.counts[bisect_left(self.bounds, latency)] += 1
+        self.count += 1
+        self.total += latency
+        if latency > self.max:
+            self.max = latency
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        估算分位数
+
+        Args:
+            p: 百分位 (0-100)
+
+        Returns:
+            所在桶的上界（不超过实测最大值），无样本时返回 None
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                bound = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(bound, self.max)
+        return self.max
+
+
+class CommandStats:
+    """一个命令类别的统计"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.sent = 0
+        self.timeouts = 0
+        self.errors = 0         # 读写命令收到响应但不是 ":..."（如 NAK、乱码）；ACK 轮询中为写周期内的 NAK 次数
+        self.retries = 0
+        self.bytes = 0          # 得到有效响应的命令的数据字节数
+        self.busy = 0.0         # 至少有一条命令在途的时间（流水线中重叠的部分只计一次）
+        self._busy_until = 0.0
+
+    def add(self, sent_at: float, received_at: float, nbytes: int, valid: bool) -> None:
+        self.histogram.add(received_at - sent_at)
+        self.busy += received_at - max(sent_at, self._busy_until)
+        self._busy_until = received_at
+        if valid:
+            self.bytes += nbytes
+        else:
+            self.errors += 1
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """有效数据吞吐量（字节/秒），按命令在途时间计算"""
+        if not self.bytes or self.busy <= 0:
+            return None
+        return self.bytes / self.busy
+
+
+class DriverStats:
+    """SPDDriver 的按类别命令统计"""
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self):
+        self.classes: Dict[str, CommandStats] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        self.classes = {name: CommandStats() for name in COMMAND_CLASSES}
+
+    def __getitem__(self, command_class: str) -> CommandStats:
+        return self.classes[command_class]
+
+    def record(
+        self,
+        command_class: str,
+        nbytes: int,
+        sent_at: float,
+        received_at: float,
+        response: Optional[Sequence[int]]
+    ) -> None:
+        """
+        记录一条命令的结果
+
+        Args:
+            command_class: 命令类别
+            nbytes: 读取/写入的数据字节数
+            sent_at: 发送时间 (time.perf_counter)
+            received_at: 收到响应的时间
+            response: 原始响应报告；None/空表示超时
+        """
+        stats = self.classes[command_class]
+        stats.sent += 1
+        if not response:
+            stats.timeouts += 1
+            return
+        # 激活/切页的响应内容不固定，只对读写命令检查 ":..." 格式
+        stats.add(sent_at, received_at, nbytes, not nbytes or response[0] == 0x3A)
+
+    def retry(self, command_class: str, count: int = 1) -> None:
+        """记录重发的命令数"""
+        self.classes[command_class].retries += count
+
+    def summary(self) -> List[dict]:
+        """有命令记录的类别的统计摘要（延迟单位为秒）"""
+        rows = []
+        for name, stats in self.classes.items():
+            if not stats.sent:
+                continue
+            row = {
+                "class": name,
+                "sent": stats.sent,
+                "timeouts": stats.timeouts,
+                "errors": stats.errors,
+                "retries": stats.retries,
+                "bytes": stats.bytes,
+                "throughput": stats.throughput,
+            }
+            for p in self.PERCENTILES:
+                row[f"p{p}"] = stats.histogram.percentile(p)
+            rows.append(row)
+        return rows
+
+    def format(self) -> str:
+        """格式化为文本表格（调试菜单与日志导出用）"""
+        rows = self.summary()
+        if not rows:
+            return ""
+
+        def ms(value: Optional[float]) -> str:
+            return "-" if value is None else f"{value * 1000:.2f}"
+
+        lines = [f"{'命令':<4}{'次数':>7}{'超时':>5}{'错误':>5}{'重试':>5}"
+                 f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'吞吐量 B/s':>12}"]
+        for row in rows:
+            throughput = "-" if row["throughput"] is None else f"{row['throughput']:.0f}"
+            lines.append(
+                f"{COMMAND_LABELS[row['class']]:<4}{row['sent']:>9}{row['timeouts']:>7}{row['errors']:>7}"
+                f"{row['retries']:>7}{ms(row['p50']):>9}{ms(row['p95']):>9}{ms(row['p99']):>9}{throughput:>15}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,133 @@
+"""
+Linux sysfs ee1004 读取
+加载 ee1004 驱动后，每条 DDR4 内存条的 SPD 以 /sys/bus/i2c/drivers/ee1004/<bus>-<addr>/eeprom 暴露，
+由内核完成选页与 SMBus 读取；本模块发现这些节点，并把全部镜像 readinto 到一块预分配的缓冲中
+（每条内存条一个 512 字节的 memoryview 切片，不产生中间 bytes），可直接交给 DDR4Parser / SPDDataModel
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .crc import is_crc_valid
+from .model import SPDDataModel
+from .parser.ddr4 import DDR4Parser, ModuleIdentity
+from ..utils.constants import SPD_SIZE
+
+SYSFS_EE1004_ROOT = "/sys/bus/i2c/drivers/ee1004"
+
+# i2c 设备目录名: <总线号>-<4 位十六进制地址>，如 0-0050
+_DEVICE_NAME = re.compile(r"^(\d+)-([0-9a-fA-F]{4})$")
+
+
+@dataclass
+class SysfsModule:
+    """一条内存条的 sysfs 节点与读取结果"""
+    name: str                           # i2c 设备名，如 "0-0050"
+    bus: int
+    addr: int
+    path: str                           # eeprom 节点路径
+    data: Optional[memoryview] = None   # 512 字节，指向 SysfsInventory.buffer
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
+    def parser(self) -> DDR4Parser:
+        """在读取结果上直接构造解析器（不复制数据）"""
+        return DDR4Parser(self.data)
+
+    def identity(self) -> ModuleIdentity:
+        return self.parser().parse_identity()
+
+    def crc_valid(self) -> bool:
+        return is_crc_valid(self.data)
+
+    def load_into(self, model: SPDDataModel) -> bool:
+        """加载到数据模型（视为来自设备）"""
+        return model.load_from_list(list(self.data), is_from_device=True)
+
+
+@dataclass
+class SysfsInventory:
+    """read_inventory() 的结果：全部镜像共享同一块缓冲"""
+    buffer: bytearray
+    modules: List[SysfsModule]
+
+    def readable(self) -> List[SysfsModule]:
+        return [module for module in self.modules if module.ok]
+
+
+def discover_ee1004(root: str = SYSFS_EE1004_ROOT) -> List[SysfsModule]:
+    """
+    发现 ee1004 驱动绑定的 EEPROM
+
+    Args:
+        root: ee1004 驱动的 sysfs 目录（测试时可指向伪造的目录树）
+
+    Returns:
+        按 (总线号, 地址) 排序的模块列表；驱动未加载时为空
+    """
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return []
+
+    modules = []
+    for name in names:
+        match = _DEVICE_NAME.match(name)
+        path = os.path.join(root, name, "eeprom")
+        if match and os.path.isfile(path):
+            modules.append(SysfsModule(name=name, bus=int(match.group(1)), addr=int(match.group(2), 16), path=path))
+    modules.sort(key=lambda module: (module.bus, module.addr))
+    return modules
+
+
+def read_eeprom_into(path: str, view: memoryview) -> int:
+    """
+    以无缓冲方式把 eeprom 节点读入 view（通常一次 readinto 完成）
+
+    Args:
+        path: eeprom 节点路径
+        view: 目标缓冲 (512 字节)
+
+    Returns:
+        读取的字节数
+    """
+    total = 0
+    with open(path, "rb", buffering=0) as f:
+        while total < len(view):
+            count = f.readinto(view[total:])
+            if not count:
+                break
+            total += count
+    return total
+
+
+def read_inventory(root: str = SYSFS_EE1004_ROOT) -> SysfsInventory:
+    """
+    读取本机全部 ee1004 内存条的 SPD
+
+    Args:
+        root: ee1004 驱动的 sysfs 目录
+
+    Returns:
+        SysfsInventory；读取失败的模块记录 error，data 为 None
+    """
+    modules = discover_ee1004(root)
+    buffer = bytearray(SPD_SIZE * len(modules))
+    view = memoryview(buffer)
+    for index, module in enumerate(modules):
+        slot = view[index * SPD_SIZE:(index + 1) * SPD_SIZE]
+        try:
+            count = read_eeprom_into(module.path, slot)
+        except OSError as e:
+            module.error = f"{type(e).__name__}: {e}"
+            continue
+        if count != SPD_SIZE:
+            module.error = f"只读取到 {count} 字节"
+            continue
+        module.data = slot
+    return SysfsInventory(buffer=buffer, modules=modules)
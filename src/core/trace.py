@@ -0,0 +1,96 @@
+"""
+驱动调试跟踪
+定长环形缓冲中保存结构化记录（单调时钟时间戳、操作、偏移、延迟、原始数据），
+记录时只保存引用，时间与文本格式化推迟到显示/导出时进行
+"""
+
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Iterator, List, NamedTuple, Optional, Tuple
+
+# 记录类型
+TRACE_LOG = "log"       # 普通消息：message % args
+TRACE_TX = "tx"         # 发送命令：raw 为命令字符串
+TRACE_RX = "rx"         # 收到响应：raw 为原始报告 (List[int])，None 表示超时
+TRACE_DROP = "drop"     # 丢弃的迟到/多余响应：raw 为原始报告
+
+
+class TraceRecord(NamedTuple):
+    """一条跟踪记录"""
+    timestamp: float                    # time.perf_counter()
+    op: str
+    message: str = ""
+    args: Tuple[Any, ...] = ()
+    offset: Optional[int] = None
+    latency: Optional[float] = None     # 秒
+    raw: Any = None
+
+
+def _printable(raw) -> str:
+    return "".join(chr(x) for x in raw if 32 <= x <= 126)
+
+
+class TraceBuffer:
+    """
+    定长跟踪环形缓冲
+
+    写满后覆盖最早的记录（dropped 计数），长时间批量操作时内存占用保持不变。
+    """
+
+    def __init__(self, maxlen: int = 4096):
+        self._records: Deque[TraceRecord] = deque(maxlen=maxlen)
+        self.dropped = 0
+        # perf_counter -> 墙上时间的换算基准
+        self._epoch = time.time() - time.perf_counter()
+
+    @property
+    def maxlen(self) -> int:
+        return self._records.maxlen
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[TraceRecord]:
+        return iter(self._records)
+
+    def append(self, record: TraceRecord) -> None:
+        if len(self._records) == self._records.maxlen:
+            self.dropped += 1
+        self._records.append(record)
+
+    def clear(self) -> None:
+        self._records.clear()
+        self.dropped = 0
+
+    def records(self, op: Optional[str] = None) -> List[TraceRecord]:
+        """当前缓冲中的记录（可按类型过滤）"""
+        return [r for r in self._records if op is None or r.op == op]
+
+    def format(self, record: TraceRecord) -> str:
+        """格式化单条记录: [HH:MM:SS.mmm] 文本"""
+        stamp = datetime.fromtimestamp(self._epoch + record.timestamp).strftime("%H:%M:%S.%f")[:-3]
+        return f"[{stamp}] {self.format_message(record)}"
+
+    @staticmethod
+    def format_message(record: TraceRecord) -> str:
+        """记录的文本（不含时间戳）"""
+        op = record.op
+        if op == TRACE_TX:
+            text = f"TX: {record.raw}"
+        elif op == TRACE_RX:
+            text = f"RX: {_printable(record.raw)}" if record.raw else "RX: (无响应/超时)"
+        elif op == TRACE_DROP:
+            text = f"{record.message or '丢弃响应'}: {_printable(record.raw or ())}"
+        else:
+            text = record.message % record.args if record.args else record.message
+        if record.latency is not None:
+            text += f" ({record.latency * 1000:.1f} ms)"
+        return text
+
+    def format_all(self) -> str:
+        """格式化全部记录（每行一条）"""
+        lines = [self.format(record) for record in self._records]
+        if self.dropped:
+            lines.insert(0, f"... 已覆盖 {self.dropped} 条较早的记录")
+        return "\n".join(lines)
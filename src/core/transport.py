@@ -0,0 +1,377 @@
+"""
+SPD 传输层
+把 "选页 + 按页内偏移读写块" 抽象为 SPDTransport，读写整片 SPD 的流程与具体总线无关：
+
+- HIDTransport: USB 读写器（BT 协议，经由 SPDDriver）
+- SMBusTransport: Linux i2c-dev (/dev/i2c-N)，直接访问主板 SMBus 上的 EE1004，
+  页选择为向 0x36 / 0x37 发送一个字节
+- FileTransport: 以 .bin 文件为后端的模拟 EEPROM
+
+SMBusTransport 需要 Linux 的 fcntl；其它平台导入本模块不会失败，打开时抛出 OSError。
+"""
+
+import ctypes
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - 非 Linux 平台
+    fcntl = None
+
+from .driver import SPDDriver, dirty_blocks
+from ..utils.constants import SPD_SIZE, SPD_PAGE_SIZE, SPD_DEFAULT_ADDR
+
+
+class SPDTransport(ABC):
+    """
+    SPD EEPROM 传输接口
+
+    偏移均为页内偏移 (0-255)，读写前须先 select_page()。
+    """
+
+    # 单次 read_block 的最大长度
+    max_read_length = 8
+    # 单次 write_block 的最大长度（不跨越 EEPROM 写页）
+    max_write_length = 8
+
+    @abstractmethod
+    def open(self) -> bool:
+        """打开传输通道，成功返回 True"""
+
+    @abstractmethod
+    def close(self) -> None:
+        """关闭传输通道"""
+
+    @abstractmethod
+    def select_page(self, page: int) -> None:
+        """切换 EE1004 页 (0: Byte 0-255, 1: Byte 256-511)，对总线上全部 EEPROM 生效"""
+
+    @abstractmethod
+    def read_block(self, addr: int, offset: int, length: int) -> Optional[List[int]]:
+        """
+        读取当前页的数据块
+
+        Args:
+            addr: I2C 地址
+            offset: 页内偏移
+            length: 字节数 (<= max_read_length)
+
+        Returns:
+            字节列表；无应答时返回 None
+        """
+
+    @abstractmethod
+    def write_block(self, addr: int, offset: int, data: List[int]) -> bool:
+        """
+        写入当前页的数据块并等待写周期结束
+
+        Args:
+            addr: I2C 地址
+            offset: 页内偏移
+            data: 数据 (长度 <= max_write_length，不跨越写页)
+
+        Returns:
+            是否写入成功
+        """
+
+    def __enter__(self) -> "SPDTransport":
+        if not self.open():
+            raise OSError(f"无法打开 {type(self).__name__}")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class HIDTransport(SPDTransport):
+    """USB 读写器（BT-I2C2RD / BT-I2C2WR），复用 SPDDriver 的轮询、块长协商与 ACK 轮询"""
+
+    def __init__(self, driver: Optional[SPDDriver] = None):
+        self.driver = driver or SPDDriver()
+
+    @property
+    def max_read_length(self) -> int:
+        return self.driver.block_size
+
+    def open(self) -> bool:
+        if not self.driver.is_connected() and not self.driver.connect():
+            return False
+        if not self.driver.send_cmd("BT-VER0010"):
+            return False
+        self.driver._settle(0.1)
+        if not self.driver._block_size_negotiated:
+            self.driver.negotiate_block_size()
+        return True
+
+    def close(self) -> None:
+        self.driver.disconnect()
+
+    def select_page(self, page: int) -> None:
+        self.driver._select_page(page)
+
+    def read_block(self, addr: int, offset: int, length: int) -> Optional[List[int]]:
+        return self.driver._try_read_block(addr, offset, length)
+
+    def write_block(self, addr: int, offset: int, data: List[int]) -> bool:
+        return self.driver._program_block(addr, offset, data)
+
+
+# linux/i2c-dev.h, linux/i2c.h
+I2C_SLAVE = 0x0703
+I2C_SLAVE_FORCE = 0x0706
+I2C_SMBUS = 0x0720
+I2C_SMBUS_WRITE = 0
+I2C_SMBUS_READ = 1
+I2C_SMBUS_BYTE = 1
+I2C_SMBUS_BYTE_DATA = 2
+I2C_SMBUS_I2C_BLOCK_DATA = 8
+I2C_SMBUS_BLOCK_MAX = 32
+
+# EE1004 页选择地址 (SPA0 / SPA1)
+EE1004_PAGE_ADDRS = (0x36, 0x37)
+
+
+class _SMBusData(ctypes.Union):
+    _fields_ = [
+        ("byte", ctypes.c_uint8),
+        ("word", ctypes.c_uint16),
+        ("block", ctypes.c_uint8 * (I2C_SMBUS_BLOCK_MAX + 2)),
+    ]
+
+
+class _SMBusIoctlData(ctypes.Structure):
+    _fields_ = [
+        ("read_write", ctypes.c_uint8),
+        ("command", ctypes.c_uint8),
+        ("size", ctypes.c_uint32),
+        ("data", ctypes.POINTER(_SMBusData)),
+    ]
+
+
+class SMBusTransport(SPDTransport):
+    """
+    Linux i2c-dev SMBus 后端
+
+    使用 I2C_SMBUS ioctl（PC 的 SMBus 控制器通常不支持原始 I2C 读写）：
+    读取为 I2C block read（单次最多 32 字节），写入为 I2C block write（不跨越 EE1004 的 16 字节写页），
+    写入后以单字节读取做 ACK 轮询。ioctl 参数结构只分配一次、反复复用。
+
+    已加载 ee1004 驱动时 EEPROM 地址被内核占用，需要 force=True（I2C_SLAVE_FORCE）；
+    写入会绕过驱动，请确认没有其它程序同时访问该总线。
+    """
+
+    max_read_length = I2C_SMBUS_BLOCK_MAX
+    max_write_length = 16
+    WRITE_TIMEOUT = 0.02            # EE1004 写周期上限 (秒)
+    ACK_POLL_INTERVAL = 0.0005      # ACK 轮询间隔 (秒)
+
+    def __init__(self, bus: int, force: bool = False):
+        """
+        Args:
+            bus: i2c 总线号 (/dev/i2c-N 的 N)
+            force: 地址被内核驱动占用时强制访问
+        """
+        self.bus = bus
+        self.force = force
+        self._fd: Optional[int] = None
+        self._addr: Optional[int] = None
+        self._data = _SMBusData()
+        self._args = _SMBusIoctlData(data=ctypes.pointer(self._data))
+
+    @property
+    def device_path(self) -> str:
+        return f"/dev/i2c-{self.bus}"
+
+    def open(self) -> bool:
+        if fcntl is None:
+            raise OSError("SMBus 访问仅支持 Linux")
+        if self._fd is None:
+            try:
+                self._fd = os.open(self.device_path, os.O_RDWR)
+            except OSError:
+                return False
+            self._addr = None
+        return True
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _set_address(self, addr: int) -> None:
+        if addr != self._addr:
+            fcntl.ioctl(self._fd, I2C_SLAVE_FORCE if self.force else I2C_SLAVE, addr)
+            self._addr = addr
+
+    def _smbus(self, addr: int, read_write: int, command: int, size: int) -> bool:
+        """
+        执行一次 SMBus 传输（数据经 self._data 传入/传出）
+
+        Returns:
+            设备是否应答；地址被内核驱动占用 (EBUSY，需 force=True) 时同样返回 False
+        """
+        self._args.read_write = read_write
+        self._args.command = command
+        self._args.size = size
+        try:
+            self._set_address(addr)
+            fcntl.ioctl(self._fd, I2C_SMBUS, self._args)
+        except OSError:
+            return False
+        return True
+
+    def select_page(self, page: int) -> None:
+        # EE1004 的 SPA0/SPA1 只需地址应答，数据字节被忽略；部分控制器在该地址上返回 NACK，忽略结果
+        self._data.byte = 0
+        self._smbus(EE1004_PAGE_ADDRS[page], I2C_SMBUS_WRITE, 0, I2C_SMBUS_BYTE)
+
+    def read_block(self, addr: int, offset: int, length: int) -> Optional[List[int]]:
+        length = min(length, I2C_SMBUS_BLOCK_MAX)
+        self._data.block[0] = length
+        if not self._smbus(addr, I2C_SMBUS_READ, offset, I2C_SMBUS_I2C_BLOCK_DATA):
+            return None
+        return list(self._data.block[1:1 + length])
+
+    def write_block(self, addr: int, offset: int, data: List[int]) -> bool:
+        self._data.block[0] = len(data)
+        self._data.block[1:1 + len(data)] = data
+        if not self._smbus(addr, I2C_SMBUS_WRITE, offset, I2C_SMBUS_I2C_BLOCK_DATA):
+            return False
+        # ACK 轮询：写周期内 EEPROM 不应答
+        deadline = time.perf_counter() + self.WRITE_TIMEOUT
+        while not self._smbus(addr, I2C_SMBUS_READ, offset, I2C_SMBUS_BYTE_DATA):
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(self.ACK_POLL_INTERVAL)
+        return True
+
+
+class FileTransport(SPDTransport):
+    """
+    以 .bin 文件为后端的模拟 EEPROM
+
+    images 中的 str 为文件路径（write_back=True 时写入会同步回文件），其它为镜像内容。
+    """
+
+    max_read_length = SPD_PAGE_SIZE
+    max_write_length = 16
+
+    def __init__(self, images: Union[str, bytes, Dict[int, Union[str, bytes]]], write_back: bool = False):
+        if not isinstance(images, dict):
+            images = {SPD_DEFAULT_ADDR: images}
+        self.sources = images
+        self.write_back = write_back
+        self.eeproms: Dict[int, bytearray] = {}
+        self.page = 0
+
+    def open(self) -> bool:
+        self.eeproms.clear()
+        for addr, source in self.sources.items():
+            if isinstance(source, str):
+                try:
+                    with open(source, "rb") as f:
+                        source = f.read()
+                except OSError:
+                    return False
+            if len(source) != SPD_SIZE:
+                return False
+            self.eeproms[addr] = bytearray(source)
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def select_page(self, page: int) -> None:
+        self.page = page
+
+    def read_block(self, addr: int, offset: int, length: int) -> Optional[List[int]]:
+        eeprom = self.eeproms.get(addr)
+        if eeprom is None:
+            return None
+        start = self.page * SPD_PAGE_SIZE + offset
+        return list(eeprom[start:start + length])
+
+    def write_block(self, addr: int, offset: int, data: List[int]) -> bool:
+        eeprom = self.eeproms.get(addr)
+        if eeprom is None:
+            return False
+        start = self.page * SPD_PAGE_SIZE + offset
+        eeprom[start:start + len(data)] = bytes(data)
+        source = self.sources.get(addr)
+        if self.write_back and isinstance(source, str):
+            with open(source, "r+b") as f:
+                f.seek(start)
+                f.write(bytes(data))
+        return True
+
+
+def read_spd_image(
+    transport: SPDTransport,
+    addr: int = SPD_DEFAULT_ADDR,
+    progress_callback: Optional[Callable[[float], None]] = None
+) -> Optional[List[int]]:
+    """
+    经由任意传输层读取完整 512 字节 SPD（传输层须已打开）
+
+    Args:
+        transport: 传输层
+        addr: I2C 地址
+        progress_callback: 进度回调 (0-1)
+
+    Returns:
+        512 字节数据列表；任一块无应答时返回 None
+    """
+    data = [0] * SPD_SIZE
+    step = max(1, min(transport.max_read_length, SPD_PAGE_SIZE))
+    for page in (0, 1):
+        transport.select_page(page)
+        base = page * SPD_PAGE_SIZE
+        for offset in range(0, SPD_PAGE_SIZE, step):
+            length = min(step, SPD_PAGE_SIZE - offset)
+            block = transport.read_block(addr, offset, length)
+            if block is None or len(block) != length:
+                return None
+            data[base + offset:base + offset + length] = block
+            if progress_callback:
+                progress_callback((base + offset + length) / SPD_SIZE)
+    return data
+
+
+def write_spd_image(
+    transport: SPDTransport,
+    data: List[int],
+    addr: int = SPD_DEFAULT_ADDR,
+    baseline: Optional[List[int]] = None
+) -> bool:
+    """
+    经由任意传输层写入 SPD（传输层须已打开）；提供 baseline 时只写入有差异的块
+
+    Args:
+        transport: 传输层
+        data: 512 字节数据
+        addr: I2C 地址
+        baseline: 设备上的当前内容
+
+    Returns:
+        是否全部写入成功
+    """
+    if len(data) != SPD_SIZE:
+        return False
+    size = transport.max_write_length
+    if baseline is not None and len(baseline) == SPD_SIZE:
+        blocks = dirty_blocks(data, baseline, size)
+    else:
+        blocks = list(range(0, SPD_SIZE, size))
+
+    current_page = None
+    for address in blocks:
+        page, offset = divmod(address, SPD_PAGE_SIZE)
+        if page != current_page:
+            transport.select_page(page)
+            current_page = page
+        if not transport.write_block(addr, offset, list(data[address:address + size])):
+            return False
+    return True
@@ -12,7 +12,6 @@ from datetime import datetime
 
 from ..core.driver import SPDDriver
 from ..core.model import SPDDataModel, DataChangeEvent, DataChangeType
-from ..core.parser import DDR4Parser
 from ..core.updater import UpdateChecker, ReleaseInfo
 from .tabs.overview import OverviewTab
 from .tabs.details import DetailsTab
@@ -245,6 +244,15 @@ class SPDApp(ctk.CTk):
         )
         self.info_label.pack(side="right", padx=15)
 
+        # CRC 状态（随数据变更实时更新）
+        self.crc_label = ctk.CTkLabel(
+            statusbar,
+            text="",
+            font=("Arial", 11, "bold"),
+            text_color=Colors.TEXT_SECONDARY
+        )
+        self.crc_label.pack(side="right", padx=10)
+
     def _on_data_changed(self, event: DataChangeEvent):
         """数据变更回调"""
         if self.data_model.is_modified:
@@ -253,6 +261,24 @@ class SPDApp(ctk.CTk):
             self.btn_write.configure(state="normal")
         else:
             self.modified_label.configure(text="")
+        self._update_crc_label()
+
+    def _update_crc_label(self):
+        """更新状态栏 CRC 状态（CRC 由数据模型增量维护，无需全量重算）"""
+        if not self.data_model.has_data:
+            self.crc_label.configure(text="")
+            return
+        statuses = self.data_model.check_crc()
+        if not statuses:
+            # 不是 DDR4 数据，CRC 布局不适用
+            self.crc_label.configure(text="CRC N/A", text_color=Colors.TEXT_SECONDARY)
+            return
+        bad = [s for s in statuses if not s.valid]
+        if bad:
+            names = "/".join("基础" if s.name == "base" else "模组" for s in bad)
+            self.crc_label.configure(text=f"CRC BAD ({names})", text_color=Colors.DANGER)
+        else:
+            self.crc_label.configure(text="CRC OK", text_color=Colors.SUCCESS)
 
     def _set_status(self, text: str):
         """设置状态文本"""
@@ -321,13 +347,14 @@ class SPDApp(ctk.CTk):
                 self.data_model.load_from_list(data, is_from_device=True)
                 self._log("读取完成", "success")
 
-                # 解析并显示信息
-                parser = DDR4Parser(data)
-                info = parser.to_dict()
+                # 解析并显示信息（与各选项卡共享同一份解析缓存）
+                info = self.data_model.get_parsed_info()
                 if "error" not in info:
                     self._log(f"检测到: {info.get('manufacturer', 'Unknown')} {info.get('part_number', '')}")
                     self._log(f"容量: {info.get('capacity', '-')}, 速度: {info.get('speed_grade', '-')} MT/s")
 
+                self._log_crc_status()
+
                 # 自动备份
                 backup_path = f"backup_spd_{datetime.now().strftime('%Y%m%d_%H%M%S')}.bin"
                 self.data_model.save_to_file(backup_path)
@@ -348,6 +375,22 @@ class SPDApp(ctk.CTk):
             self._set_buttons_state(True)
             self.progress.set(0)
 
+    def _log_crc_status(self):
+        """校验 CRC 并记录结果（加载/读取后调用）"""
+        statuses = self.data_model.check_crc()
+        if not statuses:
+            return
+        bad = [s for s in statuses if not s.valid]
+        if not bad:
+            self._log("CRC 校验通过")
+            return
+        for s in bad:
+            self._log(
+                f"CRC 校验失败: Byte {s.start}-{s.end - 1} "
+                f"存储值 0x{s.stored:04X}，计算值 0x{s.computed:04X}（写入时将自动修正）",
+                "warning"
+            )
+
     def _show_device_diagnostic(self):
         """显示设备诊断信息"""
         from ..core.driver import SPDDriver
@@ -382,10 +425,10 @@ class SPDApp(ctk.CTk):
             if self.data_model.load_from_file(path):
                 self._log(f"已加载文件: {os.path.basename(path)}", "success")
 
-                parser = DDR4Parser(self.data_model.data)
-                info = parser.to_dict()
+                info = self.data_model.get_parsed_info()
                 if "error" not in info:
                     self._log(f"检测到: {info.get('manufacturer', 'Unknown')} {info.get('part_number', '')}")
+                self._log_crc_status()
 
                 self._set_status("文件已加载")
                 self.info_label.configure(text=os.path.basename(path))
@@ -451,15 +494,23 @@ class SPDApp(ctk.CTk):
 
             self._log("设备已连接，开始写入...")
 
+            # 先在模型上刷新 CRC，写入的内容、界面显示与之后的验证数据保持一致
+            if self.data_model.fix_crc():
+                self._log("已更新 SPD CRC")
+
+            # 差分写入：以写入前从设备回读的内容为基准（内存中的快照可能已过时，或已更换内存条）
             success = self.driver.write_spd(
                 self.data_model.data,
                 progress_callback=lambda p: self.progress.set(p),
-                log_callback=lambda msg: self._log(msg)
+                log_callback=lambda msg: self._log(msg),
+                baseline=None,
+                differential=True
             )
 
             self.driver.disconnect()
 
             if success:
+                self.data_model.commit_original()
                 self._log("写入成功！请重启电脑。", "success")
                 self._set_status("写入成功")
                 messagebox.showinfo(
@@ -572,7 +623,7 @@ class DebugMenu(ctk.CTkToplevel):
         super().__init__(parent)
 
         self.title("调试工具")
-        self.geometry("500x450")
+        self.geometry("640x560")
         self.minsize(400, 350)
 
         self.driver = driver
@@ -623,6 +674,15 @@ class DebugMenu(ctk.CTkToplevel):
             command=self._export_log
         ).pack(side="left", padx=5)
 
+        # 命令统计（按类别的延迟分位数、超时/错误/重试与吞吐量）
+        self.stats_text = ctk.CTkTextbox(
+            self,
+            font=("Consolas", 10),
+            wrap="none",
+            height=110
+        )
+        self.stats_text.pack(fill="x", padx=10, pady=(0, 10))
+
         # 日志显示区域
         self.log_text = ctk.CTkTextbox(
             self,
@@ -641,6 +701,7 @@ class DebugMenu(ctk.CTkToplevel):
 
     def _load_debug_log(self):
         """加载调试日志"""
+        self._load_stats()
         self.log_text.configure(state="normal")
         self.log_text.delete("1.0", "end")
 
@@ -652,9 +713,18 @@ class DebugMenu(ctk.CTkToplevel):
 
         self.log_text.configure(state="disabled")
 
+    def _load_stats(self):
+        """加载命令统计"""
+        self.stats_text.configure(state="normal")
+        self.stats_text.delete("1.0", "end")
+        summary = self.driver.get_stats_summary()
+        self.stats_text.insert("1.0", summary or "(暂无命令统计)")
+        self.stats_text.configure(state="disabled")
+
     def _clear_log(self):
-        """清除日志"""
+        """清除日志与命令统计"""
         self.driver.clear_debug_log()
+        self.driver.reset_stats()
         self._load_debug_log()
         self.log_callback("调试日志已清除", "info")
 
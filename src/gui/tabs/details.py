@@ -8,9 +8,9 @@ from typing import Optional, Dict, Any
 
 from ..widgets.editable_field import EditableField
 from ...core.model import SPDDataModel, DataChangeEvent
-from ...core.parser import DDR4Parser
-from ...core.parser.manufacturers import COMMON_MANUFACTURERS, get_manufacturer_id
-from ...utils.constants import Colors, SPD_BYTES, MODULE_TYPES, MTB
+from ...core.encoder import encode_detail
+from ...core.parser.manufacturers import COMMON_MANUFACTURERS
+from ...utils.constants import Colors, SPD_BYTES, MODULE_TYPES
 
 
 class DetailsTab(ctk.CTkFrame):
@@ -180,91 +180,8 @@ class DetailsTab(ctk.CTkFrame):
 
         print(f"[DEBUG DetailsTab] Processing field change: key={key}, value={value}")
 
-        # 根据字段类型更新 SPD 数据
-        if key == "manufacturer":
-            # 更新制造商 ID
-            first_byte, second_byte = get_manufacturer_id(value)
-            print(f"[DEBUG] Manufacturer ID: first_byte=0x{first_byte:02X}, second_byte=0x{second_byte:02X}")
-            # 移除不必要的条件检查，始终更新
-            self.data_model.set_byte(SPD_BYTES.MANUFACTURER_ID_FIRST, first_byte)
-            self.data_model.set_byte(SPD_BYTES.MANUFACTURER_ID_SECOND, second_byte)
-            print(f"[DEBUG] Updated manufacturer bytes at {SPD_BYTES.MANUFACTURER_ID_FIRST} and {SPD_BYTES.MANUFACTURER_ID_SECOND}")
-
-        elif key == "part_number":
-            # 更新部件号 (20 字符，右侧填充空格)
-            part_number = value.ljust(20)[:20]
-            for i, char in enumerate(part_number):
-                offset = SPD_BYTES.PART_NUMBER_START + i
-                self.data_model.set_byte(offset, ord(char))
-
-        elif key == "serial_number":
-            # 更新序列号 (4 字节十六进制)
-            try:
-                hex_str = value.replace("0x", "").replace("0X", "").replace(" ", "")
-                if len(hex_str) <= 8:
-                    hex_str = hex_str.zfill(8)
-                    for i in range(4):
-                        byte_val = int(hex_str[i*2:(i+1)*2], 16)
-                        self.data_model.set_byte(SPD_BYTES.SERIAL_NUMBER_1 + i, byte_val)
-            except ValueError:
-                pass
-
-        elif key == "manufacturing_date":
-            # 更新生产日期 (格式: YYYY-WXX 或 WXX/YYYY)
-            try:
-                # 尝试解析各种格式
-                value = value.strip()
-                year = None
-                week = None
-
-                if "/" in value:
-                    # 格式: W26/2023 或 26/2023
-                    parts = value.split("/")
-                    week_part = parts[0].replace("W", "").replace("w", "")
-                    week = int(week_part)
-                    year = int(parts[1]) % 100  # 取后两位
-                elif "-W" in value.upper():
-                    # 格式: 2023-W26
-                    parts = value.upper().split("-W")
-                    year = int(parts[0]) % 100
-                    week = int(parts[1])
-                elif len(value) == 4 and value.isdigit():
-                    # 只有年份
-                    year = int(value) % 100
-                    week = 1
-
-                if year is not None:
-                    self.data_model.set_byte(SPD_BYTES.MANUFACTURING_YEAR, year)
-                if week is not None:
-                    self.data_model.set_byte(SPD_BYTES.MANUFACTURING_WEEK, week)
-            except (ValueError, IndexError):
-                pass
-
-        elif key == "module_type":
-            # 更新模组类型
-            for type_code, type_name in MODULE_TYPES.items():
-                if type_name == value:
-                    self.data_model.set_byte(SPD_BYTES.MODULE_TYPE, type_code)
-                    break
-
-        elif key == "speed_grade":
-            # 更新速度等级 (通过修改 tCK_min)
-            # 速度等级 = 2000000 / tCK_min (ps)
-            # tCK_min = 2000000 / speed_grade
-            try:
-                speed = int(value)
-                if 1600 <= speed <= 5000:
-                    # tCK_min in ps, MTB = 125ps
-                    tck_ps = 2000000 / speed
-                    tck_ps_int = int(round(tck_ps))
-
-                    tck_mtb = int(tck_ps_int // MTB)
-                    tck_ftb = int(tck_ps_int - tck_mtb * MTB)  # 0..124
-
-                    self.data_model.set_byte(SPD_BYTES.TCK_MIN, tck_mtb)
-                    self.data_model.set_byte(SPD_BYTES.TCK_MIN_FTB, tck_ftb & 0xFF)
-            except ValueError:
-                pass
+        # 编码为一个字节补丁，部件号等多字节字段也只触发一次数据变更通知
+        self.data_model.apply_patch(encode_detail(self.data_model.data, key, value))
 
     def refresh(self):
         """刷新显示"""
@@ -273,8 +190,7 @@ class DetailsTab(ctk.CTkFrame):
             self._show_no_data()
             return
 
-        parser = DDR4Parser(self.data_model.data)
-        info = parser.to_dict()
+        info = self.data_model.get_parsed_info()
 
         if "error" in info:
             self._show_no_data()
@@ -300,8 +216,8 @@ class DetailsTab(ctk.CTkFrame):
             "part_number": info.get("part_number", "-"),
             "serial_number": info.get("serial_number", "-"),
             "manufacturing_date": info.get("manufacturing_date", "-"),
-            "spd_bytes_used": f"{self.data_model.data[0]} bytes" if self.data_model.has_data else "-",
-            "spd_revision": f"{self.data_model.data[1] >> 4}.{self.data_model.data[1] & 0x0F}" if self.data_model.has_data else "-",
+            "spd_bytes_used": f"{self.data_model.get_byte(SPD_BYTES.BYTES_USED)} bytes",
+            "spd_revision": f"{self.data_model.get_byte(SPD_BYTES.REVISION) >> 4}.{self.data_model.get_byte(SPD_BYTES.REVISION) & 0x0F}",
             # DRAM 信息
             "dram_manufacturer": dram_mfr.get("name", "-"),
             "die_density": f"{die_info.get('density_gb', '-')} Gb",
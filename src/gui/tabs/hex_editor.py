@@ -44,7 +44,8 @@ class HexEditorTab(ctk.CTkFrame):
         """数据变更回调"""
         self.hex_view.set_data(
             self.data_model.data,
-            self.data_model.modified_bytes
+            self.data_model.modified_bytes,
+            self.data_model.unread_offsets
         )
 
     def highlight_byte(self, offset: int):
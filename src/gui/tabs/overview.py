@@ -8,7 +8,6 @@ from typing import Optional, Dict, Any
 
 from ..widgets.info_card import InfoCard, LargeInfoCard, TimingCard
 from ...core.model import SPDDataModel, DataChangeEvent
-from ...core.parser import DDR4Parser
 from ...utils.constants import Colors
 
 
@@ -111,9 +110,8 @@ class OverviewTab(ctk.CTkFrame):
             self._show_no_data()
             return
 
-        # 解析数据 (使用当前显示模式)
-        parser = DDR4Parser(self.data_model.data)
-        info = parser.to_dict(mode=self.display_mode)
+        # 解析数据 (使用当前显示模式，模型按版本缓存解析结果)
+        info = self.data_model.get_parsed_info(mode=self.display_mode)
 
         if "error" in info:
             self._show_no_data()
@@ -9,8 +9,8 @@ from typing import Optional, Dict, Any
 from ..widgets.editable_field import EditableField
 from ..widgets.timing_edit_dialog import TimingEditDialog
 from ...core.model import SPDDataModel, DataChangeEvent
-from ...core.parser import DDR4Parser
-from ...utils.constants import Colors, SPD_BYTES, MTB, FTB
+from ...core.encoder import encode_timing
+from ...utils.constants import Colors
 
 
 class TimingTab(ctk.CTkFrame):
@@ -183,8 +183,7 @@ class TimingTab(ctk.CTkFrame):
             self._show_no_data()
             return
 
-        parser = DDR4Parser(self.data_model.data)
-        info = parser.to_dict()
+        info = self.data_model.get_parsed_info()
 
         if "error" in info:
             self._show_no_data()
@@ -210,7 +209,7 @@ class TimingTab(ctk.CTkFrame):
                         field.set_value(str(timings[key]))
 
         # Update advanced timings (still using EditableField)
-        timing_obj = parser.parse_timings()
+        timing_obj = self.data_model.get_timing_info()
         if "tRFC1" in self.fields:
             self.fields["tRFC1"].set_value(f"{timing_obj.tRFC1:.1f} ns")
         if "tRFC2" in self.fields:
@@ -281,50 +280,6 @@ class TimingTab(ctk.CTkFrame):
 
     def _write_timing(self, key: str, value_ns: float):
         """写入时序参数到 SPD 数据"""
-        value_ps = value_ns * 1000
-        mtb_value = int(value_ps / MTB)
-        ftb_value = int((value_ps - mtb_value * MTB) / FTB)
-
-        # 将 FTB 转换为有符号字节 (-128 到 127)
-        if ftb_value > 127:
-            ftb_value = ftb_value - 256
-        elif ftb_value < -128:
-            ftb_value = ftb_value + 256
-        ftb_byte = ftb_value & 0xFF
-
-        if key == "tCK":
-            self.data_model.set_byte(SPD_BYTES.TCK_MIN, mtb_value)
-            self.data_model.set_byte(SPD_BYTES.TCK_MIN_FTB, ftb_byte)
-
-        elif key == "tAA":
-            self.data_model.set_byte(SPD_BYTES.TAA_MIN, mtb_value)
-            self.data_model.set_byte(SPD_BYTES.TAA_MIN_FTB, ftb_byte)
-
-        elif key == "tRCD":
-            self.data_model.set_byte(SPD_BYTES.TRCD_MIN, mtb_value)
-            self.data_model.set_byte(SPD_BYTES.TRCD_MIN_FTB, ftb_byte)
-
-        elif key == "tRP":
-            self.data_model.set_byte(SPD_BYTES.TRP_MIN, mtb_value)
-            self.data_model.set_byte(SPD_BYTES.TRP_MIN_FTB, ftb_byte)
-
-        elif key == "tRAS":
-            # tRAS uses high nibble of byte 27 + full byte 28
-            high_nibble = (mtb_value >> 8) & 0x0F
-            low_byte = mtb_value & 0xFF
-            current_27 = self.data_model.get_byte(SPD_BYTES.TRAS_TRC_HIGH)
-            new_27 = (current_27 & 0xF0) | high_nibble  # Keep tRC high nibble
-            self.data_model.set_byte(SPD_BYTES.TRAS_TRC_HIGH, new_27)
-            self.data_model.set_byte(SPD_BYTES.TRAS_MIN_LOW, low_byte)
-
-        elif key == "tRC":
-            # tRC uses high nibble of byte 27 + full byte 29 + FTB
-            high_nibble = (mtb_value >> 8) & 0x0F
-            low_byte = mtb_value & 0xFF
-            current_27 = self.data_model.get_byte(SPD_BYTES.TRAS_TRC_HIGH)
-            new_27 = (current_27 & 0x0F) | (high_nibble << 4)  # Keep tRAS high nibble
-            self.data_model.set_byte(SPD_BYTES.TRAS_TRC_HIGH, new_27)
-            self.data_model.set_byte(SPD_BYTES.TRC_MIN_LOW, low_byte)
-            self.data_model.set_byte(SPD_BYTES.TRC_MIN_FTB, ftb_byte)
+        self.data_model.apply_patch(encode_timing(self.data_model.data, key, value_ns))
 
         # Refresh will be triggered automatically by data model observer
@@ -5,7 +5,7 @@
 import customtkinter as ctk
 from tkinter import font as tkfont
 import tkinter as tk
-from typing import Optional, Callable, List, Set
+from typing import Optional, Callable, List, Set, FrozenSet
 
 from ...utils.constants import Colors, SPD_SIZE
 
@@ -31,6 +31,7 @@ class HexView(ctk.CTkFrame):
         self.editable = editable
         self.on_byte_changed = on_byte_changed
         self._modified_bytes = modified_bytes if modified_bytes else set()
+        self._unread_bytes: FrozenSet[int] = frozenset()
         self._selected_offset = -1
         self._selection_start = -1
         self._selection_end = -1
@@ -144,9 +145,11 @@ class HexView(ctk.CTkFrame):
                     byte_val = self._data[offset]
                     hex_str = f"{byte_val:02X}"
 
-                    # 检查是否被修改
+                    # 检查是否被修改；未读取的字节显示为 --
                     if offset in self._modified_bytes:
                         self.hex_text.insert("end", hex_str, "modified")
+                    elif offset in self._unread_bytes:
+                        self.hex_text.insert("end", "--", "separator")
                     else:
                         self.hex_text.insert("end", hex_str, "hex")
 
@@ -164,7 +167,9 @@ class HexView(ctk.CTkFrame):
                 offset = row + i
                 if offset < len(self._data):
                     byte_val = self._data[offset]
-                    if 32 <= byte_val < 127:
+                    if offset in self._unread_bytes and offset not in self._modified_bytes:
+                        char = " "
+                    elif 32 <= byte_val < 127:
                         char = chr(byte_val)
                     else:
                         char = "."
@@ -466,10 +471,16 @@ class HexView(ctk.CTkFrame):
         except ValueError:
             pass
 
-    def set_data(self, data: List[int], modified_bytes: Optional[Set[int]] = None):
+    def set_data(
+        self,
+        data: List[int],
+        modified_bytes: Optional[Set[int]] = None,
+        unread_bytes: Optional[FrozenSet[int]] = None
+    ):
         """设置数据"""
         self._data = data.copy() if data else [0] * SPD_SIZE
         self._modified_bytes = modified_bytes.copy() if modified_bytes else set()
+        self._unread_bytes = frozenset(unread_bytes or ())
         self._selected_offset = -1
         self._update_display()
 
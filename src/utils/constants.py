@@ -10,6 +10,10 @@ DEFAULT_PID = 0x1230
 SPD_SIZE = 512
 SPD_PAGE_SIZE = 256
 
+# SPD EEPROM 的 I2C 地址：插槽 0-7 对应 0x50-0x57
+SPD_DEFAULT_ADDR = 0x50
+SPD_SLOT_ADDRS = tuple(range(0x50, 0x58))
+
 # DDR4 SPD 字节偏移定义
 class SPD_BYTES:
     # 基本信息 (0-127)
@@ -0,0 +1,119 @@
+import asyncio
+import pathlib
+import sys
+import time
+import unittest
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.core.async_driver import AsyncSPDDriver, SPDOperationError  # noqa: E402
+from src.core.driver import SPDDriver  # noqa: E402
+from src.core.emulator import EmulatedHIDDevice  # noqa: E402
+
+SAMPLE_PATH = repo_root / "samples" / "DDR4_Hynix_HMA42GR7MFR4N.bin"
+
+
+class NakReadDevice(EmulatedHIDDevice):
+    """应答命令但拒绝所有读取的模拟读写器"""
+
+    def _execute(self, cmd, at):
+        if cmd.startswith("BT-I2C2RD"):
+            return self.NACK_RESPONSE
+        return super()._execute(cmd, at)
+
+
+def make_driver(bus_time=0.0):
+    driver = SPDDriver()
+    driver.device = EmulatedHIDDevice(SAMPLE_PATH.read_bytes(), bus_time=bus_time)
+    return driver
+
+
+class TestAsyncDriver(unittest.TestCase):
+    def test_read_and_probe(self):
+        async def scenario():
+            async with AsyncSPDDriver(make_driver()) as dev:
+                progress = []
+                data = await dev.read_spd(progress_callback=progress.append)
+                identity = await dev.probe_identity()
+                return data, identity, progress
+
+        data, identity, progress = asyncio.run(scenario())
+        self.assertEqual(data, list(SAMPLE_PATH.read_bytes()))
+        self.assertEqual(identity.memory_type, "DDR4")
+        self.assertEqual(progress[-1], 1.0)
+
+    def test_deadline_stops_the_operation(self):
+        driver = make_driver(bus_time=0.005)
+
+        async def scenario():
+            async with AsyncSPDDriver(driver) as dev:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await dev.read_spd(timeout=0.05)
+                # 超时返回时执行器中的读取已停止，设备可立即用于下一个操作
+                sent = len(driver.device.commands)
+                await asyncio.sleep(0.05)
+                self.assertEqual(len(driver.device.commands), sent)
+                driver.device.bus_time = 0.0
+                return await dev.read_spd()
+
+        self.assertEqual(asyncio.run(scenario()), list(SAMPLE_PATH.read_bytes()))
+
+    def test_cancellation(self):
+        driver = make_driver(bus_time=0.005)
+
+        async def scenario():
+            async with AsyncSPDDriver(driver) as dev:
+                task = asyncio.create_task(dev.read_spd())
+                await asyncio.sleep(0.05)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                return len(driver.device.commands)
+
+        self.assertLess(asyncio.run(scenario()), 64)
+
+    def test_deadline_stops_probe_on_nak(self):
+        driver = SPDDriver()
+        device = driver.device = NakReadDevice(SAMPLE_PATH.read_bytes())
+
+        async def scenario():
+            async with AsyncSPDDriver(driver) as dev:
+                started = time.perf_counter()
+                with self.assertRaises(asyncio.TimeoutError):
+                    await dev.probe_identity(timeout=0.05)
+                return time.perf_counter() - started
+
+        # 不等每个块重试完：首块之后即在块边界停下
+        self.assertLess(asyncio.run(scenario()), 0.3)
+        reads = [c for c in device.commands if c.startswith("BT-I2C2RD")]
+        self.assertLess(len(reads), 8)
+
+    def test_many_devices_on_one_loop(self):
+        drivers = [make_driver(bus_time=0.001) for _ in range(4)]
+
+        async def scenario():
+            devices = [AsyncSPDDriver(d) for d in drivers]
+            try:
+                return await asyncio.gather(*(dev.probe_identity() for dev in devices))
+            finally:
+                for dev in devices:
+                    await dev.close()
+
+        identities = asyncio.run(scenario())
+        self.assertEqual(len({i.serial_number for i in identities}), 1)
+
+    def test_failure_raises(self):
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(bytes(512))
+
+        async def scenario():
+            async with AsyncSPDDriver(driver) as dev:
+                await dev.read_spd()
+
+        with self.assertRaises(SPDOperationError):
+            asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import contextlib
+import io
+import pathlib
+import random
+import sys
+import unittest
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 可选依赖
+    np = None
+
+from src.core.parser import DDR4Parser  # noqa: E402
+from src.core.parser.batch import decode_batch, manufacturer_names, as_spd_array  # noqa: E402
+
+SAMPLE_PATH = repo_root / "samples" / "DDR4_Hynix_HMA42GR7MFR4N.bin"
+
+
+def _corpus(count=200, seed=5):
+    base = list(SAMPLE_PATH.read_bytes())
+    rng = random.Random(seed)
+    images = []
+    for i in range(count):
+        image = base[:]
+        for _ in range(30):
+            image[rng.randrange(512)] = rng.randrange(256)
+        image[2] = 0x0C
+        if i % 2:
+            image[384:387] = [0x0C, 0x4A, rng.choice([0, 1, 3])]
+            image[393] = rng.choice([0x85, 0x93, 0x00])
+            image[396] = rng.choice([5, 6, 7])
+        images.append(image)
+    return images
+
+
+@unittest.skipIf(np is None, "NumPy not installed")
+class TestBatchDecode(unittest.TestCase):
+    def test_matches_scalar_parser(self):
+        images = _corpus()
+        columns = decode_batch(np.array(images, dtype=np.uint8))
+        names = manufacturer_names(columns["manufacturer_id"])
+
+        for i, image in enumerate(images):
+            parser = DDR4Parser(image)
+            with contextlib.redirect_stdout(io.StringIO()):
+                timing = parser.parse_timings()
+                xmp = parser.parse_xmp()
+            capacity = parser.parse_capacity()
+
+            self.assertEqual(columns["tCK"][i], timing.tCK)
+            self.assertEqual(columns["tRFC1"][i], timing.tRFC1)
+            self.assertEqual(columns["CL"][i], timing.CL)
+            self.assertEqual(columns["speed_grade"][i], parser.parse_speed_grade())
+            self.assertEqual(columns["total_capacity_gb"][i], capacity["total_capacity_gb"])
+            self.assertEqual(names[i], parser.parse_manufacturer()["name"])
+            self.assertEqual(bool(columns["xmp_supported"][i]), xmp["supported"])
+
+            profiles = {p["profile_num"]: p for p in xmp["profiles"]}
+            self.assertEqual(bool(columns["xmp1_enabled"][i]), 1 in profiles)
+            if 1 in profiles:
+                for key in ("frequency", "CL", "tRCD", "tRP", "tRAS", "tRFC1"):
+                    self.assertEqual(columns[f"xmp1_{key}"][i], profiles[1][key], key)
+
+    def test_concatenated_bytes_input(self):
+        blob = SAMPLE_PATH.read_bytes() * 3
+        array = as_spd_array(blob)
+        self.assertEqual(array.shape, (3, 512))
+        self.assertTrue(decode_batch(blob)["valid"].all())
+
+    def test_rejects_partial_image(self):
+        with self.assertRaises(ValueError):
+            as_spd_array(b"\x00" * 700)
+
+
+if __name__ == "__main__":
+    unittest.main()
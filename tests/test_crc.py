@@ -0,0 +1,101 @@
+import binascii
+import pathlib
+import random
+import sys
+import tempfile
+import unittest
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.core.crc import crc16, check_crc, is_crc_valid, crc_patch, fix_crc, validate_directory  # noqa: E402
+from src.core.model import SPDDataModel  # noqa: E402
+from src.utils.constants import DDR4_TYPE  # noqa: E402
+
+SAMPLE_PATH = repo_root / "samples" / "DDR4_Hynix_HMA42GR7MFR4N.bin"
+
+
+class TestCRC16(unittest.TestCase):
+    def test_table_matches_reference(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            data = bytes(rng.randrange(256) for _ in range(rng.randrange(1, 200)))
+            self.assertEqual(crc16(list(data)), binascii.crc_hqx(data, 0))
+        # CRC-16/XMODEM check value
+        self.assertEqual(crc16(list(b"123456789")), 0x31C3)
+
+    def test_sample_is_valid(self):
+        data = SAMPLE_PATH.read_bytes()
+        self.assertTrue(is_crc_valid(data))
+        self.assertTrue(is_crc_valid(list(data)))
+        self.assertEqual(crc_patch(data), {})
+
+    def test_fix_after_edit(self):
+        data = list(SAMPLE_PATH.read_bytes())
+        data[0x18] ^= 0x01
+        data[0x80] ^= 0x01
+        statuses = check_crc(data)
+        self.assertEqual([s.valid for s in statuses], [False, False])
+        self.assertEqual(set(crc_patch(data)), {126, 127, 254, 255})
+        self.assertTrue(is_crc_valid(fix_crc(data)))
+
+    def test_xmp_region_not_covered(self):
+        data = list(SAMPLE_PATH.read_bytes())
+        data[0x189] ^= 0xFF
+        self.assertTrue(is_crc_valid(data))
+
+    def test_validate_directory(self):
+        good = SAMPLE_PATH.read_bytes()
+        bad = bytearray(good)
+        bad[0x10] ^= 0x01
+        with tempfile.TemporaryDirectory() as tmp:
+            pathlib.Path(tmp, "good.bin").write_bytes(good)
+            pathlib.Path(tmp, "bad.bin").write_bytes(bytes(bad))
+            pathlib.Path(tmp, "short.bin").write_bytes(good[:256])
+            result = {pathlib.Path(p).name: ok for p, ok in validate_directory(tmp).items()}
+        self.assertEqual(result, {"bad.bin": False, "good.bin": True, "short.bin": False})
+
+
+class TestModelCRC(unittest.TestCase):
+    def test_model_crc_follows_edits(self):
+        model = SPDDataModel()
+        model.load_from_file(str(SAMPLE_PATH))
+        self.assertTrue(model.crc_valid)
+        model.set_byte(0x18, model.get_byte(0x18) ^ 0x01)
+        self.assertFalse(model.crc_valid)
+        self.assertTrue(model.apply_patch(crc_patch(model.data)))
+        self.assertTrue(model.crc_valid)
+
+    def test_non_ddr4_has_no_crc_status(self):
+        model = SPDDataModel()
+        model.load_from_file(str(SAMPLE_PATH))
+        model.set_byte(2, 0x12)
+        self.assertEqual(model.check_crc(), [])
+        self.assertFalse(model.crc_valid)
+        self.assertEqual(model.fix_crc(), {})
+
+    def test_incremental_crc_matches_full_recompute(self):
+        from src.core import crc as crc_module
+
+        model = SPDDataModel()
+        model.load_from_file(str(SAMPLE_PATH))
+        model.check_crc()
+
+        original = crc_module.compute_block_crcs
+        crc_module.compute_block_crcs = None  # 增量路径不应再整体重算
+        try:
+            rng = random.Random(2)
+            for _ in range(200):
+                offset = rng.randrange(512)
+                model.set_byte(offset, rng.randrange(256))
+                if rng.random() < 0.2:
+                    model.set_bytes(rng.randrange(200), [rng.randrange(256) for _ in range(8)])
+                model.set_byte(2, DDR4_TYPE)
+                statuses = model.check_crc()
+                self.assertEqual([s.computed for s in statuses], original(model.data))
+        finally:
+            crc_module.compute_block_crcs = original
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,589 @@
+import pathlib
+import sys
+import time
+import unittest
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.core.driver import SPDDriver, dirty_blocks, spd_bytes_used  # noqa: E402
+from src.core.emulator import EmulatedHIDDevice  # noqa: E402
+from src.core.model import SPDDataModel  # noqa: E402
+from src.core.parser.ddr4 import DDR4Parser  # noqa: E402
+
+SAMPLE_PATH = repo_root / "samples" / "DDR4_Hynix_HMA42GR7MFR4N.bin"
+
+
+class ScriptedDevice:
+    """按脚本延迟返回响应的模拟 HID 设备"""
+
+    def __init__(self, delays):
+        self.delays = list(delays)
+        self.pending = []
+        self.count = 0
+
+    def write(self, data):
+        self.count += 1
+        delay = self.delays.pop(0) if self.delays else 0.0
+        self.pending.append((time.perf_counter() + delay, f":{self.count:02X}"))
+        return len(data)
+
+    def read(self, size, timeout_ms=0):
+        now = time.perf_counter()
+        ready = [p for p in self.pending if p[0] <= now + timeout_ms / 1000]
+        if not ready:
+            time.sleep(timeout_ms / 1000)
+            return []
+        ready_time, resp = ready[0]
+        time.sleep(max(0.0, ready_time - time.perf_counter()))
+        self.pending.remove(ready[0])
+        return list(resp.encode())
+
+    def close(self):
+        pass
+
+
+class FaultyDevice(EmulatedHIDDevice):
+    """按命令序号注入故障的模拟读写器"""
+
+    def __init__(self, image, fail_after=None, drop=(), garble=(), nak=(), corrupt=(), unreadable=(), **kwargs):
+        super().__init__(image, **kwargs)
+        self.fail_after = fail_after  # 第 N 条大块读取之后大块读取全部失败
+        self.drop = set(drop)         # 不应答的读命令序号 (从 1 开始)
+        self.garble = set(garble)     # 返回乱码的读命令序号
+        self.nak = set(nak)           # 返回 :01 且不写入的写命令序号
+        self.corrupt = set(corrupt)   # 确认但写入错误数据的写命令序号
+        self.unreadable = set(unreadable)  # 首次写入之前读取 NAK 的绝对偏移
+        self.read_count = 0
+        self.large_reads = 0
+        self.write_count = 0
+
+    def _execute(self, cmd, at):
+        if cmd.startswith("BT-I2C2RD"):
+            self.read_count += 1
+            if int(cmd[13:15], 16) > 8 and self.fail_after is not None:
+                self.large_reads += 1
+                if self.large_reads > self.fail_after:
+                    return self.NACK_RESPONSE
+            if self.read_count in self.drop:
+                return None
+            if self.read_count in self.garble:
+                return "?"
+            if self.write_count == 0:
+                start = self.page * 256 + int(cmd[11:13], 16)
+                if self.unreadable.intersection(range(start, start + int(cmd[13:15], 16))):
+                    return self.NACK_RESPONSE
+        elif cmd.startswith("BT-I2C2WR5"):
+            self.write_count += 1
+            if self.write_count in self.nak:
+                return ":01"
+            if self.write_count in self.corrupt:
+                cmd = cmd[:15] + bytes(b ^ 0xFF for b in bytes.fromhex(cmd[15:])).hex().upper()
+        return super()._execute(cmd, at)
+
+
+def read_lengths(device):
+    """设备收到的读命令长度（按发送顺序）"""
+    return [int(c[13:15], 16) for c in device.commands if c.startswith("BT-I2C2RD")]
+
+
+def i2c_addrs(device):
+    """读写命令访问的 I2C 地址（按发送顺序）"""
+    return [int(c[9:11], 16) for c in device.commands if c.startswith(("BT-I2C2RD", "BT-I2C2WR5"))]
+
+
+def sample_image():
+    return [(i * 7 + 3) & 0xFF for i in range(512)]
+
+
+class TestAdaptivePolling(unittest.TestCase):
+    def test_returns_as_soon_as_response_arrives(self):
+        driver = SPDDriver()
+        driver.device = ScriptedDevice([0.002])
+        start = time.perf_counter()
+        self.assertEqual(driver.send_cmd("BT-VER0010"), ":01")
+        self.assertLess(time.perf_counter() - start, 0.02)
+
+    def test_timeout_bound_is_calibrated(self):
+        driver = SPDDriver()
+        driver.device = ScriptedDevice([0.002] * 5)
+        self.assertEqual(driver.response_timeout, SPDDriver.RESPONSE_TIMEOUT_MAX)
+        for _ in range(5):
+            driver.send_cmd("BT-VER0010")
+        self.assertLess(driver.response_timeout, SPDDriver.RESPONSE_TIMEOUT_MAX)
+        self.assertGreaterEqual(driver.response_timeout, SPDDriver.RESPONSE_TIMEOUT_MIN)
+
+    def test_late_response_is_drained(self):
+        driver = SPDDriver()
+        driver.device = ScriptedDevice([0.002] * 3 + [0.2, 0.001])
+        for _ in range(3):
+            driver.send_cmd("BT-VER0010")
+        self.assertIsNone(driver.send_cmd("BT-VER0010"))
+        time.sleep(0.2)
+        # 迟到的 ":04" 被丢弃，拿到的是本条命令自己的响应
+        self.assertEqual(driver.send_cmd("BT-VER0010"), ":05")
+        self.assertEqual(driver.response_timeout, SPDDriver.RESPONSE_TIMEOUT_MIN)
+
+    def test_fixed_delay_mode(self):
+        driver = SPDDriver(adaptive_polling=False)
+        driver.device = ScriptedDevice([0.0])
+        start = time.perf_counter()
+        self.assertEqual(driver.send_cmd("BT-VER0010", delay=0.03), ":01")
+        self.assertGreaterEqual(time.perf_counter() - start, 0.03)
+
+
+class TestBlockSizeNegotiation(unittest.TestCase):
+    def setUp(self):
+        SPDDriver._block_size_cache.clear()
+
+    def test_truncated_32_byte_response_selects_16(self):
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(sample_image())
+        # 32 字节的 ":XX XX ..." 响应需要 96 字符，超出 64 字节报告
+        self.assertEqual(driver.negotiate_block_size(), 16)
+        self.assertEqual(driver.read_spd(), sample_image())
+        self.assertEqual(read_lengths(driver.device).count(16), 1 + 512 // 16)
+
+    def test_unsupported_firmware_stays_at_8(self):
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(sample_image(), max_read_length=8)
+        self.assertEqual(driver.read_spd(), sample_image())
+        self.assertEqual(driver.block_size, 8)
+
+    def test_falls_back_when_large_reads_fail(self):
+        driver = SPDDriver()
+        driver.device = FaultyDevice(sample_image(), fail_after=5)
+        self.assertEqual(driver.read_spd(), sample_image())
+        self.assertEqual(driver.block_size, 8)
+
+    def test_result_is_cached_per_device(self):
+        driver = SPDDriver()
+        driver._device_key = "dev-a"
+        driver.device = EmulatedHIDDevice(sample_image())
+        self.assertEqual(driver.negotiate_block_size(), 16)
+
+        other = SPDDriver()
+        other._device_key = "dev-a"
+        other.device = EmulatedHIDDevice(sample_image())
+        self.assertEqual(other.negotiate_block_size(), 16)
+        self.assertEqual(read_lengths(other.device), [])
+
+
+class TestPipelinedRead(unittest.TestCase):
+    def setUp(self):
+        SPDDriver._block_size_cache.clear()
+
+    def test_keeps_several_requests_in_flight(self):
+        driver = SPDDriver(pipeline_depth=4)
+        driver.device = EmulatedHIDDevice(sample_image(), max_read_length=8)
+        self.assertEqual(driver.read_spd(), sample_image())
+        self.assertEqual(driver.device.max_pending, 4)
+
+    def test_depth_one_is_request_response(self):
+        driver = SPDDriver(pipeline_depth=1)
+        driver.device = EmulatedHIDDevice(sample_image(), max_read_length=8)
+        self.assertEqual(driver.read_spd(), sample_image())
+        self.assertEqual(driver.device.max_pending, 1)
+
+    def test_garbled_response_is_requeued(self):
+        driver = SPDDriver()
+        driver.device = FaultyDevice(sample_image(), max_read_length=8, garble={6, 20})
+        self.assertEqual(driver.read_spd(), sample_image())
+
+    def test_dropped_response_does_not_shift_offsets(self):
+        driver = SPDDriver()
+        driver.device = FaultyDevice(sample_image(), max_read_length=8, drop={10})
+        driver._latency_samples.extend([0.001] * 4)  # 缩短超时等待
+        self.assertEqual(driver.read_spd(), sample_image())
+
+
+class TestDifferentialWrite(unittest.TestCase):
+    def setUp(self):
+        SPDDriver._block_size_cache.clear()
+
+    def writes(self, device):
+        return [c for c in device.commands if c.startswith("BT-I2C2WR50")]
+
+    def pages(self, device):
+        return [c for c in device.commands if c.startswith(("BT-I2C2WR36", "BT-I2C2WR37"))]
+
+    def test_dirty_blocks(self):
+        base = sample_image()
+        data = list(base)
+        data[0x141] ^= 1
+        data[0x188] ^= 1
+        data[0x18F] ^= 1
+        self.assertEqual(dirty_blocks(data, base), [0x140, 0x188])
+        self.assertEqual(dirty_blocks(base, base), [])
+
+    def test_only_changed_blocks_of_one_page(self):
+        base = sample_image()
+        data = list(base)
+        data[0x189] = 0x00
+        data[0x1A0] = 0x00
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(base)
+        self.assertTrue(driver.write_spd(data, baseline=base, fix_crc=False))
+        self.assertEqual(len(self.writes(driver.device)), 2)
+        # 只有 Page 1 有改动，不切换到 Page 0
+        self.assertEqual(self.pages(driver.device), ["BT-I2C2WR370001"])
+        self.assertEqual(list(driver.device.eeproms[0x50]), data)
+
+    def test_fresh_read_baseline(self):
+        base = sample_image()
+        data = list(base)
+        data[0x10] = 0x00
+        data[0x1F0] = 0x00
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(base)
+        self.assertTrue(driver.write_spd(data, differential=True, fix_crc=False))
+        self.assertEqual(len(self.writes(driver.device)), 2)
+        self.assertEqual(list(driver.device.eeproms[0x50]), data)
+
+    def test_failed_baseline_blocks_are_written(self):
+        base = sample_image()
+        base[0x1A0:0x1A8] = [0x11] * 8
+        data = list(base)
+        data[0x1A0:0x1A8] = [0] * 8
+        driver = SPDDriver()
+        driver.device = FaultyDevice(base, unreadable={0x1A0})
+        driver._latency_samples.extend([0.001] * 4)
+        self.assertTrue(driver.write_spd(data, differential=True, fix_crc=False))
+        # 基准中该块读取失败（以全零填充），内容未知，仍须写入
+        self.assertEqual(driver.failed_blocks, frozenset({0x1A0}))
+        self.assertEqual(len(self.writes(driver.device)), 1)
+        self.assertEqual(list(driver.device.eeproms[0x50]), data)
+
+    def test_unchanged_data_writes_nothing(self):
+        base = sample_image()
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(base)
+        self.assertTrue(driver.write_spd(base, baseline=base, fix_crc=False))
+        self.assertEqual(self.writes(driver.device), [])
+
+    def test_nak_is_retried_for_that_block(self):
+        base = sample_image()
+        data = list(base)
+        data[0x18] = 0x00
+        data[0x30] = 0x00
+        driver = SPDDriver()
+        driver.device = FaultyDevice(base, nak={1})
+        self.assertTrue(driver.write_spd(data, baseline=base, fix_crc=False))
+        self.assertEqual(len(self.writes(driver.device)), 3)
+        self.assertEqual(list(driver.device.eeproms[0x50]), data)
+
+    def test_readback_mismatch_is_rewritten(self):
+        base = sample_image()
+        data = list(base)
+        data[0x18] = 0x00
+        driver = SPDDriver()
+        driver.device = FaultyDevice(base, corrupt={1})
+        self.assertTrue(driver.write_spd(data, baseline=base, fix_crc=False))
+        self.assertEqual(len(self.writes(driver.device)), 2)
+        self.assertEqual(list(driver.device.eeproms[0x50]), data)
+        # 只回读写入过的块
+        self.assertEqual(read_lengths(driver.device), [8, 8])
+
+    def test_persistent_failure_reports_error(self):
+        base = sample_image()
+        data = list(base)
+        data[0x18] = 0x00
+        driver = SPDDriver()
+        driver.device = FaultyDevice(base, nak=set(range(1, 10)))
+        driver._latency_samples.extend([0.001] * 4)
+        self.assertFalse(driver.write_spd(data, baseline=base, fix_crc=False))
+        self.assertEqual(len(self.writes(driver.device)), SPDDriver.WRITE_RETRIES)
+
+    def test_full_write_without_baseline(self):
+        data = sample_image()
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice([0] * 512)
+        self.assertTrue(driver.write_spd(data, fix_crc=False))
+        self.assertEqual(len(self.writes(driver.device)), 64)
+        self.assertEqual(list(driver.device.eeproms[0x50]), data)
+
+    def test_crc_refresh_is_reported_to_caller(self):
+        base = list(SAMPLE_PATH.read_bytes())
+        data = list(base)
+        data[0x18] ^= 0x01
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(bytes(base))
+        self.assertTrue(driver.write_spd(data, baseline=base))
+        # 调用方的数据不变，实际写入的内容（含新 CRC）见 written_data
+        self.assertEqual(data[126:128], base[126:128])
+        self.assertNotEqual(driver.written_data[126:128], base[126:128])
+        self.assertEqual(list(driver.device.eeproms[0x50]), driver.written_data)
+        self.assertTrue(driver.verify_spd(driver.written_data))
+
+    def test_model_crc_fixed_before_write_verifies(self):
+        base = list(SAMPLE_PATH.read_bytes())
+        model = SPDDataModel()
+        model.load_from_list(base, is_from_device=True)
+        model.set_byte(0x18, model.get_byte(0x18) ^ 0x01)
+        self.assertTrue(model.fix_crc())
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(bytes(base))
+        self.assertTrue(driver.write_spd(model.data, baseline=base))
+        self.assertEqual(driver.written_data, model.data)
+        self.assertTrue(driver.verify_spd(model.data))
+
+    def test_second_write_diffs_against_device(self):
+        base = list(SAMPLE_PATH.read_bytes())
+        model = SPDDataModel()
+        model.load_from_list(base, is_from_device=True)
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(bytes(base))
+
+        model.set_byte(0x145, base[0x145] ^ 0xFF)
+        model.fix_crc()
+        self.assertTrue(driver.write_spd(model.data, differential=True))
+        model.commit_original()
+
+        # 改回原值再写：以设备回读为基准，改动不会被误判为“无需写入”
+        model.set_byte(0x145, base[0x145])
+        model.fix_crc()
+        self.assertTrue(driver.write_spd(model.data, differential=True))
+        self.assertEqual(list(driver.device.eeproms[0x50]), base)
+
+
+class TestStreamingVerify(unittest.TestCase):
+    def setUp(self):
+        SPDDriver._block_size_cache.clear()
+
+    def test_verify_passes_and_reports_blocks(self):
+        image = sample_image()
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(image)
+        blocks = list(driver.iter_verify(image))
+        self.assertEqual([b[0] for b in blocks], list(range(0, 512, 8)))
+        self.assertTrue(all(expected == actual for _, expected, actual in blocks))
+        self.assertTrue(driver.verify_spd(image))
+
+    def test_range_only_reads_requested_blocks(self):
+        image = sample_image()
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(image, max_read_length=8)
+        blocks = list(driver.iter_verify(image, 0x183, 0x1A1))
+        self.assertEqual([b[0] for b in blocks], list(range(0x180, 0x1A8, 8)))
+        # 块长协商 3 次 (8/32/16) + 范围内 5 个块
+        self.assertEqual(len(read_lengths(driver.device)), 3 + 5)
+        self.assertNotIn("BT-I2C2WR360001", driver.device.commands)
+
+    def test_fail_fast_stops_reading(self):
+        image = sample_image()
+        expected = list(image)
+        expected[0x20] ^= 0xFF
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(image, max_read_length=8)
+        logs = []
+        self.assertFalse(driver.verify_spd(expected, logs.append, fail_fast=True))
+        self.assertEqual(len(read_lengths(driver.device)), 3 + 0x28 // 8)
+        self.assertIn("  Offset 020: 预期 1C, 实际 E3", logs)
+
+    def test_full_verify_collects_all_mismatches(self):
+        image = sample_image()
+        expected = list(image)
+        expected[0x20] ^= 0xFF
+        expected[0x1F0] ^= 0xFF
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(image)
+        logs = []
+        self.assertFalse(driver.verify_spd(expected, logs.append))
+        self.assertIn("验证失败: 2 字节不匹配", logs)
+
+    def test_cancelled_verify_fails(self):
+        image = sample_image()
+        expected = list(image)
+        expected[0x1F4] ^= 0xFF
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(image)
+        select_page = driver._select_page
+
+        def select_and_stop(page):
+            select_page(page)
+            if page == 1:
+                driver.stop()
+
+        driver._select_page = select_and_stop
+        logs = []
+        self.assertFalse(driver.verify_spd(expected, logs.append))
+        self.assertIn("验证已取消", logs)
+        self.assertNotIn("验证通过！", logs)
+
+
+class TestSparseRead(unittest.TestCase):
+    def setUp(self):
+        SPDDriver._block_size_cache.clear()
+
+    def image(self, byte0, xmp):
+        image = sample_image()
+        image[0] = byte0
+        image[384:386] = [0x0C, 0x4A] if xmp else [0x00, 0x00]
+        return image
+
+    def test_bytes_used_decoding(self):
+        self.assertEqual(spd_bytes_used(0x23), 384)
+        self.assertEqual(spd_bytes_used(0x24), 512)
+        self.assertEqual(spd_bytes_used(0x11), 128)
+        self.assertEqual(spd_bytes_used(0x00), 512)
+
+    def test_xmp_beyond_bytes_used_is_still_read(self):
+        image = self.image(0x23, xmp=True)
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(image)
+        self.assertEqual(driver.read_spd(skip_unused=True), image)
+        self.assertEqual(driver.unread_offsets, frozenset())
+
+    def test_unused_region_is_skipped(self):
+        image = self.image(0x23, xmp=False)
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(image)
+        data = driver.read_spd(skip_unused=True)
+        self.assertEqual(driver.unread_offsets, frozenset(range(392, 512)))
+        self.assertEqual(data[:392], image[:392])
+        self.assertEqual(data[392:], [0] * 120)
+
+    def test_unused_page_is_not_selected(self):
+        image = self.image(0x11, xmp=False)
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(image)
+        data = driver.read_spd(skip_unused=True, stop_after=SPDDriver.IDENTITY_END)
+        self.assertEqual(data[:128], image[:128])
+        self.assertEqual(driver.unread_offsets, frozenset(range(128, 512)))
+        self.assertNotIn("BT-I2C2WR370001", driver.device.commands)
+
+    def test_stop_after_identity(self):
+        image = sample_image()
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(image)
+        data = driver.read_spd(stop_after=SPDDriver.IDENTITY_END)
+        self.assertEqual(data[:352], image[:352])
+        self.assertEqual(driver.unread_offsets, frozenset(range(352, 512)))
+        # 扣除块长协商的 8 + 32 + 16 字节
+        self.assertEqual(sum(read_lengths(driver.device)) - (8 + 32 + 16), 352)
+
+
+class TestIdentityProbe(unittest.TestCase):
+    def setUp(self):
+        SPDDriver._block_size_cache.clear()
+
+    def test_matches_full_parse(self):
+        image = list(SAMPLE_PATH.read_bytes())
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(image)
+        identity = driver.probe_identity()
+        self.assertEqual(identity, DDR4Parser(image).parse_identity())
+        self.assertEqual(identity.memory_type, "DDR4")
+        self.assertTrue(identity.part_number.startswith("HMA42GR7"))
+        # 协商 3 次之后：首块 1 次 + 身份区域 32 字节 2 次
+        self.assertEqual(read_lengths(driver.device)[3:], [8, 16, 16])
+        pages = [c for c in driver.device.commands if c.startswith(("BT-I2C2WR36", "BT-I2C2WR37"))]
+        self.assertEqual(pages, ["BT-I2C2WR360001", "BT-I2C2WR370001"])
+
+    def test_empty_slot_returns_none(self):
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice([0] * 512)
+        self.assertIsNone(driver.probe_identity())
+
+
+class TestMultiSlot(unittest.TestCase):
+    def setUp(self):
+        SPDDriver._block_size_cache.clear()
+        self.images = {
+            0x50: list(SAMPLE_PATH.read_bytes()),
+            0x52: sample_image(),
+            0x57: [(i * 13 + 1) & 0xFF for i in range(512)],
+        }
+
+    def test_scan_reads_one_byte_per_address(self):
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(self.images)
+        self.assertEqual(driver.scan_slots(), [0x50, 0x52, 0x57])
+        self.assertEqual(read_lengths(driver.device), [1] * 8)
+
+    def test_floating_bus_is_empty(self):
+        images = dict(self.images)
+        images[0x53] = [0xFF] * 512
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(images)
+        self.assertNotIn(0x53, driver.scan_slots())
+
+    def test_reads_all_slots_with_two_page_switches(self):
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(self.images)
+        progress = []
+        results = driver.read_slots(progress_callback=progress.append)
+
+        self.assertEqual(results, self.images)
+        pages = [c for c in driver.device.commands if c.startswith(("BT-I2C2WR36", "BT-I2C2WR37"))]
+        self.assertEqual(pages, ["BT-I2C2WR360001", "BT-I2C2WR370001"])
+        self.assertEqual(progress, sorted(progress))
+        self.assertEqual(progress[-1], 1.0)
+
+    def test_explicit_addresses_skip_scan(self):
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(self.images)
+        self.assertEqual(driver.read_slots([0x57]), {0x57: self.images[0x57]})
+        self.assertEqual(set(i2c_addrs(driver.device)), {0x57})
+
+    def test_single_slot_operations_take_address(self):
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(self.images)
+        self.assertEqual(driver.read_spd(addr=0x52), self.images[0x52])
+
+        data = list(self.images[0x52])
+        data[0x180] ^= 0xFF
+        self.assertTrue(driver.write_spd(data, fix_crc=False, baseline=self.images[0x52], addr=0x52))
+        self.assertEqual(list(driver.device.eeproms[0x52]), data)
+        self.assertEqual(list(driver.device.eeproms[0x50]), self.images[0x50])
+        self.assertTrue(driver.verify_spd(data, addr=0x52))
+
+
+class TestDebugTrace(unittest.TestCase):
+    def setUp(self):
+        SPDDriver._block_size_cache.clear()
+
+    def test_records_are_structured_and_formatted_on_demand(self):
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(sample_image())
+        driver.send_cmd("BT-I2C2RD500008")
+        driver._log_debug("切换到 Page %d", 1)
+
+        tx, rx, log = driver.trace.records()
+        self.assertEqual((tx.op, tx.raw), ("tx", "BT-I2C2RD500008"))
+        self.assertEqual(rx.op, "rx")
+        self.assertIsInstance(rx.raw, list)
+        self.assertIsNotNone(rx.latency)
+        self.assertEqual((log.message, log.args), ("切换到 Page %d", (1,)))
+        self.assertLessEqual(tx.timestamp, rx.timestamp)
+
+        lines = driver.get_debug_log().splitlines()
+        self.assertTrue(lines[0].endswith("] TX: BT-I2C2RD500008"))
+        self.assertIn("] RX: :03 0A 11", lines[1])
+        self.assertTrue(lines[1].endswith(" ms)"))
+        self.assertTrue(lines[2].endswith("] 切换到 Page 1"))
+
+    def test_buffer_is_bounded(self):
+        driver = SPDDriver()
+        driver.trace = type(driver.trace)(maxlen=16)
+        driver.device = EmulatedHIDDevice(sample_image())
+        self.assertIsNotNone(driver.read_spd())
+        self.assertEqual(len(driver.trace), 16)
+        self.assertGreater(driver.trace.dropped, 0)
+        log = driver.get_debug_log().splitlines()
+        self.assertEqual(len(log), 17)
+        self.assertIn(str(driver.trace.dropped), log[0])
+
+        driver.clear_debug_log()
+        self.assertEqual(driver.get_debug_log(), "")
+
+    def test_pipelined_reads_carry_offsets(self):
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(sample_image())
+        driver.read_spd()
+        offsets = [r.offset for r in driver.trace.records("tx") if r.offset is not None]
+        self.assertEqual(offsets[:4], [0, 16, 32, 48])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import pathlib
+import sys
+import time
+import unittest
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.core.driver import SPDDriver  # noqa: E402
+from src.core.emulator import EmulatedHIDBackend, EmulatedHIDDevice  # noqa: E402
+from src.core.protocol import encode_packet  # noqa: E402
+
+SAMPLE_PATH = repo_root / "samples" / "DDR4_Hynix_HMA42GR7MFR4N.bin"
+
+
+def command(device, cmd):
+    device.write(encode_packet(cmd))
+    return bytes(device.read(64, timeout_ms=100)).decode("ascii")
+
+
+class TestEmulatedDevice(unittest.TestCase):
+    def setUp(self):
+        SPDDriver._block_size_cache.clear()
+        self.image = SAMPLE_PATH.read_bytes()
+
+    def test_protocol(self):
+        device = EmulatedHIDDevice.from_file(str(SAMPLE_PATH))
+        self.assertTrue(command(device, "BT-VER0010").startswith("BT-VER"))
+        self.assertEqual(command(device, "BT-I2C2RD500004"), ":" + " ".join(f"{b:02X}" for b in self.image[:4]))
+        self.assertEqual(command(device, "BT-I2C2WR370001"), ":00")
+        self.assertEqual(command(device, "BT-I2C2RD504001"), f":{self.image[320]:02X}")
+        # 32 字节响应放不下 64 字节 HID 报告，与真实固件一样被截断
+        self.assertEqual(len(command(device, "BT-I2C2RD500020")), 64)
+        self.assertEqual(command(device, "BT-I2C2RD510001"), EmulatedHIDDevice.NACK_RESPONSE)
+
+    def test_write_cycle_nacks_until_done(self):
+        device = EmulatedHIDDevice(self.image, write_time=0.02)
+        self.assertEqual(command(device, "BT-I2C2WR500001AA"), ":00")
+        self.assertEqual(command(device, "BT-I2C2RD500001"), EmulatedHIDDevice.NACK_RESPONSE)
+        time.sleep(0.02)
+        self.assertEqual(command(device, "BT-I2C2RD500001"), ":AA")
+
+    def test_firmware_read_limit(self):
+        device = EmulatedHIDDevice(self.image, max_read_length=8)
+        self.assertEqual(command(device, "BT-I2C2RD500008")[:3], f":{self.image[0]:02X}")
+        self.assertEqual(command(device, "BT-I2C2RD500010"), EmulatedHIDDevice.NACK_RESPONSE)
+
+    def test_rejects_bad_image_size(self):
+        with self.assertRaises(ValueError):
+            EmulatedHIDDevice(bytes(256))
+
+
+class TestDriverOnEmulator(unittest.TestCase):
+    def setUp(self):
+        SPDDriver._block_size_cache.clear()
+        self.image = SAMPLE_PATH.read_bytes()
+
+    def test_connect_through_backend(self):
+        devices = [EmulatedHIDDevice(bytes(512), path=b"emulated:0"),
+                   EmulatedHIDDevice(self.image, path=b"emulated:1", serial_number="EMU00001")]
+        driver = SPDDriver(path=b"emulated:1", hid_backend=EmulatedHIDBackend(devices))
+        self.assertTrue(driver.connect())
+        self.assertTrue(devices[1].opened)
+        self.assertFalse(devices[0].opened)
+        self.assertEqual(driver.block_size, 16)
+        self.assertEqual(driver.read_spd(), list(self.image))
+        driver.disconnect()
+        self.assertFalse(devices[1].opened)
+
+    def test_missing_path_fails(self):
+        backend = EmulatedHIDBackend([EmulatedHIDDevice(self.image)])
+        self.assertFalse(SPDDriver(path=b"elsewhere", hid_backend=backend).connect())
+
+    def test_read_survives_dropped_responses_and_jitter(self):
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(self.image, latency=0.001, jitter=0.001, drop_rate=0.05, seed=3)
+        self.assertEqual(driver.read_spd(), list(self.image))
+        self.assertGreater(driver.device.dropped, 0)
+
+    def test_write_with_eeprom_write_time(self):
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(self.image, latency=0.001, write_time=0.005)
+        data = list(self.image)
+        data[0x180:0x188] = [0x11] * 8
+        self.assertTrue(driver.write_spd(data, fix_crc=False, baseline=list(self.image)))
+        self.assertEqual(list(driver.device.eeproms[0x50]), data)
+        # 写周期内的 ACK 轮询收到 NACK
+        self.assertGreater(driver.device.nacks, 0)
+
+    def test_multi_slot(self):
+        other = bytes((i * 5 + 1) & 0xFF for i in range(512))
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice({0x50: self.image, 0x53: other})
+        self.assertEqual(driver.read_slots(), {0x50: list(self.image), 0x53: list(other)})
+
+
+if __name__ == "__main__":
+    unittest.main()
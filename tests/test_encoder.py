@@ -0,0 +1,107 @@
+import contextlib
+import io
+import pathlib
+import sys
+import unittest
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.core.encoder import (  # noqa: E402
+    PatchBuilder,
+    apply_patch,
+    encode_detail,
+    encode_timing,
+    encode_xmp_profile,
+)
+from src.core.model import SPDDataModel, DataChangeType  # noqa: E402
+from src.core.parser import DDR4Parser  # noqa: E402
+
+SAMPLE_PATH = repo_root / "samples" / "DDR4_Hynix_HMA42GR7MFR4N.bin"
+
+
+def _load_sample():
+    return list(SAMPLE_PATH.read_bytes())
+
+
+class TestPatchBuilder(unittest.TestCase):
+    def test_reads_through_patch_and_drops_noop_writes(self):
+        source = [0x12] * 512
+        builder = PatchBuilder(source)
+        builder.set(10, 0x12)
+        builder.set_bits(11, 0xF0, 0xA0)
+        self.assertEqual(builder.get(11), 0xA2)
+        self.assertFalse(builder.set(12, 0x100))
+        self.assertEqual(builder.result(), {11: 0xA2})
+        self.assertEqual(source[11], 0x12)
+
+
+class TestEncodeRoundTrip(unittest.TestCase):
+    def setUp(self):
+        self.image = _load_sample()
+
+    def test_timing_round_trip(self):
+        for key, value_ns in (("tAA", 13.75), ("tRCD", 14.06), ("tRAS", 32.0), ("tRC", 46.5)):
+            image = self.image[:]
+            apply_patch(image, encode_timing(image, key, value_ns))
+            self.assertAlmostEqual(getattr(DDR4Parser(image).parse_timings(), key), value_ns, places=3)
+
+    def test_tras_preserves_trc_nibble(self):
+        before = DDR4Parser(self.image).parse_timings()
+        image = self.image[:]
+        apply_patch(image, encode_timing(image, "tRAS", 300.0))
+        after = DDR4Parser(image).parse_timings()
+        self.assertEqual(after.tRAS, 300.0)
+        self.assertEqual(after.tRC, before.tRC)
+
+    def test_unknown_timing_is_empty_patch(self):
+        self.assertEqual(encode_timing(self.image, "CL", 16), {})
+
+    def test_new_xmp_profile_round_trip(self):
+        data = {"frequency": 3200, "voltage": 1.35, "CL": 16, "tRCD": 18, "tRP": 18, "tRAS": 38, "tRC": 0,
+                "tRFC1": 560, "tFAW": 34, "tWR": 24}
+        image = self.image[:]
+        apply_patch(image, encode_xmp_profile(image, 1, data, is_new=True))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            xmp = DDR4Parser(image).parse_xmp()
+        self.assertTrue(xmp["supported"])
+        profile = xmp["profiles"][0]
+        self.assertEqual(profile["frequency"], 3200)
+        self.assertEqual(profile["timings"], "CL16-18-18-38-56")
+        self.assertEqual(profile["tRFC1"], 560)
+        self.assertEqual(profile["tFAW"], 34)
+
+    def test_unchanged_profile_edit_is_empty_patch(self):
+        self.assertEqual(encode_xmp_profile(self.image, 1, {"CL": 16}), {})
+
+    def test_invalid_serial_writes_nothing(self):
+        self.assertEqual(encode_detail(self.image, "serial_number", "zz"), {})
+        patch = encode_detail(self.image, "serial_number", "0x1234ABCD")
+        self.assertEqual(sorted(patch.values()), sorted({0x12, 0x34, 0xAB, 0xCD} - set(self.image[325:329])))
+
+
+class TestModelApplyPatch(unittest.TestCase):
+    def test_single_notification(self):
+        model = SPDDataModel()
+        self.assertTrue(model.load_from_file(str(SAMPLE_PATH)))
+        events = []
+        model.add_observer(events.append)
+
+        patch = encode_detail(model.data, "part_number", "TEST-PART")
+        self.assertTrue(model.apply_patch(patch))
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].change_type, DataChangeType.RANGE_CHANGED)
+        self.assertEqual(events[0].offsets, frozenset(patch))
+        self.assertEqual(model.get_parsed_info()["part_number"], "TEST-PART")
+
+    def test_rejects_out_of_range_patch(self):
+        model = SPDDataModel()
+        model.load_from_file(str(SAMPLE_PATH))
+        version = model.version
+        self.assertFalse(model.apply_patch({0x140: 0x01, 0x200: 0x00}))
+        self.assertEqual(model.version, version)
+
+
+if __name__ == "__main__":
+    unittest.main()
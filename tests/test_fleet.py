@@ -0,0 +1,122 @@
+import pathlib
+import sys
+import unittest
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.core.driver import SPDDriver  # noqa: E402
+from src.core.emulator import EmulatedHIDBackend, EmulatedHIDDevice  # noqa: E402
+from src.core.fleet import FleetReader, device_path  # noqa: E402
+
+SAMPLE_PATH = repo_root / "samples" / "DDR4_Hynix_HMA42GR7MFR4N.bin"
+
+
+def emulated_fleet(image, count, latency=0.001):
+    return [
+        EmulatedHIDDevice(image, latency=latency, bus_time=latency,
+                          path=f"emulated:{i}".encode(), serial_number=f"SN{i:04d}")
+        for i in range(count)
+    ]
+
+
+class TestFleetReader(unittest.TestCase):
+    def setUp(self):
+        SPDDriver._block_size_cache.clear()
+        self.image = SAMPLE_PATH.read_bytes()
+
+    def test_reads_every_device_in_parallel(self):
+        devices = emulated_fleet(self.image, 4)
+        progress = {}
+        report = FleetReader(hid_backend=EmulatedHIDBackend(devices)).read_all(
+            progress_callback=lambda path, value: progress.__setitem__(path, value)
+        )
+
+        self.assertEqual(sorted(report.results), [device_path(d.info()) for d in devices])
+        for result in report.results.values():
+            self.assertTrue(result.ok)
+            self.assertEqual(result.data, list(self.image))
+        self.assertEqual(set(progress.values()), {1.0})
+        self.assertEqual(sorted(report.by_serial()), ["SN0000", "SN0001", "SN0002", "SN0003"])
+
+        stats = report.stats
+        self.assertEqual((stats.devices, stats.succeeded, stats.failed), (4, 4, 0))
+        self.assertEqual(stats.bytes_read, 4 * 512)
+        self.assertGreater(stats.throughput, 0)
+        # 各设备的读取相互重叠，整批耗时明显小于各设备耗时之和
+        self.assertGreater(stats.parallelism, 1.5)
+
+    def test_failures_are_reported_per_device(self):
+        devices = emulated_fleet(self.image, 3)
+        devices[1].eeproms[0x50][:] = bytes(512)
+        reader = FleetReader(hid_backend=EmulatedHIDBackend(devices))
+        default_factory = reader.driver_factory
+
+        def make(info):
+            if info["path"] == devices[2].path:
+                raise OSError("open failed")
+            return default_factory(info)
+
+        reader.driver_factory = make
+        report = reader.read_all()
+
+        results = [report.results[device_path(d.info())] for d in devices]
+        self.assertTrue(results[0].ok)
+        self.assertEqual(results[1].error, "读取失败")
+        self.assertIn("open failed", results[2].error)
+        self.assertEqual((report.stats.succeeded, report.stats.failed), (1, 2))
+        self.assertEqual(report.stats.bytes_read, 512)
+
+    def test_read_kwargs_are_forwarded(self):
+        backend = EmulatedHIDBackend(emulated_fleet(self.image, 2))
+        report = FleetReader(hid_backend=backend).read_all(stop_after=SPDDriver.IDENTITY_END)
+        for result in report.results.values():
+            self.assertTrue(result.ok)
+            self.assertEqual(result.bytes_read, SPDDriver.IDENTITY_END)
+
+    def test_discovers_and_opens_devices_by_path(self):
+        devices = [
+            EmulatedHIDDevice(self.image, path=f"emulated:{i}".encode(), serial_number=f"SN{i:04d}")
+            for i in range(3)
+        ]
+        devices[1].eeproms[0x50][320] ^= 0xFF
+        report = FleetReader(hid_backend=EmulatedHIDBackend(devices)).read_all()
+
+        self.assertEqual(sorted(report.results), ["emulated:0", "emulated:1", "emulated:2"])
+        for device in devices:
+            self.assertEqual(report.results[device.path.decode()].data, list(device.eeproms[0x50]))
+            self.assertFalse(device.opened)
+        self.assertEqual(report.stats.succeeded, 3)
+
+    def test_stop_between_connect_and_read(self):
+        device = EmulatedHIDDevice(self.image)
+        backend = EmulatedHIDBackend([device])
+        reader = FleetReader(hid_backend=backend)
+        commands_at_stop = []
+
+        def make(info):
+            driver = SPDDriver(path=info["path"], hid_backend=backend)
+            connect = driver.connect
+
+            def connect_then_stop(log_callback=None):
+                connected = connect(log_callback)
+                reader.stop()
+                commands_at_stop.append(len(device.commands))
+                return connected
+            driver.connect = connect_then_stop
+            return driver
+
+        reader.driver_factory = make
+        result = reader.read_all().results[device.path.decode()]
+        self.assertIsNone(result.data)
+        self.assertEqual(result.error, "已停止")
+        self.assertEqual(len(device.commands), commands_at_stop[0])
+
+    def test_no_devices(self):
+        report = FleetReader(hid_backend=EmulatedHIDBackend([])).read_all()
+        self.assertEqual(report.results, {})
+        self.assertEqual(report.stats.throughput, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
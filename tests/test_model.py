@@ -0,0 +1,170 @@
+import pathlib
+import sys
+import unittest
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.core.model import SPDDataModel, DataChangeType  # noqa: E402
+
+SAMPLE_PATH = repo_root / "samples" / "DDR4_Hynix_HMA42GR7MFR4N.bin"
+
+
+class TestModelBatch(unittest.TestCase):
+    def setUp(self):
+        self.model = SPDDataModel()
+        self.assertTrue(self.model.load_from_file(str(SAMPLE_PATH)))
+        self.events = []
+        self.model.add_observer(self.events.append)
+
+    def test_batch_emits_single_event_with_all_offsets(self):
+        with self.model.batch():
+            self.model.set_byte(0x18, self.model.get_byte(0x18) ^ 0x01)
+            self.model.set_byte(0x7D, self.model.get_byte(0x7D) ^ 0x01)
+            self.model.set_bytes(0x149, [0x41, 0x42])
+            self.assertEqual(self.events, [])
+
+        self.assertEqual(len(self.events), 1)
+        event = self.events[0]
+        self.assertEqual(event.change_type, DataChangeType.RANGE_CHANGED)
+        self.assertEqual(event.offset, 0x18)
+        self.assertEqual(event.length, 0x14A - 0x18 + 1)
+        self.assertTrue({0x18, 0x7D}.issubset(event.offsets))
+
+    def test_nested_batch_notifies_once_on_outermost_exit(self):
+        with self.model.batch():
+            with self.model.batch():
+                self.model.set_byte(0x140, self.model.get_byte(0x140) ^ 0xFF)
+            self.assertEqual(self.events, [])
+        self.assertEqual(len(self.events), 1)
+        self.assertEqual(self.events[0].offsets, frozenset({0x140}))
+
+    def test_batch_without_changes_is_silent(self):
+        with self.model.batch():
+            self.model.set_byte(0x02, self.model.get_byte(0x02))
+        self.assertEqual(self.events, [])
+
+    def test_modified_bytes_tracked_inside_batch(self):
+        original = self.model.get_byte(0x145)
+        with self.model.batch():
+            self.model.set_byte(0x145, original ^ 0x0F)
+            self.assertTrue(self.model.is_byte_modified(0x145))
+        self.assertEqual(self.model.modified_bytes, {0x145})
+
+    def test_fix_crc_patches_model(self):
+        self.model.set_byte(0x18, self.model.get_byte(0x18) ^ 0x01)
+        self.assertFalse(self.model.crc_valid)
+        del self.events[:]
+
+        patch = self.model.fix_crc()
+        self.assertEqual(set(patch), {126, 127})
+        self.assertTrue(self.model.crc_valid)
+        self.assertEqual(len(self.events), 1)
+        self.assertEqual(self.model.fix_crc(), {})
+
+    def test_commit_original_after_write(self):
+        original = self.model.get_byte(0x145)
+        self.model.set_byte(0x145, original ^ 0xFF)
+        del self.events[:]
+
+        self.model.commit_original()
+        self.assertFalse(self.model.is_modified)
+        self.assertTrue(self.model.is_from_device)
+        self.assertEqual(self.model.get_original_byte(0x145), original ^ 0xFF)
+        self.assertEqual([e.change_type for e in self.events], [DataChangeType.DATA_RESET])
+        # 复位回到写入的内容
+        self.model.reset_byte(0x145)
+        self.assertEqual(self.model.get_byte(0x145), original ^ 0xFF)
+
+    def test_unread_offsets_follow_loads(self):
+        data = self.model.data
+        self.model.load_from_list(data, is_from_device=True, unread_offsets=range(392, 512))
+        self.assertFalse(self.model.is_byte_read(400))
+        self.assertTrue(self.model.is_byte_read(0))
+        self.model.load_from_list(data)
+        self.assertEqual(self.model.unread_offsets, frozenset())
+
+
+class TestModelParseCache(unittest.TestCase):
+    def setUp(self):
+        self.model = SPDDataModel()
+        self.assertTrue(self.model.load_from_file(str(SAMPLE_PATH)))
+
+    def test_parsed_info_is_shared_until_version_changes(self):
+        version = self.model.version
+        info = self.model.get_parsed_info()
+        self.assertIs(self.model.get_parsed_info(), info)
+        self.assertEqual(self.model.version, version)
+
+        self.model.set_byte(0x145, self.model.get_byte(0x145) ^ 0xFF)
+        self.assertGreater(self.model.version, version)
+        updated = self.model.get_parsed_info()
+        self.assertIsNot(updated, info)
+        self.assertNotEqual(updated["serial_number"], info["serial_number"])
+
+    def test_noop_write_keeps_cache(self):
+        info = self.model.get_parsed_info()
+        version = self.model.version
+        self.model.set_byte(0x02, self.model.get_byte(0x02))
+        self.assertEqual(self.model.version, version)
+        self.assertIs(self.model.get_parsed_info(), info)
+
+    def test_modes_are_cached_separately(self):
+        spd_info = self.model.get_parsed_info()
+        read_info = self.model.get_parsed_info(mode="read")
+        self.assertNotIn("die_info_inferred", spd_info)
+        self.assertIn("die_info_inferred", read_info)
+
+    def test_reset_invalidates_cache(self):
+        info = self.model.get_parsed_info()
+        self.model.set_byte(0x145, self.model.get_byte(0x145) ^ 0xFF)
+        self.model.reset_to_original()
+        self.assertEqual(self.model.get_parsed_info(), info)
+
+
+class TestIncrementalParse(unittest.TestCase):
+    def setUp(self):
+        self.model = SPDDataModel()
+        self.assertTrue(self.model.load_from_file(str(SAMPLE_PATH)))
+
+    def _full_parse(self, mode="spd"):
+        from src.core.parser import DDR4Parser
+        return DDR4Parser(self.model.data).to_dict(mode=mode)
+
+    def test_sections_for_offsets(self):
+        from src.core.parser.ddr4 import DDR4Parser
+        self.assertEqual(DDR4Parser.sections_for_offsets([0x145]), {"manufacturer"})
+        self.assertEqual(DDR4Parser.sections_for_offsets([0x18]), {"timings"})
+        self.assertEqual(DDR4Parser.sections_for_offsets([0x1A0]), {"xmp"})
+        self.assertEqual(DDR4Parser.sections_for_offsets([0x80]), set())
+
+    def test_incremental_result_matches_full_parse(self):
+        for mode in ("spd", "read"):
+            self.model.get_parsed_info(mode=mode)
+
+        edits = [(0x145, 0x12), (0x18, 0x07), (0x14A, 0x58), (0x189, 0xB0), (0x0D, 0x0B), (0x004, 0x46)]
+        for offset, value in edits:
+            self.model.set_byte(offset, value)
+            for mode in ("spd", "read"):
+                self.assertEqual(self.model.get_parsed_info(mode=mode), self._full_parse(mode))
+
+    def test_unaffected_sections_are_reused(self):
+        info = self.model.get_parsed_info()
+        timings = self.model.get_timing_info()
+        self.model.set_byte(0x145, self.model.get_byte(0x145) ^ 0xFF)
+
+        updated = self.model.get_parsed_info()
+        self.assertIs(updated["xmp"], info["xmp"])
+        self.assertIs(updated["timings"], info["timings"])
+        self.assertIs(self.model.get_timing_info(), timings)
+
+    def test_dram_type_change_forces_full_parse(self):
+        self.model.get_parsed_info()
+        self.model.set_byte(0x02, 0x0B)
+        self.assertIn("error", self.model.get_parsed_info())
+        self.model.set_byte(0x02, 0x0C)
+        self.assertEqual(self.model.get_parsed_info(), self._full_parse())
+
+
+if __name__ == "__main__":
+    unittest.main()
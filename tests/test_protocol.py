@@ -0,0 +1,74 @@
+import pathlib
+import sys
+import unittest
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.core.protocol import (  # noqa: E402
+    PACKET_SIZE, PacketEncoder, decode_block, decode_text, encode_packet,
+)
+
+
+def legacy_packet(cmd):
+    """旧实现：逐字符 ord() 的 int 列表"""
+    data = [0x00] * 65
+    for i, char in enumerate(cmd):
+        if i + 1 < len(data):
+            data[i + 1] = ord(char)
+    return data
+
+
+class TestPacketEncoder(unittest.TestCase):
+    def test_matches_legacy_packet(self):
+        encoder = PacketEncoder()
+        for cmd in ("BT-VER0010", "BT-I2C2RD500010", "BT-I2C2WR5000" + "10" + "AB" * 16, "X" * 80):
+            self.assertEqual(list(encode_packet(cmd)), legacy_packet(cmd))
+            self.assertEqual(list(encoder.encode(cmd)), legacy_packet(cmd))
+
+    def test_reuses_buffer_and_clears_tail(self):
+        encoder = PacketEncoder()
+        first = encoder.encode("BT-I2C2WR50001001020304050607080910111213141516")
+        second = encoder.encode("BT-I2C2RD500010")
+        self.assertIs(first, second)
+        self.assertEqual(len(second), PACKET_SIZE)
+        self.assertEqual(bytes(second), encode_packet("BT-I2C2RD500010"))
+
+    def test_constant_commands_are_cached(self):
+        encoder = PacketEncoder()
+        packet = encoder.encode("BT-I2C2WR370001")
+        self.assertIsInstance(packet, bytes)
+        self.assertIs(encoder.encode("BT-I2C2WR370001"), packet)
+        # 固定命令不经过共享缓冲
+        buffer = encoder.encode("BT-I2C2RD500010")
+        encoder.encode("BT-VER0010")
+        self.assertEqual(bytes(buffer), encode_packet("BT-I2C2RD500010"))
+
+
+class TestResponseDecoding(unittest.TestCase):
+    def report(self, text):
+        raw = list(text.encode("ascii"))
+        return raw + [0] * (64 - len(raw))
+
+    def test_decode_block(self):
+        self.assertEqual(decode_block(self.report(":01 02 0A FF"), 4), [1, 2, 10, 255])
+        self.assertEqual(decode_block(self.report(":01 02 0A FF 11"), 4), [1, 2, 10, 255])
+        self.assertEqual(decode_block(b":01020AFF", 4), [1, 2, 10, 255])
+        self.assertEqual(decode_block(":01 02 0A FF", 4), [1, 2, 10, 255])
+        self.assertEqual(decode_block(self.report(":01 02 03 04 05 06 07 08 OK"), 8), list(range(1, 9)))
+        self.assertEqual(decode_block([0x3A, 0x30, 0x31, 0xFF, 0x20, 0x30, 0x32], 2), [1, 2])
+        self.assertIsNone(decode_block(self.report(":01 02 0A"), 4))
+        self.assertIsNone(decode_block(self.report(":01 02 ZZ FF"), 4))
+        self.assertIsNone(decode_block(self.report("ERR"), 4))
+        self.assertIsNone(decode_block([], 4))
+        self.assertIsNone(decode_block(None, 4))
+
+    def test_decode_text(self):
+        self.assertEqual(decode_text(self.report(":00")), ":00")
+        self.assertEqual(decode_text([0x3A, 0x0A, 0x30, 0xFF, 0x30]), ":00")
+        self.assertIsNone(decode_text([]))
+        self.assertIsNone(decode_text(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import pathlib
+import sys
+import unittest
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.core.parser.schema import (  # noqa: E402
+    SPDField,
+    CompiledSchema,
+    BASE_TIMING_DECODER,
+    XMP_PROFILE_DECODER,
+)
+
+SAMPLE_PATH = repo_root / "samples" / "DDR4_Hynix_HMA42GR7MFR4N.bin"
+
+
+class TestSPDField(unittest.TestCase):
+    def test_wide_field_requires_high_offset(self):
+        with self.assertRaises(ValueError):
+            SPDField("tRAS", 0x1C, width=12)
+
+    def test_offsets_and_masks(self):
+        field = SPDField("tRC", 0x1D, width=12, high_offset=0x1B, high_shift=4, ftb_offset=0x78)
+        self.assertEqual(field.offsets(), (0x1D, 0x1B, 0x78))
+        self.assertEqual(field.high_mask, 0xF0)
+        self.assertEqual(field.max_mtb, 0xFFF)
+
+
+class TestCompiledSchema(unittest.TestCase):
+    def test_mtb_ftb_nibble_and_word_layouts(self):
+        schema = CompiledSchema([
+            SPDField("t8", 0, ftb_offset=1),
+            SPDField("t12_low", 2, width=12, high_offset=4, high_shift=0),
+            SPDField("t12_high", 3, width=12, high_offset=4, high_shift=4),
+            SPDField("t16", 6, width=16, high_offset=7),
+            SPDField("raw", 9, unit="raw"),
+        ])
+        buf = bytes([0x05, 0xF6, 0x10, 0x20, 0x21, 0xAA, 0x34, 0x12, 0xBB, 0x93])
+        fields = schema.decode(buf)
+        self.assertEqual(fields["t8"], 5 * 125 - 10)
+        self.assertEqual(fields["t12_low"], 0x110 * 125)
+        self.assertEqual(fields["t12_high"], 0x220 * 125)
+        self.assertEqual(fields["t16"], 0x1234 * 125)
+        self.assertEqual(fields["raw"], 0x93)
+
+    def test_base_offset_and_list_input(self):
+        schema = CompiledSchema([SPDField("t", 1, ftb_offset=2)], ps_divisor=1000)
+        data = bytearray([0, 0, 0, 0x08, 0x01])
+        self.assertEqual(schema.decode(data, base=2), {"t": (8 * 125 + 1) / 1000})
+
+    def test_sample_timings(self):
+        buf = SAMPLE_PATH.read_bytes()
+        fields = BASE_TIMING_DECODER.decode(buf)
+        self.assertEqual(fields["tCK"], buf[18] * 125 + (buf[125] - 256 if buf[125] > 127 else buf[125]))
+        self.assertEqual(fields["tRFC1"], ((buf[31] << 8) | buf[30]) * 125)
+
+    def test_xmp_window_fits_profile(self):
+        self.assertLessEqual(XMP_PROFILE_DECODER.window_start + XMP_PROFILE_DECODER.window_size, 47)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import pathlib
+import sys
+import unittest
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.core.driver import SPDDriver  # noqa: E402
+from src.core.emulator import EmulatedHIDDevice  # noqa: E402
+from src.core.stats import (  # noqa: E402
+    CMD_ACK_POLL, CMD_ACTIVATE, CMD_OTHER, CMD_PAGE, CMD_READ, CMD_WRITE, DriverStats, LatencyHistogram, classify_command,
+)
+
+SAMPLE_PATH = repo_root / "samples" / "DDR4_Hynix_HMA42GR7MFR4N.bin"
+
+
+class TestCommandStats(unittest.TestCase):
+    def test_classify_command(self):
+        self.assertEqual(classify_command("BT-VER0010"), (CMD_ACTIVATE, 0))
+        self.assertEqual(classify_command("BT-I2C2WR370001"), (CMD_PAGE, 0))
+        self.assertEqual(classify_command("BT-I2C2RD501010"), (CMD_READ, 16))
+        self.assertEqual(classify_command("BT-I2C2WR5010080102030405060708"), (CMD_WRITE, 8))
+        self.assertEqual(classify_command("BT-I2C2RD50"), (CMD_OTHER, 0))
+        self.assertEqual(classify_command("HELLO"), (CMD_OTHER, 0))
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.percentile(50))
+        for _ in range(98):
+            histogram.add(0.002)
+        histogram.add(0.050)
+        histogram.add(0.400)
+        p50 = histogram.percentile(50)
+        # 桶上界与实际值相差不超过一个桶 (约 19%)
+        self.assertGreaterEqual(p50, 0.002)
+        self.assertLess(p50, 0.002 * 1.2)
+        self.assertLess(histogram.percentile(95), 0.0025)
+        self.assertGreaterEqual(histogram.percentile(99), 0.050)
+        self.assertEqual(histogram.percentile(100), 0.400)
+        histogram.add(10.0)   # 溢出桶
+        self.assertEqual(histogram.percentile(100), 10.0)
+
+    def test_record_and_overlapping_busy_time(self):
+        stats = DriverStats()
+        ok = list(b":00")
+        # 流水线：两条读请求重叠在途，在途时间只计一次
+        stats.record(CMD_READ, 16, 0.0, 0.010, ok)
+        stats.record(CMD_READ, 16, 0.001, 0.012, ok)
+        stats.record(CMD_READ, 16, 0.020, 0.030, list(b"ERR"))
+        stats.record(CMD_READ, 16, 0.040, 0.0, None)
+        stats.retry(CMD_READ, 2)
+
+        read = stats[CMD_READ]
+        self.assertEqual((read.sent, read.timeouts, read.errors, read.retries), (4, 1, 1, 2))
+        self.assertEqual(read.bytes, 32)
+        self.assertAlmostEqual(read.busy, 0.022)
+        self.assertAlmostEqual(read.throughput, 32 / 0.022)
+
+        rows = stats.summary()
+        self.assertEqual([row["class"] for row in rows], [CMD_READ])
+        self.assertIn("读块", stats.format())
+        stats.reset()
+        self.assertEqual(stats.format(), "")
+
+
+class TestDriverStats(unittest.TestCase):
+    def setUp(self):
+        SPDDriver._block_size_cache.clear()
+        self.image = SAMPLE_PATH.read_bytes()
+
+    def make_driver(self, **options):
+        driver = SPDDriver()
+        driver.device = EmulatedHIDDevice(self.image, latency=0.001, bus_time=0.0002, **options)
+        return driver
+
+    def test_read_records_each_class(self):
+        driver = self.make_driver()
+        self.assertEqual(driver.read_spd(), list(self.image))
+
+        stats = driver.stats
+        self.assertEqual(stats[CMD_ACTIVATE].sent, 1)
+        self.assertEqual(stats[CMD_ACTIVATE].errors, 0)
+        self.assertEqual(stats[CMD_PAGE].sent, 2)
+        read = stats[CMD_READ]
+        self.assertGreaterEqual(read.bytes, len(self.image))
+        self.assertEqual(read.timeouts, 0)
+        self.assertEqual(read.histogram.count, read.sent)
+        self.assertGreater(read.throughput, 0)
+        self.assertGreaterEqual(read.histogram.percentile(50), 0.001)
+        summary = driver.get_stats_summary()
+        for label in ("激活", "切页", "读块", "p99"):
+            self.assertIn(label, summary)
+
+    def test_dropped_responses_count_as_timeouts_and_retries(self):
+        driver = self.make_driver(drop_rate=0.03, seed=3)
+        self.assertEqual(driver.read_spd(), list(self.image))
+        read = driver.stats[CMD_READ]
+        self.assertGreater(read.timeouts, 0)
+        self.assertGreater(read.retries, 0)
+
+    def test_write_records_write_class(self):
+        driver = self.make_driver()
+        modified = list(self.image)
+        modified[0x150:0x158] = [0x5A] * 8
+        self.assertTrue(driver.write_spd(modified, baseline=list(self.image)))
+        write = driver.stats[CMD_WRITE]
+        self.assertEqual(write.sent, 1)
+        self.assertEqual(write.bytes, 8)
+
+    def test_ack_polls_do_not_count_as_read_errors(self):
+        driver = self.make_driver(write_time=0.005)
+        modified = list(self.image)
+        modified[0x150:0x160] = [0x5A] * 16
+        self.assertTrue(driver.write_spd(modified, baseline=list(self.image)))
+        self.assertGreater(driver.device.nacks, 0)
+
+        read = driver.stats[CMD_READ]
+        self.assertEqual((read.sent, read.errors, read.timeouts), (0, 0, 0))
+        ack = driver.stats[CMD_ACK_POLL]
+        self.assertEqual(ack.errors, driver.device.nacks)
+        self.assertIn("轮询", driver.get_stats_summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import pathlib
+import shutil
+import sys
+import tempfile
+import unittest
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.core.model import SPDDataModel  # noqa: E402
+from src.core.parser.ddr4 import DDR4Parser  # noqa: E402
+from src.core.sysfs import discover_ee1004, read_inventory  # noqa: E402
+
+SAMPLE_PATH = repo_root / "samples" / "DDR4_Hynix_HMA42GR7MFR4N.bin"
+
+
+class TestSysfsReader(unittest.TestCase):
+    def setUp(self):
+        self.root = pathlib.Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        self.image = SAMPLE_PATH.read_bytes()
+        self.other = bytes((i * 3 + 1) & 0xFF for i in range(512))
+        # 伪造的 /sys/bus/i2c/drivers/ee1004 目录树
+        self.make_node("1-0051", self.other)
+        self.make_node("0-0050", self.image)
+        self.make_node("0-0052", self.image[:256])
+        (self.root / "module").mkdir()
+        (self.root / "bind").write_bytes(b"")
+        (self.root / "0-0053").mkdir()
+
+    def make_node(self, name, content):
+        node = self.root / name
+        node.mkdir()
+        (node / "eeprom").write_bytes(content)
+
+    def test_discover(self):
+        modules = discover_ee1004(str(self.root))
+        self.assertEqual([(m.bus, m.addr) for m in modules], [(0, 0x50), (0, 0x52), (1, 0x51)])
+        self.assertEqual(discover_ee1004(str(self.root / "missing")), [])
+
+    def test_inventory_shares_one_buffer(self):
+        inventory = read_inventory(str(self.root))
+        self.assertEqual(len(inventory.buffer), 3 * 512)
+        first, short, second = inventory.modules
+
+        self.assertEqual(bytes(first.data), self.image)
+        self.assertEqual(bytes(second.data), self.other)
+        self.assertIs(first.data.obj, inventory.buffer)
+        self.assertIsNone(short.data)
+        self.assertIn("256", short.error)
+        self.assertEqual([m.name for m in inventory.readable()], ["0-0050", "1-0051"])
+
+    def test_feeds_parser_and_model(self):
+        module = read_inventory(str(self.root)).modules[0]
+        self.assertEqual(module.identity(), DDR4Parser(list(self.image)).parse_identity())
+        self.assertEqual(module.parser().to_dict(), DDR4Parser(list(self.image)).to_dict())
+        self.assertEqual(module.crc_valid(), True)
+
+        model = SPDDataModel()
+        self.assertTrue(module.load_into(model))
+        self.assertEqual(model.data, list(self.image))
+        self.assertTrue(model.is_from_device)
+
+    def test_parser_accepts_short_buffers(self):
+        full = DDR4Parser(list(self.image))
+        for data in (memoryview(self.image)[:384], self.image[:384], bytearray(self.image[:384])):
+            parser = DDR4Parser(data)
+            self.assertEqual(len(parser.data), 512)
+            self.assertEqual(parser.parse_identity().part_number, full.parse_identity().part_number)
+        self.assertEqual(DDR4Parser(memoryview(self.image)).to_dict(), full.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import errno
+import pathlib
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.core.driver import SPDDriver  # noqa: E402
+from src.core.emulator import EmulatedHIDBackend, EmulatedHIDDevice  # noqa: E402
+from src.core.transport import (  # noqa: E402
+    EE1004_PAGE_ADDRS, I2C_SLAVE, I2C_SMBUS_BYTE, I2C_SMBUS_BYTE_DATA, I2C_SMBUS_I2C_BLOCK_DATA, I2C_SMBUS_READ,
+    FileTransport, HIDTransport, SMBusTransport, read_spd_image, write_spd_image,
+)
+
+SAMPLE_PATH = repo_root / "samples" / "DDR4_Hynix_HMA42GR7MFR4N.bin"
+
+
+class FakeSMBus(SMBusTransport):
+    """在 SMBus 传输层面模拟 EE1004 的 i2c-dev（替换 ioctl 调用）"""
+
+    def __init__(self, images, busy_polls=0):
+        super().__init__(bus=0)
+        self.eeproms = {addr: bytearray(image) for addr, image in images.items()}
+        self.page = 0
+        self.busy_polls = busy_polls
+        self._busy = 0
+        self.transfers = []
+
+    def open(self):
+        return True
+
+    def _smbus(self, addr, read_write, command, size):
+        self.transfers.append((addr, read_write, command, size))
+        if addr in EE1004_PAGE_ADDRS:
+            self.assert_size(size, I2C_SMBUS_BYTE)
+            self.page = EE1004_PAGE_ADDRS.index(addr)
+            return True
+        eeprom = self.eeproms.get(addr)
+        if eeprom is None:
+            return False
+        if self._busy:
+            self._busy -= 1
+            return False
+        start = self.page * 256 + command
+        if size == I2C_SMBUS_BYTE_DATA:
+            self._data.byte = eeprom[start]
+            return True
+        self.assert_size(size, I2C_SMBUS_I2C_BLOCK_DATA)
+        length = self._data.block[0]
+        if read_write == I2C_SMBUS_READ:
+            self._data.block[1:1 + length] = list(eeprom[start:start + length])
+        else:
+            eeprom[start:start + length] = bytes(self._data.block[1:1 + length])
+            self._busy = self.busy_polls
+        return True
+
+    @staticmethod
+    def assert_size(size, expected):
+        if size != expected:
+            raise AssertionError(f"unexpected SMBus size {size}")
+
+
+class TestTransports(unittest.TestCase):
+    def setUp(self):
+        SPDDriver._block_size_cache.clear()
+        self.image = list(SAMPLE_PATH.read_bytes())
+        self.modified = list(self.image)
+        self.modified[0x150:0x160] = [0x5A] * 16
+
+    def test_file_transport_round_trip(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = str(pathlib.Path(tmp) / "spd.bin")
+        shutil.copy(SAMPLE_PATH, path)
+
+        with FileTransport(path, write_back=True) as transport:
+            self.assertEqual(read_spd_image(transport), self.image)
+            self.assertTrue(write_spd_image(transport, self.modified, baseline=self.image))
+            self.assertEqual(read_spd_image(transport), self.modified)
+        self.assertEqual(list(pathlib.Path(path).read_bytes()), self.modified)
+
+    def test_missing_address(self):
+        with FileTransport(bytes(self.image)) as transport:
+            self.assertIsNone(read_spd_image(transport, addr=0x51))
+
+    def test_smbus_uses_page_addresses_and_block_reads(self):
+        transport = FakeSMBus({0x50: self.image})
+        progress = []
+        self.assertEqual(read_spd_image(transport, progress_callback=progress.append), self.image)
+        self.assertEqual(progress[-1], 1.0)
+
+        page_selects = [t[0] for t in transport.transfers if t[0] in EE1004_PAGE_ADDRS]
+        self.assertEqual(page_selects, [0x36, 0x37])
+        reads = [t for t in transport.transfers if t[0] == 0x50]
+        self.assertEqual(len(reads), 512 // 32)
+
+    def test_smbus_write_polls_for_ack(self):
+        transport = FakeSMBus({0x50: self.image}, busy_polls=3)
+        self.assertTrue(write_spd_image(transport, self.modified, baseline=self.image))
+        self.assertEqual(list(transport.eeproms[0x50]), self.modified)
+        writes = [t for t in transport.transfers if t[0] == 0x50 and t[1] == 0]
+        self.assertEqual(len(writes), 1)
+
+    def test_smbus_busy_address_reads_as_no_ack(self):
+        class BusyFcntl:
+            @staticmethod
+            def ioctl(fd, request, arg):
+                if request == I2C_SLAVE:
+                    raise OSError(errno.EBUSY, "Device or resource busy")
+
+        transport = SMBusTransport(bus=0)
+        transport._fd = -1
+        with mock.patch("src.core.transport.fcntl", BusyFcntl):
+            transport.select_page(0)
+            self.assertIsNone(transport.read_block(0x50, 0, 8))
+            self.assertFalse(transport.write_block(0x50, 0, [0] * 8))
+
+    def test_hid_transport(self):
+        device = EmulatedHIDDevice(bytes(self.image))
+        transport = HIDTransport(SPDDriver(hid_backend=EmulatedHIDBackend([device])))
+        with transport:
+            self.assertEqual(transport.max_read_length, 16)
+            self.assertEqual(read_spd_image(transport), self.image)
+            self.assertTrue(write_spd_image(transport, self.modified, baseline=self.image))
+        self.assertEqual(list(device.eeproms[0x50]), self.modified)
+        self.assertFalse(device.opened)
+
+
+if __name__ == "__main__":
+    unittest.main()
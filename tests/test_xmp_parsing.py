@@ -130,6 +130,45 @@ class TestXmpParsing(unittest.TestCase):
         self.assertAlmostEqual(timing.tWTR_S, 0x123 * 0.125, places=3)
         self.assertAlmostEqual(timing.tWTR_L, 0x456 * 0.125, places=3)
 
+    def test_xmp_decode_does_not_print(self):
+        import contextlib
+        import io
+
+        repo_root = pathlib.Path(__file__).resolve().parents[1]
+        sys.path.insert(0, str(repo_root))
+        from src.core.parser.ddr4 import DDR4Parser
+
+        data = list((repo_root / "samples" / "DDR4_Hynix_HMA42GR7MFR4N.bin").read_bytes())
+        data[0x180:0x182] = [0x0C, 0x4A]
+        data[0x183] = 0x20
+        data[0x189:0x18E] = [0xA3, 0x00, 0x00, 0x05, 0xFF]
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            DDR4Parser(data).parse_xmp()
+        self.assertEqual(out.getvalue(), "")
+
+        with self.assertLogs("src.core.parser.ddr4", level="DEBUG") as logs:
+            DDR4Parser(data).parse_xmp()
+        self.assertTrue(any("XMP Profile 1" in line for line in logs.output))
+
+    def test_zero_mtb_ignores_fine_offset(self):
+        repo_root = pathlib.Path(__file__).resolve().parents[1]
+        sys.path.insert(0, str(repo_root))
+        from src.core.parser.ddr4 import DDR4Parser
+
+        data = list((repo_root / "samples" / "DDR4_Hynix_HMA42GR7MFR4N.bin").read_bytes())
+        data[0x180:0x182] = [0x0C, 0x4A]
+        data[0x183] = 0x20
+        data[0x189:0x18E] = [0xA3, 0x00, 0x00, 0x05, 0xFF]
+        # tAA/tRCD/tRP/tRC 的 MTB 为 0、FTB 非零：与 MTB 为 0 相同，视为未定义
+        data[0x191:0x197] = [0x00, 0x00, 0x00, 0x00, 0x40, 0x00]
+        data[0x1AB:0x1AF] = [0x10, 0x10, 0x10, 0x10]
+
+        p1 = DDR4Parser(data).parse_xmp()["profiles"][0]
+        self.assertEqual((p1["CL"], p1["tRCD"], p1["tRP"], p1["tRC"]), (0, 0, 0, 0))
+        self.assertEqual(p1["tRAS"], 13)
+        self.assertTrue(p1["timings"].startswith("CL0-0-0-13"))
+
 
 if __name__ == "__main__":
     unittest.main()